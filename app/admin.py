@@ -0,0 +1,74 @@
+# app/admin.py
+"""
+Admin page: the process-wide metrics of this host (all sessions).
+
+Hidden unless an admin token is configured, as `admin_token` in the Streamlit secrets or in the
+BIN_LABEL_ADMIN_TOKEN environment variable, and the page is opened with ?admin=<token>.
+"""
+import hmac
+import os
+import time
+from typing import Mapping, Optional
+
+import pandas as pd
+import streamlit as st
+
+from app.jobs import get_runner
+from app.metrics import CONTENT_TYPE, DUMP_INTERVAL, EXPORTS, ITEMS_GENERATED, REGISTRY, cache_hit_rate, metrics_file
+from app.spool import get_store
+
+ADMIN_TOKEN_ENV = "BIN_LABEL_ADMIN_TOKEN"
+ADMIN_TOKEN_SECRET = "admin_token"
+
+CACHES = {"bin_labels_table": "Label table (long) cache", "label_table": "Label table cache"}
+
+
+def _percent(rate):
+    return "–" if rate is None else f"{rate:.0%}"
+
+
+def admin_token() -> Optional[str]:
+    """The configured admin token, or None when the admin page is disabled."""
+    try:
+        token = st.secrets.get(ADMIN_TOKEN_SECRET)
+    except FileNotFoundError:
+        # no secrets.toml at all (StreamlitSecretNotFoundError is a FileNotFoundError)
+        token = None
+    token = token or os.environ.get(ADMIN_TOKEN_ENV)
+    return str(token) if token else None
+
+
+def admin_enabled(query_params: Mapping[str, str]) -> bool:
+    """True when an admin token is configured and ?admin= holds it (compared in constant time)."""
+    token = admin_token()
+    given = query_params.get("admin")
+    return bool(token and given) and hmac.compare_digest(str(given).encode(), token.encode())
+
+
+def render_admin_page() -> None:
+    st.header("Metrics 📈", divider="rainbow")
+    st.caption(f"Totals since this server process started {time.strftime('%Y-%m-%d %H:%M', time.localtime(REGISTRY.started))}, "
+               f"across all sessions. Written every {DUMP_INTERVAL} s to `{metrics_file()}`.")
+    st.button("🔄 Refresh", key="admin_refresh")
+
+    exports = sum(row["value"] for row in EXPORTS.rows())
+    jobs = get_runner().jobs()
+    columns = st.columns(4)
+    columns[0].metric("Exports", f"{exports:,.0f}")
+    columns[1].metric("Labels generated", f"{ITEMS_GENERATED.value(kind='label'):,.0f}")
+    columns[2].metric("Jobs running", sum(not j.is_finished for j in jobs))
+    columns[3].metric("Spool disk usage", f"{get_store().disk_usage() / 1024 ** 2:,.1f} MiB")
+    for column, (cache, label) in zip(st.columns(len(CACHES)), CACHES.items()):
+        column.metric(f"{label} hit rate", _percent(cache_hit_rate(cache)))
+
+    rows = REGISTRY.rows()
+    if rows:
+        st.dataframe(pd.DataFrame(rows, columns=["metric", "labels", "value", "sum", "mean"]),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.info("Nothing has been generated on this server yet.")
+
+    text = REGISTRY.render()
+    with st.expander("Prometheus text"):
+        st.code(text, language="text")
+    st.download_button("📥 Download metrics", data=text, file_name="metrics.prom", mime=CONTENT_TYPE, key="download_metrics")
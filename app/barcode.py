@@ -0,0 +1,135 @@
+# app/barcode.py
+"""Pure-Python Code 128 (code set B) encoder for bin labels.
+
+A symbol is returned as a module string ('1' = bar, '0' = space) without quiet zones.
+Bin labels of a bay share everything but their numeric tail, so the encoder memoises
+the encoded prefix with its running checksum, and the encoded tails (which repeat across
+bays) with the sums needed to place their checksum contribution at any offset.
+"""
+import re
+import struct
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+
+# Bar/space widths of the 107 Code 128 symbols, indexed by symbol value.
+_WIDTHS = [
+    "212222", "222122", "222221", "121223", "121322", "131222", "122213", "122312", "132212", "221213",
+    "221312", "231212", "112232", "122132", "122231", "113222", "123122", "123221", "223211", "221132",
+    "221231", "213212", "223112", "312131", "311222", "321122", "321221", "312212", "322112", "322211",
+    "212123", "212321", "232121", "111323", "131123", "131321", "112313", "132113", "132311", "211313",
+    "231113", "231311", "112133", "112331", "132131", "113123", "113321", "133121", "313121", "211331",
+    "231131", "213113", "213311", "213131", "311123", "311321", "331121", "312113", "312311", "332111",
+    "314111", "221411", "431111", "111224", "111422", "121124", "121421", "141122", "141221", "112214",
+    "112412", "122114", "122411", "142112", "142211", "241211", "221114", "413111", "241112", "134111",
+    "111242", "121142", "121241", "114212", "124112", "124211", "411212", "421112", "421211", "212141",
+    "214121", "412121", "111143", "111341", "131141", "114113", "114311", "411113", "411311", "113141",
+    "114131", "311141", "411131", "211412", "211214", "211232", "2331112",
+]
+
+START_B = 104
+STOP = 106
+
+QUIET_ZONE = 10
+
+
+def _modules(widths: str) -> str:
+    return "".join(("1" if i % 2 == 0 else "0") * int(w) for i, w in enumerate(widths))
+
+
+SYMBOLS = [_modules(w) for w in _WIDTHS]
+
+_TAIL_RE = re.compile(r"\d*$")
+
+
+def _value(char: str) -> int:
+    code = ord(char)
+    if not 32 <= code <= 127:
+        raise ValueError(f"Character {char!r} cannot be encoded in Code 128 set B")
+    return code - 32
+
+
+@lru_cache(maxsize=65536)
+def _encode_prefix(prefix: str) -> Tuple[str, int]:
+    """Start symbol plus prefix symbols, and the weighted checksum so far."""
+    modules, checksum = [SYMBOLS[START_B]], START_B
+    for position, char in enumerate(prefix, start=1):
+        value = _value(char)
+        modules.append(SYMBOLS[value])
+        checksum += position * value
+    return "".join(modules), checksum
+
+
+@lru_cache(maxsize=65536)
+def _encode_tail(tail: str) -> Tuple[str, int, int]:
+    """Tail symbols with sum(v) and sum(k * v) so the checksum can be shifted to any offset."""
+    values = [_value(char) for char in tail]
+    return "".join(SYMBOLS[v] for v in values), sum(values), sum(k * v for k, v in enumerate(values, start=1))
+
+
+def encode(label: str) -> str:
+    """Code 128-B module string for one label (start, data, check digit, stop)."""
+    tail = _TAIL_RE.search(label).group(0)
+    prefix = label[: len(label) - len(tail)]
+    prefix_modules, checksum = _encode_prefix(prefix)
+    tail_modules, tail_sum, tail_weighted = _encode_tail(tail)
+    checksum += len(prefix) * tail_sum + tail_weighted
+    return prefix_modules + tail_modules + SYMBOLS[checksum % 103] + SYMBOLS[STOP]
+
+
+def encode_many(labels: Iterable[str]) -> List[str]:
+    return [encode(label) for label in labels]
+
+
+def encode_series(labels: pd.Series) -> pd.Series:
+    """Encode a label column; each distinct label is encoded once."""
+    codes, uniques = pd.factorize(labels)
+    encoded = pd.Series(encode_many(uniques.astype(str)), dtype=object)
+    result = encoded.reindex(codes).reset_index(drop=True)
+    result[codes < 0] = None
+    result.index = labels.index
+    return result
+
+
+def font_text(label: str) -> str:
+    """
+    Symbol values mapped to the usual Code 128 font character set (e.g. Libre Barcode 128):
+    values 0-94 are chr(value + 32), 95-106 are chr(value + 100).
+    """
+    values = [START_B] + [_value(char) for char in label]
+    checksum = (START_B + sum(i * v for i, v in enumerate(values[1:], start=1))) % 103
+    values += [checksum, STOP]
+    return "".join(chr(v + 32) if v < 95 else chr(v + 100) for v in values)
+
+
+def bar_runs(modules: str) -> List[Tuple[int, int]]:
+    """(start, width) of every bar, in modules."""
+    return [(m.start(), m.end() - m.start()) for m in re.finditer("1+", modules)]
+
+
+def to_svg(modules: str, module_width: float = 2, height: float = 50, quiet_zone: int = QUIET_ZONE) -> str:
+    width = (len(modules) + 2 * quiet_zone) * module_width
+    rects = "".join(
+        f'<rect x="{(quiet_zone + start) * module_width:g}" width="{run * module_width:g}" height="{height:g}"/>'
+        for start, run in bar_runs(modules)
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{height:g}" viewBox="0 0 {width:g} {height:g}">'
+        f'<rect width="100%" height="100%" fill="#fff"/><g fill="#000">{rects}</g></svg>'
+    )
+
+
+def to_png(modules: str, module_width: int = 2, height: int = 50, quiet_zone: int = QUIET_ZONE) -> bytes:
+    """1-bit grayscale PNG; every pixel row of a linear barcode is identical, so it is built once."""
+    bits = ("0" * quiet_zone + modules + "0" * quiet_zone)
+    pixels = "".join(("0" if b == "1" else "1") * module_width for b in bits)
+    width = len(pixels)
+    row = b"\x00" + int(pixels.ljust(-(-width // 8) * 8, "1"), 2).to_bytes(-(-width // 8), "big")
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 1, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b"")
@@ -0,0 +1,300 @@
+# app/batch.py
+"""Multi-site batch runner: generate labels, bin bay mapping and EOA signage for many sites.
+
+A batch manifest is a JSON file with a "sites" list. Each site is an object (or the path of a
+JSON file holding one, relative to the manifest) with a "name" and any of three sections:
+
+    {"name": "SITE1",
+     "labels": {"format": "xlsx", "barcodes": false,
+                "groups": [{"name": "Aisle 1", "bays": "BAY-001-001-001 BAY-001-002-001",
+                            "shelves": 3, "bins_per_shelf": 5}]},
+     "mapping": {"format": "xlsx",
+                 "groups": [{"name": "Group 1", "bin_ids": [...], "bay_definition": "...",
+                             "height_cm": 30, "width_cm": 40, "depth_cm": 50, "zone": "...",
+                             "bay_type": "...", "bay_usage": "...", "outlier_dimensions": {}}]},
+     "eoa": {"format": "xlsx",
+             "modules": [{"name": "P-1-A", "aisle_start": 200, "aisle_end": 210,
+                          "slots": [1, 199], "outlier_slots": {"205": [1, 150]}}],
+             "standard_layout": "P-1-A: 200, 201/202", "cross_module_layout": "",
+             "placement_rule": "Odd on Left / Even on Right"}}
+
+Fields take the same values as the Streamlit forms; bay and bin IDs may be a list or pasted text,
+and either may use ranges such as "BAY-001-001..BAY-001-400".
+Sites are sharded across a process pool and written to one directory per site. A failing site
+is recorded and the batch carries on; summary.csv / summary.json list status and timings.
+
+    python -m app.batch sites.json --output out/ --workers 4
+"""
+import argparse
+import json
+import os
+import re
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from app.checks import check_duplicate_bay_ids, check_duplicate_bin_ids, check_duplicate_aisles, check_reserved_group_names
+from app.eoa import ODD_LEFT_RULE, validate_eoa_layout
+from app.exports import export_bin_labels, export_bin_mapping, export_eoa_signage
+from app.ranges import BAY_SEPARATORS, BIN_SEPARATORS, IdList, parse_id_list
+
+TOOLS = ("labels", "mapping", "eoa")
+
+SUMMARY_COLUMNS = ["site", "status", "seconds", "labels_seconds", "mapping_seconds", "eoa_seconds", "outputs", "warnings", "error"]
+
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+def load_batch_manifest(path: str) -> List[Dict[str, Any]]:
+    """Site specs of a batch manifest, with site file references loaded."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    sites = manifest.get("sites") if isinstance(manifest, dict) else manifest
+    if not isinstance(sites, list) or not sites:
+        raise ValueError(f"Batch manifest '{path}' has no 'sites' list.")
+    base = os.path.dirname(os.path.abspath(path))
+    specs = []
+    for i, site in enumerate(sites, start=1):
+        if isinstance(site, str):
+            with open(os.path.join(base, site), encoding="utf-8") as f:
+                site = json.load(f)
+        if not isinstance(site, dict) or not str(site.get("name", "")).strip():
+            raise ValueError(f"Site {i} in '{path}' has no name.")
+        specs.append(site)
+    names = [str(site["name"]).strip() for site in specs]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Duplicate site name(s) in '{path}': {', '.join(duplicated)}.")
+    return specs
+
+
+def _id_list(value: Any, separators: "re.Pattern") -> Sequence[str]:
+    """IDs of pasted text (ranges are kept lazy) or of a list, which may also hold range strings."""
+    if isinstance(value, str):
+        errors: List[str] = []
+        ids = parse_id_list(value, separators, errors)
+        _check(errors)
+        return ids
+    items = []
+    for v in value or []:
+        v = str(v).strip()
+        if v:
+            items.extend(_id_list(v, separators).items if ".." in v else [v])
+    return IdList(items)
+
+
+def label_groups(section: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Bay groups in the shape the label builders expect (shelf count or list, bin count or dict)."""
+    groups = []
+    for i, group in enumerate(section.get("groups", []), start=1):
+        shelves = group.get("shelves", 3)
+        shelves = list(string.ascii_uppercase[:int(shelves)]) if isinstance(shelves, int) else [str(s) for s in shelves]
+        bins = group.get("bins_per_shelf", 5)
+        bins_per_shelf = {shelf: int(bins.get(shelf, 0)) for shelf in shelves} if isinstance(bins, dict) else {shelf: int(bins) for shelf in shelves}
+        bays = _id_list(group.get("bays"), BAY_SEPARATORS)
+        if bays:
+            groups.append({"name": str(group.get("name") or f"Bay Group {i}").strip(), "bays": bays,
+                           "shelves": shelves, "bins_per_shelf": bins_per_shelf})
+    return groups
+
+
+def mapping_groups(section: Dict[str, Any]) -> List[Dict[str, Any]]:
+    groups = []
+    for i, group in enumerate(section.get("groups", []), start=1):
+        bin_ids = _id_list(group.get("bin_ids"), BIN_SEPARATORS)
+        if bin_ids:
+            groups.append({
+                "name": str(group.get("name") or f"Bay Definition Group {i}").strip(),
+                "bin_ids": bin_ids,
+                "bay_definition": group.get("bay_definition", ""),
+                "height_cm": float(group.get("height_cm", 0.0)),
+                "width_cm": float(group.get("width_cm", 0.0)),
+                "depth_cm": float(group.get("depth_cm", 0.0)),
+                "bay_usage": group.get("bay_usage", ""),
+                "bay_type": group.get("bay_type", ""),
+                "zone": group.get("zone", ""),
+                "outlier_dimensions": {str(k).upper(): v for k, v in group.get("outlier_dimensions", {}).items()},
+            })
+    return groups
+
+
+def eoa_aisle_details(section: Dict[str, Any]) -> Dict[str, Dict[int, Dict[str, Any]]]:
+    """Module definitions expanded to {module: {aisle: {"slots": (start, end)}}}, as the EOA form builds them."""
+    details = {}
+    for module in section.get("modules", []):
+        start = int(module["aisle_start"])
+        end = int(module.get("aisle_end", start))
+        default = tuple(module.get("slots", (1, 199)))
+        outliers = {int(aisle): tuple(slots) for aisle, slots in module.get("outlier_slots", {}).items()}
+        details[module["name"]] = {aisle: {"slots": outliers.get(aisle, default)} for aisle in range(start, end + 1)}
+    return details
+
+
+def _check(errors: List[str]) -> None:
+    if errors:
+        raise ValueError(" ".join(errors))
+
+
+def _write(site_dir: str, result: Dict[str, Any]) -> str:
+    path = os.path.join(site_dir, result["file_name"])
+    with open(path, "wb") as f:
+        f.write(result["data"])
+    return path
+
+
+def site_dir_names(sites: List[Dict[str, Any]]) -> List[str]:
+    """
+    One directory name per site: the name with path characters replaced, and " (2)", " (3)" ...
+    added where two names (e.g. "SITE/2" and "SITE_2") would otherwise share a directory.
+    Compared case-insensitively, as on Windows and macOS file systems.
+    """
+    used, names = set(), []
+    for site in sites:
+        base = re.sub(r'[\\/:*?"<>|]+', "_", str(site["name"]).strip())
+        name, n = base, 2
+        while name.lower() in used:
+            name, n = f"{base} ({n})", n + 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def run_site(site: Dict[str, Any], output_dir: str, dir_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate every tool configured for one site into `output_dir/<dir_name>/` (by default the
+    sanitised site name; run_batch passes names made unique across the batch).
+    A failing tool does not stop the others; the site is 'failed' if any tool failed.
+    """
+    started = time.perf_counter()
+    name = str(site["name"]).strip()
+    site_dir = os.path.join(output_dir, dir_name or site_dir_names([site])[0])
+    os.makedirs(site_dir, exist_ok=True)
+    summary = {"site": name, "status": "ok", "outputs": [], "warnings": [], "errors": []}
+
+    def labels(section):
+        groups = label_groups(section)
+        _check(check_duplicate_bay_ids(groups) + check_reserved_group_names(groups))
+        result = export_bin_labels(groups, section.get("format", "xlsx"), barcodes=bool(section.get("barcodes")))
+        summary["warnings"].extend(str(e) for e in result["errors"])
+        return result
+
+    def mapping(section):
+        groups = mapping_groups(section)
+        _check(check_duplicate_bin_ids(groups))
+        return export_bin_mapping(groups, section.get("format", "xlsx"))
+
+    def eoa(section):
+        modules = [{"mod": m["name"], "aisle_start": int(m["aisle_start"]), "aisle_end": int(m.get("aisle_end", m["aisle_start"]))}
+                   for m in section.get("modules", [])]
+        _check(check_duplicate_aisles(modules))
+        aisle_details = eoa_aisle_details(section)
+        summary["warnings"].extend(str(e) for e in validate_eoa_layout(
+            aisle_details, section.get("standard_layout", ""), section.get("cross_module_layout", "")))
+        result = export_eoa_signage(aisle_details, section.get("standard_layout", ""),
+                                    section.get("cross_module_layout", ""), section.get("placement_rule", ODD_LEFT_RULE),
+                                    section.get("format", "xlsx"))
+        summary["warnings"].extend(str(e) for e in result["errors"])
+        if result["data"] is None:
+            raise ValueError("No EOA signs were generated.")
+        return result
+
+    builders = {"labels": labels, "mapping": mapping, "eoa": eoa}
+    for tool in TOOLS:
+        build = builders[tool]
+        if not site.get(tool):
+            continue
+        tool_started = time.perf_counter()
+        try:
+            summary["outputs"].append(_write(site_dir, build(site[tool])))
+        except Exception as e:
+            summary["status"] = "failed"
+            summary["errors"].append(f"{tool}: {e}")
+        summary[f"{tool}_seconds"] = round(time.perf_counter() - tool_started, 3)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def _summary_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    row = {column: result.get(column) for column in SUMMARY_COLUMNS}
+    row["outputs"] = "; ".join(os.path.basename(p) for p in result.get("outputs", []))
+    row["warnings"] = len(result.get("warnings", []))
+    row["error"] = "; ".join(result.get("errors", []))
+    return row
+
+
+def run_batch(
+    sites: List[Dict[str, Any]],
+    output_dir: str,
+    workers: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> pd.DataFrame:
+    """
+    Run every site on a process pool (`workers` processes, default one per CPU) and write
+    summary.csv and summary.json to `output_dir`. Returns the summary, one row per site in
+    manifest order. Sites whose worker process died are reported as failed.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    results: Dict[int, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_site, site, output_dir, dir_name): i
+                   for i, (site, dir_name) in enumerate(zip(sites, site_dir_names(sites)))}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # includes BrokenProcessPool when a worker process dies
+                results[i] = {"site": str(sites[i]["name"]).strip(), "status": "failed", "errors": [f"worker: {e!r}"]}
+            if progress:
+                progress(len(results), len(sites), results[i]["site"])
+    ordered = [results[i] for i in range(len(sites))]
+    summary = pd.DataFrame([_summary_row(r) for r in ordered], columns=SUMMARY_COLUMNS)
+    summary.to_csv(os.path.join(output_dir, "summary.csv"), index=False)
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"seconds": round(time.perf_counter() - started, 3), "sites": ordered}, f, indent=1)
+    return summary
+
+
+def _shard(value: str) -> Tuple[int, int]:
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"'{value}' is not I/N, e.g. 0/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count == 0:
+        raise argparse.ArgumentTypeError(f"'{value}': the shard count N must be at least 1")
+    if index >= count:
+        raise argparse.ArgumentTypeError(f"'{value}': the shard index I must be below N (0 to {count - 1})")
+    return index, count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.batch", description="Generate outputs for many sites from a batch manifest.")
+    parser.add_argument("manifest", help="JSON batch manifest with a 'sites' list")
+    parser.add_argument("-o", "--output", default="batch_output", help="output directory (one sub-directory per site)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--shard", default=None, type=_shard, metavar="I/N", help="only run every N-th site starting at I (0-based), to split a batch across machines")
+    args = parser.parse_args(argv)
+
+    sites = load_batch_manifest(args.manifest)
+    if args.shard:
+        index, count = args.shard
+        sites = sites[index::count]
+
+    def report(done, total, site):
+        print(f"[{done}/{total}] {site}", file=sys.stderr)
+
+    summary = run_batch(sites, args.output, workers=args.workers, progress=report)
+    print(summary.to_string(index=False))
+    failed = int((summary["status"] != "ok").sum())
+    print(f"{len(summary) - failed} sites ok, {failed} failed; summary in {os.path.join(args.output, 'summary.csv')}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# app/checks.py
+"""Duplicate checks run on the bay groups, bin groups and module definitions before generating."""
+from app.manifest import reserved_group_names
+from app.metrics import DUPLICATE_CHECK_SECONDS
+from app.ranges import find_duplicate_ids
+
+
+def _duplicate_messages(groups, key, singular, plural):
+    """Duplicate warnings for ID lists that may hold ranges; ranges are compared without expanding them."""
+    names = [group["name"] for group in groups]
+    within, across = [], []
+    for ids, count, group_indexes, repeated_in in find_duplicate_ids([group[key] for group in groups]):
+        for i in repeated_in:
+            if count == 1:
+                within.append(f"⚠️ Duplicate {singular} '{ids}' found in {names[i]}.")
+            else:
+                within.append(f"⚠️ Duplicate {plural} '{ids}' ({count} IDs) found in {names[i]}.")
+        # groups sharing a name are one group, as before ranges were accepted
+        group_names = list(dict.fromkeys(names[i] for i in group_indexes))
+        if len(group_names) > 1:
+            label = singular[0].upper() + singular[1:]
+            if count == 1:
+                across.append(f"⚠️ {label} '{ids}' is duplicated across groups: {', '.join(group_names)}.")
+            else:
+                across.append(f"⚠️ {label}s '{ids}' ({count} IDs) are duplicated across groups: {', '.join(group_names)}.")
+    return within + across
+
+
+def check_duplicate_bay_ids(bay_groups):
+    with DUPLICATE_CHECK_SECONDS.time(kind="bay"):
+        return _duplicate_messages(bay_groups, "bays", "bay ID", "bay IDs")
+
+
+def check_reserved_group_names(bay_groups):
+    return [f"⚠️ Bay group name '{name}' is reserved for the export's manifest sheet; please rename the group."
+            for name in reserved_group_names(bay_groups)]
+
+
+def check_duplicate_bin_ids(bay_groups):
+    with DUPLICATE_CHECK_SECONDS.time(kind="bin"):
+        return _duplicate_messages(bay_groups, "bin_ids", "bin ID", "bin IDs")
+
+
+def check_duplicate_aisles(mod_groups):
+    with DUPLICATE_CHECK_SECONDS.time(kind="aisle"):
+        errors = []
+        all_aisles = {}
+        for group_idx, group in enumerate(mod_groups):
+            mod = group["mod"]
+            aisles = list(range(group["aisle_start"], group["aisle_end"] + 1))
+            for aisle in aisles:
+                aisle_key = f"{mod}-{aisle}"
+                if aisle_key in all_aisles:
+                    errors.append(f"⚠️ Aisle {aisle} in module {mod} is duplicated in module {all_aisles[aisle_key]}.")
+                else:
+                    all_aisles[aisle_key] = mod
+        return errors
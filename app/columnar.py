@@ -0,0 +1,234 @@
+# app/columnar.py
+"""Parquet / Arrow IPC export and import for the label, bin bay mapping and EOA signage tables.
+
+Tables are written one record batch at a time (a Parquet row group / IPC batch per chunk)
+so large sites never need a single in-memory DataFrame and are not limited by Excel's row cap.
+"""
+import io
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.labeltable import LabelTable
+from app.logic import parse_bay_definition, build_bin_mapping_rows
+
+PARQUET = "parquet"
+ARROW = "arrow"
+
+FILE_EXTENSIONS = {PARQUET: ".parquet", ARROW: ".arrow"}
+MIME_TYPES = {PARQUET: "application/vnd.apache.parquet", ARROW: "application/vnd.apache.arrow.file"}
+
+DEFAULT_CHUNK_ROWS = 65536
+
+LABEL_SCHEMA = pa.schema([
+    ("group", pa.string()),
+    ("bay_input", pa.string()),
+    ("normalized_bay", pa.string()),
+    ("shelf", pa.string()),
+    ("bin_label", pa.string()),
+])
+
+MAPPING_SCHEMA = pa.schema([
+    ("ScannableId", pa.string()),
+    ("Distance Index", pa.float64()),
+    ("Depth", pa.float64()),
+    ("Width", pa.float64()),
+    ("Height", pa.float64()),
+    ("Zone", pa.string()),
+    ("Bay Definition", pa.string()),
+    ("bin_size", pa.string()),
+    ("Bay Type", pa.string()),
+    ("Bay Usage", pa.string()),
+])
+
+EOA_SCHEMA = pa.schema([
+    ("Left.Mod", pa.string()),
+    ("Left.Aisle", pa.int32()),
+    ("Left.Slots", pa.string()),
+    ("Right.Mod", pa.string()),
+    ("Right.Aisle", pa.int32()),
+    ("Right.Slots", pa.string()),
+    ("Deployment Location", pa.string()),
+])
+
+ProgressCallback = Callable[[int, int, str], None]
+Sink = Union[str, io.IOBase]
+
+
+def _batch_from_rows(rows: List[Dict[str, Any]], schema: pa.Schema) -> pa.RecordBatch:
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def label_batches(table: LabelTable, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    """Long-layout label rows of a LabelTable, formatted chunk by chunk."""
+    for start in range(0, len(table), chunk_rows):
+        df = table.to_long(slice(start, start + chunk_rows))
+        yield pa.RecordBatch.from_pandas(df, schema=LABEL_SCHEMA, preserve_index=False)
+
+
+def mapping_batches(bay_groups: List[Dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    progress: Optional[ProgressCallback] = None) -> Iterator[pa.RecordBatch]:
+    """Bin Bay Mapping rows per group. Raises ValueError on the first invalid bay definition."""
+    for done, group in enumerate(bay_groups, start=1):
+        parsed = parse_bay_definition(group["bay_definition"])
+        if "error" in parsed:
+            raise ValueError(f"Invalid bay definition in {group['name']}: {parsed['error']}")
+        rows = build_bin_mapping_rows(group)
+        for start in range(0, len(rows), chunk_rows):
+            yield _batch_from_rows(rows[start:start + chunk_rows], MAPPING_SCHEMA)
+        if progress:
+            progress(done, len(bay_groups), group["name"])
+
+
+def eoa_batches(signage_data: List[Dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    """EOA sign rows; the blank side of a single-sided sign becomes nulls instead of empty strings."""
+    for start in range(0, len(signage_data), chunk_rows):
+        rows = [{k: (None if v == "" else v) for k, v in row.items()} for row in signage_data[start:start + chunk_rows]]
+        yield _batch_from_rows(rows, EOA_SCHEMA)
+
+
+def write_batches(batches: Iterable[pa.RecordBatch], schema: pa.Schema, sink: Sink, fmt: str = PARQUET) -> int:
+    """Stream record batches to `sink` as Parquet (one row group per batch) or an Arrow IPC file. Returns rows written."""
+    rows = 0
+    if fmt == PARQUET:
+        with pq.ParquetWriter(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    elif fmt == ARROW:
+        with pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    else:
+        raise ValueError(f"Unknown columnar format '{fmt}'")
+    return rows
+
+
+def _to_bytes(write: Callable[[Sink], Any]) -> Tuple[bytes, Any]:
+    """Run `write(sink)` into an in-memory buffer; exports given a sink (e.g. a spool file) skip this copy."""
+    sink = pa.BufferOutputStream()
+    value = write(sink)
+    return sink.getvalue().to_pybytes(), value
+
+
+def write_bin_labels_columnar(
+    bay_groups: List[Dict[str, Any]],
+    sink: Sink,
+    fmt: str = PARQUET,
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Dict[str, int]:
+    """Columnar counterpart of write_bin_labels_zip: one row per bin, all groups in one file written to `sink`."""
+    stats = {"labels": 0, "bays": 0}
+
+    def batches():
+        for done, group in enumerate(bay_groups, start=1):
+            table = LabelTable.from_bays(group["name"], group["bays"], group["shelves"], group["bins_per_shelf"], errors=errors)
+            stats["labels"] += len(table)
+            stats["bays"] += int(table.bays["bay_input"].nunique())
+            yield from label_batches(table, chunk_rows)
+            if progress:
+                progress(done, len(bay_groups), group["name"])
+
+    write_batches(batches(), LABEL_SCHEMA, sink, fmt)
+    return stats
+
+
+def build_bin_labels_columnar(
+    bay_groups: List[Dict[str, Any]],
+    fmt: str = PARQUET,
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Tuple[bytes, Dict[str, int]]:
+    """write_bin_labels_columnar into memory: returns (file bytes, stats)."""
+    return _to_bytes(lambda sink: write_bin_labels_columnar(bay_groups, sink, fmt, errors, progress, chunk_rows))
+
+
+def write_bin_mapping_columnar(bay_groups: List[Dict[str, Any]], sink: Sink, fmt: str = PARQUET,
+                               progress: Optional[ProgressCallback] = None) -> int:
+    """Returns the number of mapped bins."""
+    return write_batches(mapping_batches(bay_groups, progress=progress), MAPPING_SCHEMA, sink, fmt)
+
+
+def build_bin_mapping_columnar(bay_groups: List[Dict[str, Any]], fmt: str = PARQUET,
+                               progress: Optional[ProgressCallback] = None) -> Tuple[bytes, int]:
+    """Returns (file bytes, number of mapped bins)."""
+    return _to_bytes(lambda sink: write_bin_mapping_columnar(bay_groups, sink, fmt, progress))
+
+
+def write_eoa_columnar(signage_data: List[Dict[str, Any]], sink: Sink, fmt: str = PARQUET) -> int:
+    return write_batches(eoa_batches(signage_data), EOA_SCHEMA, sink, fmt)
+
+
+def build_eoa_columnar(signage_data: List[Dict[str, Any]], fmt: str = PARQUET) -> bytes:
+    return _to_bytes(lambda sink: write_eoa_columnar(signage_data, sink, fmt))[0]
+
+
+def read_table(source: Union[str, bytes, io.IOBase]) -> pd.DataFrame:
+    """Load a Parquet or Arrow IPC file (format detected from the magic bytes) for re-validation."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            data = f.read()
+    elif isinstance(source, bytes):
+        data = source
+    else:
+        data = source.read()
+    buf = pa.BufferReader(data)
+    if data[:4] == b"PAR1":
+        return pq.read_table(buf).to_pandas()
+    if data[:6] == b"ARROW1":
+        return pa.ipc.open_file(buf).read_all().to_pandas()
+    return pa.ipc.open_stream(buf).read_all().to_pandas()
+
+
+def _missing_columns(df: pd.DataFrame, schema: pa.Schema) -> List[str]:
+    missing = [name for name in schema.names if name not in df.columns]
+    return [f"⚠️ Missing column(s): {', '.join(missing)}."] if missing else []
+
+
+def validate_labels(df: pd.DataFrame) -> List[str]:
+    """Re-validate an imported label table: required columns present and no bin label used twice."""
+    missing = _missing_columns(df, LABEL_SCHEMA)
+    if missing:
+        return missing
+    labels = df["bin_label"].astype(str).str.strip().str.upper()
+    duplicated = labels.duplicated(keep=False)
+    if not duplicated.any():
+        return []
+    errors = []
+    for label, groups in df.loc[duplicated, "group"].astype(str).groupby(labels[duplicated], sort=False):
+        errors.append(f"⚠️ Bin label '{label}' appears {len(groups)} times in: {', '.join(dict.fromkeys(groups))}.")
+    return errors
+
+
+def validate_mapping(df: pd.DataFrame) -> List[str]:
+    """Re-validate an imported bin bay mapping: required columns present and every bin mapped once."""
+    missing = _missing_columns(df, MAPPING_SCHEMA)
+    if missing:
+        return missing
+    bins = df["ScannableId"].astype(str).str.strip().str.upper()
+    duplicated = bins.duplicated(keep=False)
+    errors = []
+    for bin_id, definitions in df.loc[duplicated, "Bay Definition"].astype(str).groupby(bins[duplicated], sort=False):
+        errors.append(f"⚠️ Bin ID '{bin_id}' is mapped {len(definitions)} times, in: {', '.join(dict.fromkeys(definitions))}.")
+    return errors
+
+
+def validate_eoa(df: pd.DataFrame) -> List[str]:
+    """Re-validate imported EOA signage: required columns present and one low and one high end sign per aisle."""
+    missing = _missing_columns(df, EOA_SCHEMA)
+    if missing:
+        return missing
+    end = df["Deployment Location"].astype(str).str.split(" ", n=1).str[0]
+    sides = [pd.DataFrame({"mod": df[f"{side}.Mod"], "aisle": df[f"{side}.Aisle"], "end": end}) for side in ("Left", "Right")]
+    signs = pd.concat(sides, ignore_index=True).dropna()
+    signs = signs[signs["mod"].astype(str) != ""]
+    counts = signs.groupby(["mod", "aisle", "end"], sort=False).size()
+    return [f"⚠️ Aisle {int(aisle)} of module {mod} has {count} {end} End signs."
+            for (mod, aisle, end), count in counts[counts > 1].items()]
+
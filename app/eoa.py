@@ -0,0 +1,270 @@
+# app/eoa.py
+from typing import List, Dict, Any, Tuple, Callable, Optional
+
+from app.errors import ErrorRecord
+
+ODD_LEFT_RULE = "Odd on Left / Even on Right"
+EVEN_LEFT_RULE = "Even on Left / Odd on Right"
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+def _slots(details: Dict[str, Any], reverse: bool = False) -> str:
+    start, end = details["slots"]
+    return f"{end}-{start}" if reverse else f"{start}-{end}"
+
+
+def _pair_signs(left_mod: str, left_aisle: int, left_details: Dict[str, Any],
+                right_mod: str, right_aisle: int, right_details: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"Left.Mod": left_mod, "Left.Aisle": left_aisle, "Left.Slots": _slots(left_details), "Right.Mod": right_mod, "Right.Aisle": right_aisle, "Right.Slots": _slots(right_details), "Deployment Location": f"Low End of Aisle {left_aisle}/{right_aisle}"},
+        {"Left.Mod": right_mod, "Left.Aisle": right_aisle, "Left.Slots": _slots(right_details, reverse=True), "Right.Mod": left_mod, "Right.Aisle": left_aisle, "Right.Slots": _slots(left_details, reverse=True), "Deployment Location": f"High End of Aisle {left_aisle}/{right_aisle}"},
+    ]
+
+
+def _single_signs(mod_name: str, aisle: int, details: Dict[str, Any], placement_rule: str) -> List[Dict[str, Any]]:
+    is_even = aisle % 2 == 0
+    low_end_side = "Right" if (placement_rule == ODD_LEFT_RULE and is_even) or (placement_rule == EVEN_LEFT_RULE and not is_even) else "Left"
+    high_end_side = "Left" if low_end_side == "Right" else "Right"
+    empty = {"Mod": "", "Aisle": "", "Slots": ""}
+    signs = []
+    for end, side, reverse in (("Low", low_end_side, False), ("High", high_end_side, True)):
+        other = "Left" if side == "Right" else "Right"
+        sign = {"Deployment Location": f"{end} End of Aisle {aisle}"}
+        sign.update({f"{side}.Mod": mod_name, f"{side}.Aisle": aisle, f"{side}.Slots": _slots(details, reverse=reverse)})
+        sign.update({f"{other}.{k}": v for k, v in empty.items()})
+        signs.append(sign)
+    return signs
+
+
+Aisle = Tuple[str, int]
+
+
+# the layout parsers shared by build_eoa_signage and validate_eoa_layout, so a layout that
+# validates is read the same way when the signs are generated
+
+def _parse_cross_pair(pair_str: str) -> Tuple[Aisle, Aisle]:
+    """'P-1-A-201 / P-1-B-200' as ((module, aisle), (module, aisle)); raises ValueError."""
+    halves = pair_str.split('/')
+    if len(halves) != 2:
+        raise ValueError(f"a cross-module pair is MODULE-AISLE/MODULE-AISLE, '{pair_str}' has {len(halves)} parts")
+    (left_mod, left_aisle), (right_mod, right_aisle) = (half.strip().rsplit('-', 1) for half in halves)
+    return (left_mod.strip(), int(left_aisle)), (right_mod.strip(), int(right_aisle))
+
+
+def _parse_aisle_group(group: str) -> List[int]:
+    """A standard layout entry, '203' or '201/202', as its one or two aisle numbers; raises ValueError."""
+    aisles = [int(a) for a in group.split('/')]
+    if len(aisles) > 2:
+        raise ValueError(f"pair '{group}' names {len(aisles)} aisles ({', '.join(map(str, aisles))}); a pair is two aisles, LEFT/RIGHT")
+    return aisles
+
+
+def build_eoa_signage(
+    aisle_details: Dict[str, Dict[int, Dict[str, Any]]],
+    standard_layout_input: str,
+    cross_module_layout_input: str,
+    placement_rule: str = ODD_LEFT_RULE,
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[List[Dict[str, Any]], List[ErrorRecord]]:
+    """
+    Build EOA sign definitions from the module aisle details and the two layout text areas.
+
+    Cross-module pairs are processed first; aisles that already have a sign are skipped (and reported)
+    in the standard layouts. Run validate_eoa_layout first to catch such conflicts up front.
+    Returns (signage_data, errors). `progress(done, total, message)` is called after each layout line.
+    """
+    signage_data = []
+    errors = []
+    processed_aisles = set()
+
+    cross_module_pairs = [p.strip() for p in cross_module_layout_input.splitlines() if p.strip()]
+    standard_layout_lines = [line.strip() for line in standard_layout_input.splitlines() if line.strip()]
+    total = len(cross_module_pairs) + len(standard_layout_lines)
+    done = 0
+
+    # --- 1. Process Cross-Module Pairs ---
+    for pair_str in cross_module_pairs:
+        try:
+            (left_mod, left_aisle), (right_mod, right_aisle) = _parse_cross_pair(pair_str)
+
+            left_details = aisle_details.get(left_mod, {}).get(left_aisle)
+            right_details = aisle_details.get(right_mod, {}).get(right_aisle)
+
+            if not left_details or not right_details:
+                errors.append(ErrorRecord("", pair_str, "layout", f"Details not found for cross-module pair: {pair_str}"))
+            else:
+                signage_data.extend(_pair_signs(left_mod, left_aisle, left_details, right_mod, right_aisle, right_details))
+                processed_aisles.add(f"{left_mod}-{left_aisle}")
+                processed_aisles.add(f"{right_mod}-{right_aisle}")
+        except Exception as e:
+            errors.append(ErrorRecord("", pair_str, "layout", f"Could not parse cross-module pair '{pair_str}'. Error: {e}"))
+        done += 1
+        if progress:
+            progress(done, total, pair_str)
+
+    # --- 2. Process Standard Layouts ---
+    for line in standard_layout_lines:
+        try:
+            mod_part, aisles_part = line.split(":", 1)
+            mod_name = mod_part.strip()
+            aisle_groups = [ag.strip() for ag in aisles_part.split(',') if ag.strip()]
+
+            for group in aisle_groups:
+                aisles = _parse_aisle_group(group)
+                if len(aisles) == 2:
+                    left_aisle, right_aisle = aisles
+                    if f"{mod_name}-{left_aisle}" in processed_aisles or f"{mod_name}-{right_aisle}" in processed_aisles:
+                        errors.append(ErrorRecord(mod_name, group, "layout", f"Pair {group} in module {mod_name} skipped: an aisle already has a sign"))
+                        continue
+                    left_details = aisle_details.get(mod_name, {}).get(left_aisle)
+                    right_details = aisle_details.get(mod_name, {}).get(right_aisle)
+                    if not left_details or not right_details:
+                        errors.append(ErrorRecord(mod_name, group, "layout", f"Details not found for pair {group} in module {mod_name}"))
+                        continue
+                    signage_data.extend(_pair_signs(mod_name, left_aisle, left_details, mod_name, right_aisle, right_details))
+                    processed_aisles.add(f"{mod_name}-{left_aisle}")
+                    processed_aisles.add(f"{mod_name}-{right_aisle}")
+                else:
+                    aisle = aisles[0]
+                    if f"{mod_name}-{aisle}" in processed_aisles:
+                        errors.append(ErrorRecord(mod_name, str(aisle), "layout", f"Single aisle {aisle} in module {mod_name} skipped: it already has a sign"))
+                        continue
+                    details = aisle_details.get(mod_name, {}).get(aisle)
+                    if not details:
+                        errors.append(ErrorRecord(mod_name, str(aisle), "layout", f"Details not found for single aisle {aisle} in module {mod_name}"))
+                        continue
+                    signage_data.extend(_single_signs(mod_name, aisle, details, placement_rule))
+                    processed_aisles.add(f"{mod_name}-{aisle}")
+        except Exception as e:
+            errors.append(ErrorRecord(line.split(":", 1)[0].strip(), "", "layout", f"Could not process layout line: '{line}'. Error: {e}"))
+        done += 1
+        if progress:
+            progress(done, total, line)
+
+    return signage_data, errors
+
+
+class _DisjointSets:
+    """Union-find over hashable items, with path halving and union by size."""
+
+    def __init__(self):
+        self.parent: Dict[Any, Any] = {}
+        self.size: Dict[Any, int] = {}
+
+    def add(self, item: Any) -> None:
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item: Any) -> Any:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: Any, b: Any) -> None:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+def _aisle_runs(aisles: List[int]) -> List[Tuple[int, int]]:
+    """Consecutive runs (first, last) of a list of aisle numbers, in the order given."""
+    runs = []
+    for aisle in aisles:
+        if runs and aisle == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], aisle)
+        else:
+            runs.append((aisle, aisle))
+    return runs
+
+
+def validate_eoa_layout(
+    aisle_details: Dict[str, Dict[int, Dict[str, Any]]],
+    standard_layout_input: str,
+    cross_module_layout_input: str,
+) -> List[ErrorRecord]:
+    """
+    Check the layouts against the defined aisles before any signage is generated.
+
+    Every layout entry (a single aisle, a pair, a cross-module pair) is an edge in a graph of
+    (module, aisle) nodes; each aisle must be named by exactly one entry. Reports, in this order:
+    unparseable entries, undefined aisles (not in `aisle_details`), double-paired aisles (degree
+    above one, one record per union-find component so a chain of pairs is reported once) and
+    unpaired aisles (degree zero, as runs per module). One pass over the entries and aisles.
+    """
+    errors = []
+    uses: Dict[Aisle, List[str]] = {}
+    sets = _DisjointSets()
+
+    def add_entry(entry: str, aisles: List[Aisle]) -> None:
+        for aisle in aisles:
+            uses.setdefault(aisle, []).append(entry)
+            sets.add(aisle)
+        if len(aisles) == 2:
+            sets.union(*aisles)
+
+    for pair_str in (p.strip() for p in cross_module_layout_input.splitlines()):
+        if not pair_str:
+            continue
+        try:
+            left, right = _parse_cross_pair(pair_str)
+        except ValueError as e:
+            errors.append(ErrorRecord("", pair_str, "unparseable", f"Could not parse cross-module pair '{pair_str}'. Error: {e}"))
+            continue
+        add_entry(pair_str, [left, right])
+
+    for line in (l.strip() for l in standard_layout_input.splitlines()):
+        if not line:
+            continue
+        if ":" not in line:
+            errors.append(ErrorRecord("", line, "unparseable", f"Layout line '{line}' has no 'MODULE:' prefix"))
+            continue
+        mod_part, aisles_part = line.split(":", 1)
+        mod_name = mod_part.strip()
+        for group in (g.strip() for g in aisles_part.split(',')):
+            if not group:
+                continue
+            try:
+                numbers = _parse_aisle_group(group)
+            except ValueError as e:
+                errors.append(ErrorRecord(mod_name, group, "unparseable", f"Could not parse '{group}' in module {mod_name}. Error: {e}"))
+                continue
+            add_entry(f"{mod_name}: {group}", [(mod_name, a) for a in numbers])
+
+    for mod_name, aisle in uses:
+        if mod_name not in aisle_details:
+            errors.append(ErrorRecord(mod_name, str(aisle), "undefined", f"Aisle {aisle} is in module {mod_name}, which is not defined"))
+        elif aisle not in aisle_details[mod_name]:
+            errors.append(ErrorRecord(mod_name, str(aisle), "undefined", f"Aisle {aisle} is not defined in module {mod_name}"))
+
+    conflicts: Dict[Aisle, List[Aisle]] = {}
+    for aisle, entries in uses.items():
+        if len(entries) > 1:
+            conflicts.setdefault(sets.find(aisle), []).append(aisle)
+    if conflicts:
+        members: Dict[Aisle, List[Aisle]] = {}
+        for aisle in uses:
+            root = sets.find(aisle)
+            if root in conflicts:
+                members.setdefault(root, []).append(aisle)
+        for root, repeated in conflicts.items():
+            entries = list(dict.fromkeys(e for aisle in members[root] for e in uses[aisle]))
+            names = ", ".join(f"{m}-{a}" for m, a in repeated)
+            errors.append(ErrorRecord(repeated[0][0], ", ".join(str(a) for _, a in repeated), "double-paired",
+                                      f"{'Aisles' if len(repeated) > 1 else 'Aisle'} {names} "
+                                      f"{'are' if len(repeated) > 1 else 'is'} in more than one layout entry: {'; '.join(entries)}"))
+
+    for mod_name, aisles in aisle_details.items():
+        for first, last in _aisle_runs([a for a in aisles if (mod_name, a) not in uses]):
+            bay = str(first) if first == last else f"{first}-{last}"
+            errors.append(ErrorRecord(mod_name, bay, "unpaired",
+                                      f"{'Aisle' if first == last else 'Aisles'} {bay} of module {mod_name} "
+                                      f"{'is' if first == last else 'are'} not in any layout, so no sign is generated"))
+    return errors
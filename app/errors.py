@@ -0,0 +1,82 @@
+# app/errors.py
+"""Structured generation errors and their grouped summary.
+
+Generators append ErrorRecord(group, bay, stage, reason) to the `errors` list they are given
+instead of reporting each problem themselves. A record prints as the old one-line message, so
+code that treats errors as text keeps working; the UI groups them by stage and reason (with
+IDs masked out) and offers the full list as CSV instead of one element per bad bay.
+"""
+import re
+from typing import Iterable, List, NamedTuple, Union
+
+import pandas as pd
+import streamlit as st
+
+ERROR_COLUMNS = ["group", "bay", "stage", "reason"]
+SUMMARY_COLUMNS = ["stage", "group", "reason", "count", "examples"]
+
+_MESSAGES = {
+    "parse": "Error processing bay ID '{bay}': {reason}",
+    "style": "Error styling Excel sheet '{group}': {reason}",
+    "diagram": "Error generating diagram for '{bay}': {reason}",
+}
+# quoted values and long numbers differ per bay; masking them lets equal problems share a row
+_VARYING_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\d{3,}")
+_EXAMPLES = 3
+
+
+class ErrorRecord(NamedTuple):
+    group: str
+    bay: str
+    stage: str
+    reason: str
+
+    def __str__(self) -> str:
+        return _MESSAGES.get(self.stage, "{reason}").format(**self._asdict())
+
+
+Error = Union[ErrorRecord, str]
+
+
+def error_frame(errors: Iterable[Error]) -> pd.DataFrame:
+    """One row per error; plain-text errors (e.g. from older callers) get the 'general' stage."""
+    rows = [e if isinstance(e, ErrorRecord) else ErrorRecord("", "", "general", str(e)) for e in errors]
+    return pd.DataFrame(rows, columns=ERROR_COLUMNS)
+
+
+def _examples(bays: pd.Series) -> str:
+    return ", ".join(list(dict.fromkeys(b for b in bays if b))[:_EXAMPLES])
+
+
+def error_summary(errors: Iterable[Error]) -> pd.DataFrame:
+    """Errors grouped by stage, group and masked reason, most frequent first, with a few example bays."""
+    df = error_frame(errors)
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    df["pattern"] = df["reason"].str.replace(_VARYING_RE, "…", regex=True)
+    grouped = df.groupby(["stage", "group", "pattern"], sort=False)
+    summary = grouped.agg(
+        count=("reason", "size"),
+        reason=("reason", "first"),
+        examples=("bay", _examples),
+    ).reset_index()
+    summary["reason"] = summary["pattern"].where(summary["count"] > 1, summary["reason"])
+    return summary.sort_values("count", ascending=False, kind="stable")[SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def errors_csv(errors: Iterable[Error]) -> bytes:
+    return error_frame(errors).to_csv(index=False).encode("utf-8")
+
+
+def render_errors(errors: List[Error], key: str, title: str = "items could not be processed",
+                  note: str = "the affected items were skipped") -> None:
+    """One summary line, the grouped table and a CSV download, however many errors there are."""
+    if not errors:
+        return
+    summary = error_summary(errors)
+    kinds = f"{len(summary):,} distinct problem{'s' if len(summary) != 1 else ''}"
+    st.error(f"⚠️ {len(errors):,} {title} ({kinds}); {note}.")
+    with st.expander("Error summary", expanded=len(summary) <= 5):
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+        st.download_button("📥 Download Errors (CSV)", data=errors_csv(errors), file_name=f"{key}.csv",
+                           mime="text/csv", key=f"download_{key}")
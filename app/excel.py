@@ -1,9 +1,33 @@
 # app/excel.py
 import io
+import re
+import zipfile
 import pandas as pd
-from typing import Optional
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill, Alignment, Font, Border, Side
 from openpyxl.utils import get_column_letter
 
+from app.barcode import font_text
+from app.errors import ErrorRecord
+from app.labeltable import LabelTable
+from app.logic import parse_bay_definition, build_bin_mapping_rows
+from app.manifest import (MANIFEST, MANIFEST_FILE, MANIFEST_SHEET, WORKBOOK, ZIP, build_manifest, diff_manifests, export_kind,
+                          manifest_json, manifest_subset, read_manifest, reserved_group_names, write_manifest_sheet)
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MIME = "application/zip"
+
+HEX_COLORS = [
+    "339900", "9B30FF", "FFFF00", "00FFFF", "CC0000", "F88017",
+    "FF00FF", "996600", "00FF00", "FF6565", "9999FE"
+]
+
+BARCODE_FONT = "Libre Barcode 128"
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
 def build_excel_bytes(df: pd.DataFrame) -> bytes:
     """Write the labels DataFrame to an Excel file in memory and return bytes."""
     output = io.BytesIO()
@@ -15,6 +39,329 @@ def build_excel_bytes(df: pd.DataFrame) -> bytes:
         for i, col in enumerate(df.columns, 1):
             max_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
             ws.column_dimensions[get_column_letter(i)].width = max_len
-        writer.save()
     output.seek(0)
     return output.read()
+
+
+def style_label_sheet(ws, df: pd.DataFrame, shelves: List[str]) -> None:
+    """Apply the bin label sheet styling: shelf colour legend in rows 1-2, bold bordered cells below."""
+    yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                    top=Side(style='thin'), bottom=Side(style='thin'))
+    bold_font = Font(bold=True)
+    center_align = Alignment(horizontal="center", vertical="center")
+
+    styling_colors = ["FFFFFF"] + HEX_COLORS
+
+    if shelves:
+        ws.merge_cells('A1:C1')
+        ws['A1'] = "HEX COLOR CODES ->"
+        ws['A1'].fill = yellow_fill
+        ws['A1'].font = bold_font
+        ws['A1'].alignment = center_align
+        ws['A1'].border = border
+
+        for i, hex_color in enumerate(styling_colors[:len(shelves)]):
+            col_letter = get_column_letter(4 + i)
+            ws[f"{col_letter}1"] = hex_color
+            ws[f"{col_letter}1"].fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
+            ws[f"{col_letter}1"].font = bold_font
+            ws[f"{col_letter}1"].alignment = center_align
+            ws[f"{col_letter}1"].border = border
+
+            ws[f"{col_letter}2"] = shelves[i]
+            ws[f"{col_letter}2"].fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
+            ws[f"{col_letter}2"].font = bold_font
+            ws[f"{col_letter}2"].alignment = center_align
+            ws[f"{col_letter}2"].border = border
+
+    header_row = 2 if shelves else 1
+    for col in range(1, df.shape[1] + 1):
+        cell = ws.cell(row=header_row, column=col)
+        cell.font = bold_font
+        cell.alignment = center_align
+        cell.border = border
+
+    for row in ws.iter_rows(min_row=header_row + 1, max_row=ws.max_row, max_col=ws.max_column):
+        for cell in row:
+            if cell.value is not None:
+                cell.font = bold_font
+                cell.alignment = center_align
+                cell.border = border
+
+
+def add_barcode_columns(df: pd.DataFrame, shelves: List[str]) -> pd.DataFrame:
+    """Append a '<shelf> BARCODE' column per shelf holding the Code 128 font string of each label."""
+    df = df.copy()
+    # each distinct label is encoded once (setdefault would evaluate font_text for every row)
+    cache: Dict[str, str] = {}
+
+    def encoded(label: str) -> str:
+        if label not in cache:
+            cache[label] = font_text(label)
+        return cache[label]
+
+    for shelf in shelves:
+        df[f"{shelf} BARCODE"] = [encoded(label) if isinstance(label, str) else None for label in df[shelf]]
+    return df
+
+
+def style_barcode_columns(ws, df: pd.DataFrame, header_row: int) -> None:
+    barcode_font = Font(name=BARCODE_FONT, size=36)
+    for col, name in enumerate(df.columns, 1):
+        if not str(name).endswith(" BARCODE"):
+            continue
+        ws.column_dimensions[get_column_letter(col)].width = 40
+        for row in ws.iter_rows(min_row=header_row + 1, max_row=ws.max_row, min_col=col, max_col=col):
+            for cell in row:
+                if cell.value is not None:
+                    cell.font = barcode_font
+
+
+def write_label_sheet(writer: pd.ExcelWriter, group: Dict[str, Any], stats: Dict[str, int],
+                      errors: Optional[List[str]] = None, barcodes: bool = False) -> None:
+    """
+    Generate one bay group's labels and write them as a styled sheet, adding to `stats`.
+    With `barcodes`, each shelf also gets a column rendered in the Code 128 barcode font.
+    """
+    table = LabelTable.from_bays(group["name"], group["bays"], group["shelves"], group["bins_per_shelf"], errors=errors)
+    if not len(table):
+        return
+    stats["labels"] += len(table)
+    stats["bays"] += int(table.bays["bay_input"].nunique())
+    # label strings are only formatted here, for the sheet being written
+    df = table.to_wide()
+    if barcodes:
+        df = add_barcode_columns(df, group["shelves"])
+    df.to_excel(writer, index=False, startrow=1, sheet_name=group["name"])
+    try:
+        style_label_sheet(writer.sheets[group["name"]], df, group["shelves"])
+        if barcodes:
+            style_barcode_columns(writer.sheets[group["name"]], df, 2 if group["shelves"] else 1)
+    except Exception as e:
+        if errors is not None:
+            errors.append(ErrorRecord(group["name"], "", "style", str(e)))
+
+
+def _check_sheet_names(bay_groups: List[Dict[str, Any]]) -> None:
+    reserved = reserved_group_names(bay_groups)
+    if reserved:
+        raise ValueError(f"Bay group name '{reserved[0]}' is reserved for the manifest sheet; rename the group.")
+
+
+def build_bin_labels_workbook(
+    bay_groups: List[Dict[str, Any]],
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    barcodes: bool = False,
+) -> Tuple[bytes, Dict[str, int]]:
+    """
+    One styled sheet per bay group, plus the hidden manifest sheet used by update_bin_labels_workbook.
+    Returns (xlsx bytes, stats) where stats holds 'labels' and 'bays'.
+    `progress(done, total, group_name)` is called after each group.
+    """
+    _check_sheet_names(bay_groups)
+    output = io.BytesIO()
+    stats = {"labels": 0, "bays": 0}
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for done, group in enumerate(bay_groups, start=1):
+            write_label_sheet(writer, group, stats, errors, barcodes)
+            if progress:
+                progress(done, len(bay_groups), group["name"])
+        write_manifest_sheet(writer.book, build_manifest(bay_groups, barcodes))
+    output.seek(0)
+    return output.getvalue(), stats
+
+
+def _workbook_file_name(group_name: str, used: set) -> str:
+    base = re.sub(r'[\\/:*?"<>|]+', "_", group_name).strip() or "group"
+    name, n = f"{base}.xlsx", 2
+    while name.lower() in used:
+        name, n = f"{base} ({n}).xlsx", n + 1
+    used.add(name.lower())
+    return name
+
+
+def write_bin_labels_zip(
+    bay_groups: List[Dict[str, Any]],
+    sink: Any,
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    barcodes: bool = False,
+) -> Dict[str, int]:
+    """
+    Write one workbook per bay group into a ZIP archive on `sink` (a path or writable file object),
+    with a manifest.json entry for update_bin_labels_zip. Each workbook is streamed straight into
+    its archive entry, so only the current group is in memory.
+    """
+    _, stats = update_bin_labels_zip(None, bay_groups, sink, errors=errors, progress=progress, barcodes=barcodes)
+    return {"labels": stats["labels"], "bays": stats["bays"]}
+
+
+def _write_group_workbook(archive: zipfile.ZipFile, name: str, group: Dict[str, Any], stats: Dict[str, int],
+                          errors: Optional[List[str]], barcodes: bool) -> None:
+    with archive.open(name, "w") as entry:
+        with pd.ExcelWriter(entry, engine='openpyxl') as writer:
+            write_label_sheet(writer, group, stats, errors, barcodes)
+            if not writer.sheets:
+                # openpyxl cannot save a workbook without sheets
+                pd.DataFrame().to_excel(writer, index=False, sheet_name=group["name"])
+
+
+def update_bin_labels_workbook(
+    previous: bytes,
+    bay_groups: List[Dict[str, Any]],
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    barcodes: bool = False,
+    written: Optional[List[str]] = None,
+) -> Tuple[bytes, pd.DataFrame, Dict[str, int]]:
+    """
+    Incremental build_bin_labels_workbook. `previous` is an earlier label workbook, per-group ZIP or manifest JSON.
+
+    Added and changed groups are generated. Unchanged groups keep their sheets from a previous
+    workbook; from a ZIP they are regenerated (its workbooks cannot be merged into one), and with
+    only a manifest they are left out. The embedded manifest lists just the groups in the output,
+    so a later update regenerates whatever is missing; their names are also added to `written`. Returns (xlsx bytes, change report, stats)
+    where stats holds the regenerated 'labels' and 'bays' plus 'regenerated' and 'reused' group counts.
+
+    Only the label generation is incremental: openpyxl loads the whole previous workbook and saves
+    it again, so time and memory still grow with the site. update_bin_labels_zip copies unchanged
+    groups' workbooks without opening them and is the better choice for large sites.
+    """
+    _check_sheet_names(bay_groups)
+    manifest = build_manifest(bay_groups, barcodes)
+    changes, report = diff_manifests(read_manifest(previous), manifest)
+    kind = export_kind(previous)
+
+    output = io.BytesIO(previous if kind == WORKBOOK else b"")
+    with pd.ExcelWriter(output, engine="openpyxl", mode="a" if kind == WORKBOOK else "w") as writer:
+        book = writer.book
+        for name in changes["removed"] + changes["changed"] + [MANIFEST_SHEET]:
+            if name in book.sheetnames:
+                del book[name]
+        reuse = [name for name in changes["unchanged"] if name in book.sheetnames]
+        regenerate = [g for g in bay_groups if g["name"] in changes["added"] or g["name"] in changes["changed"]
+                      or (kind != MANIFEST and g["name"] in changes["unchanged"] and g["name"] not in reuse)]
+        stats = {"labels": 0, "bays": 0, "regenerated": len(regenerate), "reused": len(reuse)}
+        for done, group in enumerate(regenerate, start=1):
+            write_label_sheet(writer, group, stats, errors, barcodes)
+            if progress:
+                progress(done, len(regenerate), group["name"])
+        # keep the sheets in group order, whatever was regenerated
+        names = [g["name"] for g in bay_groups if g["name"] in book.sheetnames]
+        for position, name in enumerate(names):
+            book.move_sheet(name, position - book.sheetnames.index(name))
+        present = reuse + [g["name"] for g in regenerate]
+        write_manifest_sheet(book, manifest_subset(manifest, present))
+    if written is not None:
+        written.extend(present)
+    return output.getvalue(), report, stats
+
+
+def update_bin_labels_zip(
+    previous: Optional[bytes],
+    bay_groups: List[Dict[str, Any]],
+    sink: Any,
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+    barcodes: bool = False,
+    written: Optional[List[str]] = None,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Incremental write_bin_labels_zip: unchanged groups' workbooks are copied from the `previous`
+    ZIP (regenerated when it is a single workbook, left out when it is only a manifest JSON);
+    added and changed groups are generated. manifest.json (and `written`) lists just the groups in the output.
+    Returns (change report, stats) as update_bin_labels_workbook.
+    """
+    used = set()
+    files = [_workbook_file_name(group["name"], used) for group in bay_groups]
+    manifest = build_manifest(bay_groups, barcodes, files)
+    old = read_manifest(previous) if previous is not None else {"groups": []}
+    changes, report = diff_manifests(old, manifest)
+    old_files = {g["name"]: g.get("file") for g in old["groups"]}
+    kind = export_kind(previous) if previous is not None else None
+    source = zipfile.ZipFile(io.BytesIO(previous)) if kind == ZIP else None
+    reuse = [name for name in changes["unchanged"] if source is not None and old_files.get(name) in source.namelist()]
+    regenerate = [g["name"] for g in bay_groups if g["name"] not in reuse and (kind != MANIFEST or g["name"] not in changes["unchanged"])]
+    stats = {"labels": 0, "bays": 0, "regenerated": len(regenerate), "reused": len(reuse)}
+    done = 0
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for group, name in zip(bay_groups, files):
+            if group["name"] in reuse:
+                archive.writestr(name, source.read(old_files[group["name"]]))
+                continue
+            if group["name"] not in regenerate:
+                continue
+            _write_group_workbook(archive, name, group, stats, errors, barcodes)
+            done += 1
+            if progress:
+                progress(done, len(regenerate), group["name"])
+        archive.writestr(MANIFEST_FILE, manifest_json(manifest_subset(manifest, reuse + regenerate)))
+    if source is not None:
+        source.close()
+    if written is not None:
+        written.extend(reuse + regenerate)
+    return report, stats
+
+
+def build_bin_mapping_table(
+    bay_groups: List[Dict[str, Any]],
+    progress: Optional[ProgressCallback] = None,
+) -> pd.DataFrame:
+    """Bin Bay Mapping rows for all groups. Raises ValueError on the first invalid bay definition."""
+    data = []
+    for done, group in enumerate(bay_groups, start=1):
+        parsed = parse_bay_definition(group["bay_definition"])
+        if "error" in parsed:
+            raise ValueError(f"Invalid bay definition in {group['name']}: {parsed['error']}")
+        data.extend(build_bin_mapping_rows(group))
+        if progress:
+            progress(done, len(bay_groups), group["name"])
+    return pd.DataFrame(data)
+
+
+def build_bin_mapping_workbook(df: pd.DataFrame) -> bytes:
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name="Bin Bay Mapping")
+    output.seek(0)
+    return output.getvalue()
+
+
+def build_eoa_workbook(signage_data: List[Dict[str, Any]]) -> bytes:
+    """EOA signage sheet: left/right sign halves under black merged headers."""
+    output = io.BytesIO()
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "EOA Signage"
+    ws.merge_cells("A1:C1"); ws["A1"] = "Left Side of Sign"
+    ws.merge_cells("E1:G1"); ws["E1"] = "Right Side of Sign"
+    ws["A2"] = "Mod"; ws["B2"] = "Aisle"; ws["C2"] = "Slots"
+    ws["E2"] = "Mod"; ws["F2"] = "Aisle"; ws["G2"] = "Slots"
+    ws["H2"] = "Deployment Location"
+    black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
+    white_font = Font(color="FFFFFF", bold=True)
+    center_align = Alignment(horizontal="center", vertical="center")
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+    for row in ws["A1:H2"]:
+        for cell in row:
+            cell.fill = black_fill
+            cell.border = thin_border
+            if cell.value:
+                cell.font = white_font
+                cell.alignment = center_align
+    for row_idx, row_data in enumerate(signage_data, start=3):
+        ws[f"A{row_idx}"] = row_data.get("Left.Mod", "")
+        ws[f"B{row_idx}"] = row_data.get("Left.Aisle", "")
+        ws[f"C{row_idx}"] = row_data.get("Left.Slots", "")
+        ws[f"E{row_idx}"] = row_data.get("Right.Mod", "")
+        ws[f"F{row_idx}"] = row_data.get("Right.Aisle", "")
+        ws[f"G{row_idx}"] = row_data.get("Right.Slots", "")
+        ws[f"H{row_idx}"] = row_data.get("Deployment Location", "")
+        for col in "ABCEFGH":
+            ws[f"{col}{row_idx}"].alignment = center_align
+            ws[f"{col}{row_idx}"].border = thin_border
+    wb.save(output)
+    output.seek(0)
+    return output.getvalue()
@@ -0,0 +1,128 @@
+# app/exports.py
+"""
+One entry point per tool returning the download payload (data, file name, MIME type and
+summary) for a chosen format. Used by the Streamlit background jobs and the batch runner.
+Given a SpoolStore, the payload is spooled to disk and "data" is a SpooledFile handle.
+"""
+import io
+
+from app.columnar import FILE_EXTENSIONS, MIME_TYPES, write_bin_labels_columnar, write_bin_mapping_columnar, write_eoa_columnar
+from app.eoa import build_eoa_signage
+from app.excel import (XLSX_MIME, ZIP_MIME, build_bin_labels_workbook, write_bin_labels_zip, update_bin_labels_workbook,
+                       update_bin_labels_zip, build_bin_mapping_table, build_bin_mapping_workbook, build_eoa_workbook)
+from app.label_sheets import PPTX_MIME, build_bin_label_sheets
+from app.manifest import build_manifest, manifest_json, manifest_subset
+from app.metrics import EXPORT_BYTES, EXPORT_SECONDS, EXPORTS, GENERATION_ERRORS, ITEMS_GENERATED
+from app.spool import spool_data
+
+EXPORT_FORMATS = {"Excel (.xlsx)": "xlsx", "Parquet": "parquet", "Arrow IPC": "arrow"}
+LABEL_EXPORT_FORMATS = {**EXPORT_FORMATS, "ZIP, one Excel workbook per group": "zip", "Printable label sheets (.pptx)": "pptx"}
+
+
+def export_file(name, fmt):
+    if fmt == "xlsx":
+        return {"file_name": f"{name}.xlsx", "mime": XLSX_MIME}
+    if fmt == "zip":
+        return {"file_name": f"{name}.zip", "mime": ZIP_MIME}
+    if fmt == "pptx":
+        return {"file_name": f"{name}.pptx", "mime": PPTX_MIME}
+    return {"file_name": f"{name}{FILE_EXTENSIONS[fmt]}", "mime": MIME_TYPES[fmt]}
+
+
+def _stream_export(store, files, write):
+    """Run `write(sink)` into a spool file when a store is given (no bytes copy), else into memory."""
+    if store is not None:
+        out = {}
+        data = store.write(lambda sink: out.update(value=write(sink)), files["file_name"], files["mime"])
+        return data, out["value"]
+    output = io.BytesIO()
+    value = write(output)
+    return output.getvalue(), value
+
+
+def _record(tool, fmt, data, kind, items, errors=()):
+    """Count one finished export in the process metrics."""
+    EXPORTS.inc(tool=tool, format=fmt)
+    ITEMS_GENERATED.inc(items, kind=kind)
+    if errors:
+        GENERATION_ERRORS.inc(len(errors), tool=tool)
+    if data is not None:
+        EXPORT_BYTES.observe(len(data), tool=tool, format=fmt)
+
+
+def export_bin_labels(bay_groups, fmt="xlsx", template=None, barcodes=False, previous=None, progress=None, store=None):
+    """
+    Label export in `fmt`. With a SpoolStore, "data" is a SpooledFile on disk instead of bytes
+    (ZIP, Parquet and Arrow exports are streamed into it directly).
+    """
+    with EXPORT_SECONDS.time(tool="labels", format=fmt):
+        result = _export_bin_labels(bay_groups, fmt, template, barcodes, previous, progress, store)
+    _record("labels", fmt, result["data"], "label", result["stats"]["labels"], result["errors"])
+    return result
+
+
+def _export_bin_labels(bay_groups, fmt, template, barcodes, previous, progress, store):
+    errors = []
+    report = None
+    written = None if previous is None else []
+    files = export_file("bin_labels", fmt)
+    if previous is not None and fmt == "xlsx":
+        data, report, stats = update_bin_labels_workbook(previous, bay_groups, errors=errors, progress=progress,
+                                                         barcodes=barcodes, written=written)
+    elif previous is not None and fmt == "zip":
+        data, (report, stats) = _stream_export(store, files, lambda sink: update_bin_labels_zip(
+            previous, bay_groups, sink, errors=errors, progress=progress, barcodes=barcodes, written=written))
+    elif fmt == "pptx":
+        data, stats = build_bin_label_sheets(bay_groups, template=template, barcodes=barcodes, errors=errors, progress=progress)
+    elif fmt == "xlsx":
+        data, stats = build_bin_labels_workbook(bay_groups, errors=errors, progress=progress, barcodes=barcodes)
+    elif fmt == "zip":
+        data, stats = _stream_export(store, files, lambda sink: write_bin_labels_zip(
+            bay_groups, sink, errors=errors, progress=progress, barcodes=barcodes))
+    else:
+        data, stats = _stream_export(store, files, lambda sink: write_bin_labels_columnar(
+            bay_groups, sink, fmt, errors=errors, progress=progress))
+    if fmt in ("xlsx", "pptx"):
+        data = spool_data(store, data, files["file_name"], files["mime"])
+    result = {"data": data, "stats": stats, "errors": errors, "groups": bay_groups, "report": report, **files}
+    if fmt in ("xlsx", "zip"):
+        manifest = build_manifest(bay_groups, barcodes)
+        # an incremental update from a manifest only holds part of the groups; so does its manifest
+        result["manifest"] = manifest_json(manifest if written is None else manifest_subset(manifest, written))
+    return result
+
+
+def export_bin_mapping(bay_groups, fmt="xlsx", progress=None, store=None):
+    with EXPORT_SECONDS.time(tool="mapping", format=fmt):
+        result = _export_bin_mapping(bay_groups, fmt, progress, store)
+    _record("mapping", fmt, result["data"], "mapping_row", result["rows"])
+    return result
+
+
+def _export_bin_mapping(bay_groups, fmt, progress, store):
+    files = export_file("bin_bay_mapping", fmt)
+    if fmt == "xlsx":
+        df = build_bin_mapping_table(bay_groups, progress=progress)
+        data, rows = build_bin_mapping_workbook(df), len(df)
+        data = spool_data(store, data, files["file_name"], files["mime"])
+    else:
+        data, rows = _stream_export(store, files, lambda sink: write_bin_mapping_columnar(bay_groups, sink, fmt, progress=progress))
+    return {"data": data, "rows": rows, "groups": len(bay_groups), "bay_groups": bay_groups, **files}
+
+
+def export_eoa_signage(aisle_details, standard_layout_input, cross_module_layout_input, placement_rule, fmt="xlsx", progress=None, store=None):
+    with EXPORT_SECONDS.time(tool="eoa", format=fmt):
+        result = _export_eoa_signage(aisle_details, standard_layout_input, cross_module_layout_input, placement_rule, fmt, progress, store)
+    _record("eoa", fmt, result["data"], "eoa_sign", len(result["signage"]), result["errors"])
+    return result
+
+
+def _export_eoa_signage(aisle_details, standard_layout_input, cross_module_layout_input, placement_rule, fmt, progress, store):
+    signage_data, errors = build_eoa_signage(aisle_details, standard_layout_input, cross_module_layout_input, placement_rule, progress=progress)
+    files = export_file("eoa_signage", fmt)
+    data = None
+    if signage_data and fmt == "xlsx":
+        data = spool_data(store, build_eoa_workbook(signage_data), files["file_name"], files["mime"])
+    elif signage_data:
+        data, _ = _stream_export(store, files, lambda sink: write_eoa_columnar(signage_data, sink, fmt))
+    return {"data": data, "signage": signage_data, "errors": errors, **files}
@@ -0,0 +1,122 @@
+# app/jobs.py
+"""Background export jobs: run workbook builders on a thread pool with progress and cancellation.
+
+Jobs live in a process-wide registry so a finished export can still be fetched
+after the browser reconnects and a new Streamlit session starts.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.metrics import JOB_SECONDS, JOBS
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's progress callback once cancellation was requested."""
+
+
+class ExportJob:
+    def __init__(self, tool: str):
+        self.id = uuid.uuid4().hex
+        self.tool = tool
+        self.status = PENDING
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self._cancel = threading.Event()
+
+    @property
+    def fraction(self) -> float:
+        return min(self.done / self.total, 1.0) if self.total else 0.0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def report(self, done: int, total: int, message: str = "") -> None:
+        """Progress callback handed to the builders; aborts the job if cancel() was called."""
+        self.done, self.total, self.message = done, total, message
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        if self._cancel.is_set():
+            self.status = CANCELLED
+            self.finished = time.time()
+            return
+        self.status = RUNNING
+        started = time.perf_counter()
+        try:
+            self.result = fn(*args, progress=self.report, **kwargs)
+            self.status = DONE
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as e:
+            self.error = str(e)
+            self.status = FAILED
+        self.finished = time.time()
+        JOBS.inc(tool=self.tool, status=self.status)
+        JOB_SECONDS.observe(time.perf_counter() - started, tool=self.tool)
+
+
+class JobRunner:
+    def __init__(self, max_workers: int = 2, ttl: float = 3600):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-job")
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        self.ttl = ttl
+
+    def submit(self, tool: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> ExportJob:
+        """Queue fn(*args, progress=job.report, **kwargs); its return value becomes job.result."""
+        self.prune()
+        job = ExportJob(tool)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(job._run, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[ExportJob]:
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ExportJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def prune(self) -> None:
+        """Forget finished jobs older than the TTL so their workbooks can be freed."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished < cutoff]:
+                del self._jobs[job_id]
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> JobRunner:
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -0,0 +1,325 @@
+# app/label_sheets.py
+"""Printable bin label sheets rendered to PPTX.
+
+A template slide (built here, or the first slide of a user supplied .pptx, whose other slides
+are dropped) holds one shape per label cell with `{label}`, `{bay}`, `{shelf}` and `{group}`
+tokens in its text, and optionally one `{barcode}` shape per cell that is redrawn as a vector
+Code 128 symbol. The template's shape tree is serialised once; each page is a token substitution on that XML,
+parsed in a thread pool and grafted onto a new slide, so no shapes are rebuilt per label.
+"""
+import io
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from lxml import etree
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml import element_class_lookup
+from pptx.parts.slide import SlidePart
+from pptx.util import Mm, Pt
+
+from app.barcode import bar_runs, encode
+from app.labeltable import LabelTable
+
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+TOKENS = ("label", "bay", "shelf", "group")
+TOKEN_COLUMNS = {"label": "bin_label", "bay": "bay_input", "shelf": "shelf", "group": "group"}
+
+BLANK_LAYOUT = 6
+DEFAULT_COLUMNS = 3
+DEFAULT_ROWS = 8
+DEFAULT_PAGES_PER_CHUNK = 50
+
+ProgressCallback = Callable[[int, int, str], None]
+
+_TOKEN_RE = re.compile(r"\{(label|bay|shelf|group)\}")
+_CELL_TOKEN_RE = re.compile(r"\{(label|bay|shelf|group|barcode)#(\d+)\}")
+_RID_RE = re.compile(r'"(rId\d+)"')
+_CELL_NAME_PREFIX = "Label Cell "
+_CELL_NAME_RE = re.compile(r"^Label Cell (\d+)")
+_P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+# lxml parser objects must not be shared between threads
+_parsers = threading.local()
+
+
+def _parse_xml(xml: str) -> Any:
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        parser = _parsers.parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+        parser.set_element_class_lookup(element_class_lookup)
+    return etree.fromstring(xml, parser)
+
+
+def build_default_template(columns: int = DEFAULT_COLUMNS, rows: int = DEFAULT_ROWS, barcodes: bool = False) -> bytes:
+    """A4 portrait sheet with a columns x rows grid of label cells (24 per page by default)."""
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Mm(210), Mm(297)
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+    margin, gap = Mm(8), Mm(3)
+    cell_w = (prs.slide_width - 2 * margin - (columns - 1) * gap) // columns
+    cell_h = (prs.slide_height - 2 * margin - (rows - 1) * gap) // rows
+    for r in range(rows):
+        for c in range(columns):
+            shape = slide.shapes.add_shape(
+                MSO_SHAPE.ROUNDED_RECTANGLE,
+                margin + c * (cell_w + gap), margin + r * (cell_h + gap), cell_w, cell_h,
+            )
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
+            shape.line.color.rgb = RGBColor(0x00, 0x00, 0x00)
+            tf = shape.text_frame
+            tf.vertical_anchor = MSO_ANCHOR.TOP if barcodes else MSO_ANCHOR.MIDDLE
+            for text, size, bold in (("{label}", 18, True), ("{bay} · {shelf}", 9, False)):
+                p = tf.paragraphs[0] if text == "{label}" else tf.add_paragraph()
+                p.alignment = PP_ALIGN.CENTER
+                run = p.add_run()
+                run.text = text
+                run.font.size = Pt(size)
+                run.font.bold = bold
+                run.font.color.rgb = RGBColor(0x00, 0x00, 0x00)
+            if barcodes:
+                left, top = margin + c * (cell_w + gap), margin + r * (cell_h + gap)
+                bars = slide.shapes.add_textbox(left + cell_w // 10, top + cell_h * 11 // 20, cell_w * 8 // 10, cell_h * 7 // 20)
+                bars.text_frame.text = "{barcode}"
+    output = io.BytesIO()
+    prs.save(output)
+    return output.getvalue()
+
+
+def _label_cells(slide) -> List[Any]:
+    """Template shapes holding a {label} token, in reading order (top to bottom, left to right)."""
+    cells = [shape for shape in slide.shapes if shape.has_text_frame and "{label}" in shape.text_frame.text]
+    return sorted(cells, key=lambda shape: (shape.top, shape.left))
+
+
+def _barcode_cells(slide) -> List[Any]:
+    cells = [shape for shape in slide.shapes if shape.has_text_frame and shape.text_frame.text.strip() == "{barcode}"]
+    return sorted(cells, key=lambda shape: (shape.top, shape.left))
+
+
+def barcode_path_xml(label: str) -> str:
+    """
+    Code 128 bars of `label` as one DrawingML path, one unit per module wide and 1 unit high.
+    The outline runs along the top edge and drops down around each bar, so the whole symbol is
+    a single filled polygon (the top edge between bars encloses no area).
+    """
+    modules = encode(label)
+    points = []
+    for x, w in bar_runs(modules):
+        points += ((x, 0), (x, 1), (x + w, 1), (x + w, 0))
+    (x0, y0), rest = points[0], points[1:]
+    edges = "".join(f'<a:lnTo><a:pt x="{x}" y="{y}"/></a:lnTo>' for x, y in rest)
+    return f'<a:path w="{len(modules)}" h="1"><a:moveTo><a:pt x="{x0}" y="{y0}"/></a:moveTo>{edges}<a:close/></a:path>'
+
+
+def _make_barcode_shape(shape, index: int) -> None:
+    """Turn a {barcode} text shape into a filled custom-geometry shape whose path is a per-cell token."""
+    shape.name = f"{_CELL_NAME_PREFIX}{index} Barcode"
+    sp = shape._element
+    sp.remove(sp.txBody)
+    sp_pr = sp.spPr
+    for child in list(sp_pr):
+        if child.tag != f"{_A_NS}xfrm":
+            sp_pr.remove(child)
+    geometry = _parse_xml(
+        f'<a:custGeom xmlns:a="{_A_NS[1:-1]}"><a:avLst/><a:gdLst/><a:ahLst/><a:cxnLst/>'
+        f'<a:rect l="0" t="0" r="r" b="b"/><a:pathLst>{{barcode#{index}}}</a:pathLst></a:custGeom>'
+    )
+    sp_pr.append(geometry)
+    sp_pr.append(_parse_xml(f'<a:solidFill xmlns:a="{_A_NS[1:-1]}"><a:srgbClr val="000000"/></a:solidFill>'))
+    sp_pr.append(_parse_xml(f'<a:ln xmlns:a="{_A_NS[1:-1]}"><a:noFill/></a:ln>'))
+
+
+def _merge_split_tokens(shape, index: int) -> None:
+    """
+    PowerPoint often splits typed text into several runs ("{la" + "bel}"); tokens are replaced run
+    by run, so a paragraph whose token spans runs is merged into its first run (and its formatting).
+    """
+    for paragraph in shape._element.iter(f"{_A_NS}p"):
+        runs = paragraph.findall(f"{_A_NS}r")
+        texts = [run.findtext(f"{_A_NS}t") or "" for run in runs]
+        whole = _TOKEN_RE.findall("".join(texts))
+        if len(whole) == sum(len(_TOKEN_RE.findall(text)) for text in texts):
+            continue
+        if paragraph.find(f"{_A_NS}br") is not None or paragraph.find(f"{_A_NS}fld") is not None:
+            raise ValueError(f"Label cell {index + 1} of the template has a token split over several text runs in a "
+                             "paragraph with a line break or field; retype the token in one go.")
+        runs[0].find(f"{_A_NS}t").text = "".join(texts)
+        for run in runs[1:]:
+            paragraph.remove(run)
+
+
+def _compile_template(prs, page_slide_rels: Dict[str, str]) -> Tuple[str, int]:
+    """Serialise the template slide's shape tree with every cell's tokens numbered ({label#3} ...)."""
+    template = prs.slides[0]
+    cells = _label_cells(template)
+    if not cells:
+        raise ValueError("Label template has no shape containing a {label} token.")
+    barcodes = _barcode_cells(template)
+    if barcodes and len(barcodes) != len(cells):
+        raise ValueError("Label template must have one {barcode} shape per {label} cell.")
+    for index, shape in enumerate(barcodes):
+        _make_barcode_shape(shape, index)
+    for index, shape in enumerate(cells):
+        shape.name = f"{_CELL_NAME_PREFIX}{index}"
+        _merge_split_tokens(shape, index)
+        for run in shape._element.iter(f"{_A_NS}t"):
+            if run.text:
+                run.text = _TOKEN_RE.sub(lambda m: f"{{{m.group(1)}#{index}}}", run.text)
+    xml = etree.tostring(template.shapes._spTree, encoding="unicode")
+    # relationship ids of pictures etc. differ between the template and the page slides; one pass,
+    # so an id that is also the new name of another (rId1 -> rId2, rId2 -> rId3) is not renamed twice
+    xml = _RID_RE.sub(lambda m: f'"{page_slide_rels.get(m.group(1), m.group(1))}"', xml)
+    return xml, len(cells)
+
+
+def _render_page(template_xml: str, cells_per_page: int, rows: List[Dict[str, str]]) -> Any:
+    def fill(match: "re.Match") -> str:
+        token, index = match.group(1), int(match.group(2))
+        if index >= len(rows):
+            return ""
+        if token == "barcode":
+            return barcode_path_xml(rows[index]["label"])
+        return escape(rows[index][token])
+
+    tree = _parse_xml(_CELL_TOKEN_RE.sub(fill, template_xml))
+    # drop the cells left over on the last page
+    for shape in list(tree):
+        name = shape.find(f".//{_P_NS}cNvPr")
+        cell = _CELL_NAME_RE.match(name.get("name", "")) if name is not None else None
+        if cell and int(cell.group(1)) >= len(rows):
+            tree.remove(shape)
+    return tree
+
+
+def _append_slide(prs, part: SlidePart, slide_id: int) -> None:
+    # the only private python-pptx calls: relate_to() and slides.add_slide() scan every existing
+    # relationship per call, which is quadratic for thousands of pages
+    prs.slides._sldIdLst._add_sldId(id=slide_id, rId=prs.part.rels._add_relationship(RT.SLIDE, part))
+
+
+def _add_page_parts(prs, template_slide, count: int) -> Tuple[List[SlidePart], Dict[str, str]]:
+    """
+    Append `count` blank slides using the template's layout and relationships; the slide parts
+    are created directly rather than through Presentation.slides.add_slide() (see _append_slide).
+    Returns the slide parts and the template-to-page rId map (identical for every page).
+    """
+    layout_part = template_slide.slide_layout.part
+    next_number = len(prs.slides) + 1
+    next_id = max(slide.slide_id for slide in prs.slides) + 1
+    parts, rel_map = [], {}
+    for i in range(count):
+        part = SlidePart.new(PackURI(f"/ppt/slides/slide{next_number + i}.xml"), prs.part.package, layout_part)
+        for rid, rel in template_slide.part.rels.items():
+            if rel.reltype in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE):
+                continue
+            target = rel.target_ref if rel.is_external else rel.target_part
+            rel_map.setdefault(rid, part.relate_to(target, rel.reltype, is_external=rel.is_external))
+        _append_slide(prs, part, next_id + i)
+        parts.append(part)
+    return parts, rel_map
+
+
+def _drop_slides(prs, slides: List[Any]) -> None:
+    """Remove slides (the template and any other slides of the uploaded deck) from the presentation."""
+    parts = {slide.part for slide in slides}
+    sld_ids = prs.slides._sldIdLst
+    for sld_id in list(sld_ids):
+        if prs.part.related_part(sld_id.rId) in parts:
+            prs.part.drop_rel(sld_id.rId)
+            sld_ids.remove(sld_id)
+
+
+def _label_rows(labels: Union[pd.DataFrame, LabelTable]) -> List[Dict[str, str]]:
+    df = labels.to_long() if isinstance(labels, LabelTable) else labels
+    columns = {token: df[col].astype(str).tolist() if col in df.columns else [""] * len(df) for token, col in TOKEN_COLUMNS.items()}
+    return [dict(zip(TOKENS, values)) for values in zip(*(columns[t] for t in TOKENS))]
+
+
+def render_label_sheets(
+    labels: Union[pd.DataFrame, LabelTable],
+    template: Optional[bytes] = None,
+    barcodes: bool = False,
+    workers: int = 4,
+    pages_per_chunk: int = DEFAULT_PAGES_PER_CHUNK,
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[bytes, Dict[str, float]]:
+    """
+    Render labels (the long layout from generate_bin_labels_table, or a LabelTable) onto PPTX pages.
+    `barcodes` only affects the built-in template; a custom template draws barcodes if it has {barcode} shapes.
+
+    Returns (pptx bytes, stats) with 'labels', 'pages', 'seconds' and 'labels_per_second'.
+    """
+    started = time.perf_counter()
+    prs = Presentation(io.BytesIO(template or build_default_template(barcodes=barcodes)))
+    template_slides = list(prs.slides)
+    template_slide = template_slides[0]
+    rows = _label_rows(labels)
+
+    cells_per_page = len(_label_cells(template_slide))
+    pages = [rows[i:i + cells_per_page] for i in range(0, len(rows), cells_per_page)] if cells_per_page else []
+    page_parts, rel_map = _add_page_parts(prs, template_slide, len(pages))
+    template_xml, cells_per_page = _compile_template(prs, rel_map)
+
+    chunks = [range(i, min(i + pages_per_chunk, len(pages))) for i in range(0, len(pages), pages_per_chunk)]
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = [pool.submit(lambda chunk: [_render_page(template_xml, cells_per_page, pages[i]) for i in chunk], chunk) for chunk in chunks]
+        try:
+            for chunk, future in zip(chunks, futures):
+                for i, tree in zip(chunk, future.result()):
+                    old = page_parts[i]._element.cSld.spTree
+                    old.getparent().replace(old, tree)
+                done += len(chunk)
+                if progress:
+                    progress(done, len(pages), f"page {done}")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    # only the label pages are kept: the template slide and any further slides of the template deck go
+    _drop_slides(prs, template_slides)
+
+    output = io.BytesIO()
+    prs.save(output)
+    seconds = time.perf_counter() - started
+    stats = {
+        "labels": len(rows),
+        "pages": len(pages),
+        "seconds": seconds,
+        "labels_per_second": len(rows) / seconds if seconds else 0.0,
+    }
+    return output.getvalue(), stats
+
+
+def build_bin_label_sheets(
+    bay_groups: List[Dict[str, Any]],
+    template: Optional[bytes] = None,
+    barcodes: bool = False,
+    errors: Optional[List[str]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[bytes, Dict[str, float]]:
+    """PPTX counterpart of build_bin_labels_workbook: every group's labels on one deck of label sheets."""
+    frames, bays = [], 0
+    for group in bay_groups:
+        table = LabelTable.from_bays(group["name"], group["bays"], group["shelves"], group["bins_per_shelf"], errors=errors)
+        bays += int(table.bays["bay_input"].nunique())
+        if len(table):
+            frames.append(table.to_long())
+    labels = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(TOKEN_COLUMNS.values()))
+    data, stats = render_label_sheets(labels, template=template, barcodes=barcodes, progress=progress)
+    stats["bays"] = bays
+    return data, stats
@@ -0,0 +1,304 @@
+# app/labeltable.py
+"""Compact label table shared by the long (app) and wide (workbook) label layouts.
+
+Per-bay text (group, raw/normalized bay, aisle, label prefix) is stored once per bay;
+every bin is three integer codes (bay, shelf, position). Label strings are only
+formatted when a layout is materialised for display or export. A LabelPlan goes one step
+further: it is the compiled group spec, sized and indexable without building any table.
+"""
+import bisect
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.errors import ErrorRecord
+from app.ranges import IdRange, id_segments
+from app.utils import parse_bay_id, normalize_bay_id
+
+BAY_COLUMNS = ["group", "bay_input", "normalized_bay", "aisle", "prefix", "start", "pad"]
+
+
+def _long_bay_row(group_name: str, bay: str) -> Dict:
+    """Prefix/start/padding for one bay, following the app generator's parsing rules."""
+    parsed = parse_bay_id(bay)
+    start, pad = 1, 0
+    if parsed is None:
+        # keep original raw but mark invalid
+        prefix = normalize_bay_id(bay)
+    else:
+        base_number = parsed.get("number") or ""
+        raw = normalize_bay_id(parsed["raw"])
+        if base_number and raw.endswith(base_number):
+            prefix = raw[: -len(base_number)]
+        else:
+            prefix = raw + "-" if not raw.endswith("-") else raw
+        if base_number and base_number.isdigit():
+            try:
+                start, pad = int(base_number), 3
+            except ValueError:
+                pass
+    return {"group": group_name, "bay_input": bay, "normalized_bay": normalize_bay_id(bay), "aisle": "", "prefix": prefix, "start": start, "pad": pad}
+
+
+def _wide_bay_row(group_name: str, bay: str) -> Dict:
+    """Prefix/start for one bay, following the workbook generator's rules (`BAY-` stripped, last 3 digits)."""
+    bay = bay.strip()
+    base_label = bay.replace("BAY-", "")
+    base_number = int(base_label[-3:])
+    aisle_match = re.search(r'\d{3}', base_label)
+    return {
+        "group": group_name,
+        "bay_input": bay,
+        "normalized_bay": normalize_bay_id(bay),
+        "aisle": aisle_match.group(0) if aisle_match else "",
+        "prefix": base_label[:-4],
+        "start": base_number,
+        "pad": 3,
+    }
+
+
+class LabelTable:
+    def __init__(self, bays: pd.DataFrame, shelves: List[str], counts: List[int]):
+        self.bays = bays.reset_index(drop=True)
+        self.shelves = list(shelves)
+        self.counts = [int(c) for c in counts]
+        # every bay has the same shelf/bin block, so the bin codes are the block tiled per bay
+        block_shelf = np.concatenate([np.full(c, si, dtype=np.int16) for si, c in enumerate(self.counts)] or [np.empty(0, np.int16)])
+        block_pos = np.concatenate([np.arange(c, dtype=np.int32) for c in self.counts] or [np.empty(0, np.int32)])
+        n_bays = len(self.bays)
+        self.bay_index = np.repeat(np.arange(n_bays, dtype=np.int32), len(block_shelf))
+        self.shelf_index = np.tile(block_shelf, n_bays)
+        self.position = np.tile(block_pos, n_bays)
+
+    @classmethod
+    def from_groups(cls, groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> "LabelTable":
+        """Long layout input: groups of bay IDs named "Group N", the same bin count on every shelf."""
+        return LabelPlan.from_groups(groups, shelves, bins_per_shelf).table()
+
+    @classmethod
+    def from_bays(
+        cls,
+        group_name: str,
+        bay_ids: List[str],
+        shelves: List[str],
+        bins_per_shelf: Dict[str, int],
+        errors: Optional[List[ErrorRecord]] = None,
+    ) -> "LabelTable":
+        """Wide layout input: one named bay group with a bin count per shelf. Unparseable bays are skipped."""
+        return LabelPlan.from_bays(group_name, bay_ids, shelves, bins_per_shelf, errors=errors).table()
+
+    def __len__(self) -> int:
+        return len(self.bay_index)
+
+    @property
+    def bay_count(self) -> int:
+        return len(self.bays)
+
+    def _categorical(self, column: str, rows: np.ndarray) -> pd.Categorical:
+        codes, uniques = pd.factorize(self.bays[column])
+        return pd.Categorical.from_codes(codes[self.bay_index[rows]], categories=uniques)
+
+    def frame(self, rows: Union[slice, np.ndarray] = slice(None)) -> pd.DataFrame:
+        """Unformatted view: categoricals for the repeated text, prefix + integer number for the label."""
+        rows = np.arange(len(self))[rows]
+        shelf_codes, shelf_uniques = pd.factorize(pd.Series(self.shelves, dtype=object))
+        return pd.DataFrame({
+            "group": self._categorical("group", rows),
+            "bay_input": self._categorical("bay_input", rows),
+            "normalized_bay": self._categorical("normalized_bay", rows),
+            "shelf": pd.Categorical.from_codes(shelf_codes[self.shelf_index[rows]], categories=shelf_uniques),
+            "bin_prefix": self._categorical("prefix", rows),
+            "bin_number": self.bin_numbers(rows).astype(np.int32),
+        })
+
+    def bin_numbers(self, rows: Union[slice, np.ndarray] = slice(None)) -> np.ndarray:
+        bay_idx = self.bay_index[rows]
+        return self.bays["start"].to_numpy(dtype=np.int64)[bay_idx] + self.position[rows]
+
+    def bin_labels(self, rows: Union[slice, np.ndarray] = slice(None)) -> pd.Series:
+        """Format the label strings (prefix + shelf + number, zero padded where the bay asks for it)."""
+        bay_idx = self.bay_index[rows]
+        numbers = pd.Series(self.bin_numbers(rows), dtype="int64").astype(str)
+        pad = self.bays["pad"].to_numpy()[bay_idx] > 0
+        numbers = numbers.where(~pad, numbers.str.zfill(3))
+        prefixes = pd.Series(self.bays["prefix"].to_numpy(dtype=object)[bay_idx], dtype=object)
+        shelves = pd.Series(np.asarray(self.shelves, dtype=object)[self.shelf_index[rows]], dtype=object)
+        return (prefixes + shelves + numbers).reset_index(drop=True)
+
+    def to_long(self, rows: Union[slice, np.ndarray] = slice(None)) -> pd.DataFrame:
+        """One row per bin with formatted labels: the app.logic.generate_bin_labels_table layout."""
+        bay_idx = self.bay_index[rows]
+        if len(bay_idx) == 0:
+            return pd.DataFrame()
+        bays = self.bays.iloc[bay_idx].reset_index(drop=True)
+        return pd.DataFrame({
+            "group": bays["group"],
+            "bay_input": bays["bay_input"],
+            "normalized_bay": bays["normalized_bay"],
+            "shelf": pd.Series(np.asarray(self.shelves, dtype=object)[self.shelf_index[rows]]),
+            "bin_label": self.bin_labels(rows),
+        })
+
+    def to_wide(self) -> pd.DataFrame:
+        """One row per bin position of a bay, one column per shelf: the exported workbook layout."""
+        if len(self) == 0:
+            return pd.DataFrame()
+        width = int(self.position.max()) + 1
+        keys = self.bay_index.astype(np.int64) * width + self.position
+        row_keys, row_of = np.unique(keys, return_inverse=True)
+        row_bays = self.bays.iloc[row_keys // width].reset_index(drop=True)
+        out = pd.DataFrame({"BAY TYPE": row_bays["group"], "AISLE": row_bays["aisle"], "BAY ID": row_bays["bay_input"]})
+        labels = self.bin_labels().to_numpy(dtype=object)
+        for si, shelf in enumerate(self.shelves):
+            col = np.full(len(row_keys), None, dtype=object)
+            mask = self.shelf_index == si
+            col[row_of[mask]] = labels[mask]
+            out[shelf] = col
+        return out
+
+    def memory_usage(self) -> int:
+        """Resident bytes of the compact representation (bay attributes plus bin code arrays)."""
+        return int(self.bays.memory_usage(deep=True).sum() + self.bay_index.nbytes + self.shelf_index.nbytes + self.position.nbytes)
+
+
+class LabelPlan:
+    """
+    The labels of a group spec, compiled but not generated.
+
+    Bay IDs are kept as segments: plain IDs parsed up front (they are materialised input
+    anyway) and IdRanges whose bays are parsed only when touched. The length is bays x bins
+    per bay, `plan[i]` formats label i in O(1) (a binary search over the segments), slices
+    and `chunks()` materialise LabelTables of whole bays, and `long()` / `wide()` are the two
+    layouts over any window.
+    """
+
+    def __init__(self, segments: List[Tuple[str, object]], bay_row: Callable[[str, str], Dict],
+                 shelves: List[str], counts: List[int]):
+        self.segments = segments
+        self._bay_row = bay_row
+        self.shelves = list(shelves)
+        self.counts = [int(c) for c in counts]
+        self.block_shelf = np.concatenate([np.full(c, si, dtype=np.int16) for si, c in enumerate(self.counts)] or [np.empty(0, np.int16)])
+        self.block_pos = np.concatenate([np.arange(c, dtype=np.int32) for c in self.counts] or [np.empty(0, np.int32)])
+        self.bins_per_bay = len(self.block_shelf)
+        self._offsets = []
+        total = 0
+        for _, bays in segments:
+            self._offsets.append(total)
+            total += len(bays)
+        self._bays = total
+
+    @classmethod
+    def from_bays(cls, group_name: str, bay_ids: Sequence[str], shelves: List[str], bins_per_shelf: Dict[str, int],
+                  errors: Optional[List[ErrorRecord]] = None) -> "LabelPlan":
+        """Wide layout rules (see LabelTable.from_bays); unparseable bays are reported and left out."""
+        segments = []
+        for item in id_segments(bay_ids):
+            # a range of IDs ending in 3+ digits always parses, so it can stay lazy
+            if isinstance(item, IdRange) and item.width >= 3 and not item.suffix:
+                segments.append((group_name, item))
+                continue
+            for bay in (item if isinstance(item, IdRange) else [item]):
+                try:
+                    row = _wide_bay_row(group_name, bay)
+                except Exception as e:
+                    if errors is not None:
+                        errors.append(ErrorRecord(group_name, bay.strip(), "parse", str(e)))
+                    continue
+                cls._append_row(segments, group_name, row)
+        return cls(segments, _wide_bay_row, shelves, [bins_per_shelf.get(s, 0) for s in shelves])
+
+    @classmethod
+    def from_groups(cls, groups: List[Sequence[str]], shelves: List[str], bins_per_shelf: int) -> "LabelPlan":
+        """Long layout rules (see LabelTable.from_groups); every bay parses, so ranges always stay lazy."""
+        segments = []
+        for gi, group in enumerate(groups, start=1):
+            for item in id_segments(group):
+                if isinstance(item, IdRange):
+                    segments.append((f"Group {gi}", item))
+                else:
+                    cls._append_row(segments, f"Group {gi}", _long_bay_row(f"Group {gi}", item))
+        return cls(segments, _long_bay_row, shelves, [bins_per_shelf] * len(shelves))
+
+    @staticmethod
+    def _append_row(segments: List[Tuple[str, object]], group_name: str, row: Dict) -> None:
+        if segments and isinstance(segments[-1][1], list) and segments[-1][0] == group_name:
+            segments[-1][1].append(row)
+        else:
+            segments.append((group_name, [row]))
+
+    def __len__(self) -> int:
+        return self._bays * self.bins_per_bay
+
+    @property
+    def bay_count(self) -> int:
+        return self._bays
+
+    def bay(self, index: int) -> Dict:
+        """Bay attributes (the LabelTable bay columns) of bay `index`."""
+        if index < 0:
+            index += self._bays
+        if not 0 <= index < self._bays:
+            raise IndexError("LabelPlan bay index out of range")
+        seg = bisect.bisect_right(self._offsets, index) - 1
+        group_name, bays = self.segments[seg]
+        item = bays[index - self._offsets[seg]]
+        return self._bay_row(group_name, item) if isinstance(bays, IdRange) else item
+
+    def label(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LabelPlan index out of range")
+        row = self.bay(index // self.bins_per_bay)
+        k = index % self.bins_per_bay
+        number = str(row["start"] + int(self.block_pos[k]))
+        return row["prefix"] + self.shelves[self.block_shelf[k]] + (number.zfill(3) if row["pad"] > 0 else number)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self.label(i) for i in range(start, stop, step)]
+            return self.long(start, stop)["bin_label"].tolist() if stop > start else []
+        return self.label(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for table in self.chunks():
+            yield from table.bin_labels()
+
+    def table(self, bay_start: int = 0, bay_stop: Optional[int] = None) -> LabelTable:
+        """Compact LabelTable of bays bay_start..bay_stop-1."""
+        bay_stop = self._bays if bay_stop is None else min(bay_stop, self._bays)
+        rows = []
+        for seg, (group_name, bays) in enumerate(self.segments):
+            first, last = max(bay_start - self._offsets[seg], 0), min(bay_stop - self._offsets[seg], len(bays))
+            if first >= last:
+                continue
+            if isinstance(bays, IdRange):
+                rows.extend(self._bay_row(group_name, bays[i]) for i in range(first, last))
+            else:
+                rows.extend(bays[first:last])
+        return LabelTable(pd.DataFrame(rows, columns=BAY_COLUMNS), self.shelves, self.counts)
+
+    def chunks(self, bins: int = 65_536) -> Iterator[LabelTable]:
+        """LabelTables of whole bays, about `bins` labels each."""
+        step = max(1, bins // max(self.bins_per_bay, 1))
+        for start in range(0, self._bays, step):
+            yield self.table(start, start + step)
+
+    def long(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """Long layout (one row per bin) of labels start..stop-1."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if stop <= start or not self.bins_per_bay:
+            return pd.DataFrame()
+        first_bay = start // self.bins_per_bay
+        table = self.table(first_bay, (stop - 1) // self.bins_per_bay + 1)
+        offset = first_bay * self.bins_per_bay
+        return table.to_long(slice(start - offset, stop - offset))
+
+    def wide(self, bay_start: int = 0, bay_stop: Optional[int] = None) -> pd.DataFrame:
+        """Wide layout (one row per bin position, one column per shelf) of bays bay_start..bay_stop-1."""
+        return self.table(bay_start, bay_stop).to_wide()
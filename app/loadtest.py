@@ -0,0 +1,216 @@
+# app/loadtest.py
+"""Concurrent-session load test of main.py on Streamlit's AppTest (no server or network needed).
+
+Each simulated session opens the app, pastes a bay group, bin IDs and an EOA module layout,
+presses the three generate buttons and reruns until the background jobs have finished. Every
+script rerun is timed; latency percentiles are reported per step. Memory is reported as the
+pickled size of each session's state after its last rerun and the process RSS growth divided
+by the number of sessions. `--tracemalloc` adds Python-level allocation totals (exact, but it
+slows every rerun several times over, so the latencies of such a run are not comparable).
+
+    python -m app.loadtest --sessions 8 --bays 400 --csv latencies.csv --max-p90 2.0
+"""
+import argparse
+import os
+import pickle
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from app.jobs import get_runner
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+PERCENTILES = (50, 90, 99)
+
+JOB_TOOLS = {"generate_labels": "bin_labels", "generate_mapping": "bin_mapping", "generate_eoa": "eoa"}
+
+
+def bay_paste(session: int, bays: int) -> str:
+    """`bays` unique bay IDs as an Excel-style paste, distinct per session so caches do not hide the work."""
+    return "\n".join(f"BAY-{session + 1:03d}-{b // 1000 + 1:03d}-{b % 1000 + 1:03d}" for b in range(bays))
+
+
+def bin_paste(session: int, bins: int) -> str:
+    return "\n".join(f"P-{session + 1}-A{200 + b // 100}{'ABCDE'[b % 5]}{100 + b % 100}" for b in range(bins))
+
+
+def _state_bytes(at: AppTest) -> int:
+    """Approximate size of a session's state: the pickled size of every picklable value."""
+    total = 0
+    for key in at.session_state:
+        try:
+            total += len(pickle.dumps(at.session_state[key], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            continue
+    return total
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc), or the peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Session:
+    def __init__(self, index: int, bays: int, bins: int, aisles: int, timeout: float):
+        self.index = index
+        self.bays = bays
+        self.bins = bins
+        self.aisles = aisles
+        self.timeout = timeout
+        self.samples: List[Dict[str, Any]] = []
+        self.errors: List[str] = []
+        self.at: Optional[AppTest] = None
+
+    def _run(self, step: str) -> None:
+        started = time.perf_counter()
+        self.at.run(timeout=self.timeout)
+        self.samples.append({"session": self.index, "step": step, "seconds": time.perf_counter() - started})
+        if self.at.exception:
+            self.errors.extend(f"{step}: {e.message}" for e in self.at.exception)
+
+    def _generate(self, step: str, button: str) -> None:
+        self.at.button(key=button).click()
+        self._run(step)
+        tool = JOB_TOOLS[step]
+        started = time.perf_counter()
+        job = get_runner().get(self.at.session_state[f"job_{tool}"]) if f"job_{tool}" in self.at.session_state else None
+        if job is None:
+            self.errors.append(f"{step}: no job was started")
+            return
+        # the browser would poll through the fragment; here each poll is a full rerun
+        while not job.is_finished and time.perf_counter() - started < self.timeout:
+            time.sleep(0.05)
+            self._run(f"{step}_poll")
+        self._run(f"{step}_result")
+        self.samples.append({"session": self.index, "step": f"{step}_job", "seconds": time.perf_counter() - started})
+        if job.status != "done":
+            self.errors.append(f"{step}: job {job.status} {job.error or ''}".strip())
+
+    def run(self) -> None:
+        self.at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        self._run("open")
+        self.at.text_area(key="bays_0").input(bay_paste(self.index, self.bays))
+        self._run("paste_bays")
+        self._generate("generate_labels", "generate_bin_labels")
+
+        self.at.text_area(key="bin_ids_0").input(bin_paste(self.index, self.bins))
+        self.at.text_input(key="bay_definition_0").input("LOADTEST")
+        self._run("paste_bins")
+        self._generate("generate_mapping", "generate_bin_mapping_excel")
+
+        self.at.text_input(key="eoa_mod_name_input_0").input(f"P-{self.index + 1}-A")
+        self.at.number_input(key="aisle_end_0").set_value(200 + self.aisles - 1)
+        layout = ", ".join(f"{a}/{a + 1}" for a in range(200, 200 + self.aisles - 1, 2))
+        self.at.text_area(key="eoa_standard_layout_input").input(f"P-{self.index + 1}-A: {layout}")
+        self._run("define_module")
+        self._generate("generate_eoa", "generate_eoa_signage")
+
+
+def summarize(samples: pd.DataFrame) -> pd.DataFrame:
+    """Latency percentiles (seconds) per step, plus an 'all reruns' row over every timed rerun."""
+    reruns = samples[~samples["step"].str.endswith("_job")]
+    rows = []
+    for step, group in list(samples.groupby("step", sort=False)) + [("all reruns", reruns)]:
+        values = group["seconds"].to_numpy()
+        row = {"step": step, "count": len(values)}
+        row.update({f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES})
+        row["max"] = float(values.max())
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def run_load_test(sessions: int = 4, bays: int = 100, bins: int = 200, aisles: int = 10,
+                  concurrency: Optional[int] = None, timeout: float = 120.0, trace_memory: bool = False) -> Dict[str, Any]:
+    """
+    Run `sessions` simulated sessions, `concurrency` at a time (default: all at once).
+
+    Returns {'samples': per-rerun timings, 'summary': percentiles per step, 'memory': per-session
+    state bytes, 'rss_bytes_per_session', 'errors', 'seconds'}, plus 'traced_bytes_per_session'
+    and 'peak_traced_bytes' with `trace_memory`.
+    """
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        traced_baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    rss_baseline = rss_bytes()
+    started = time.perf_counter()
+    runs = [_Session(i, bays, bins, aisles, timeout) for i in range(sessions)]
+    result: Dict[str, Any] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency or sessions) as pool:
+            for run, future in [(run, pool.submit(run.run)) for run in runs]:
+                try:
+                    future.result()
+                except Exception as e:
+                    run.errors.append(f"session failed: {e!r}")
+        result["seconds"] = time.perf_counter() - started
+        result["rss_bytes_per_session"] = (rss_bytes() - rss_baseline) / max(sessions, 1)
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            result["traced_bytes_per_session"] = (current - traced_baseline) / max(sessions, 1)
+            result["peak_traced_bytes"] = peak - traced_baseline
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    samples = pd.DataFrame([s for run in runs for s in run.samples], columns=["session", "step", "seconds"])
+    result.update({
+        "samples": samples,
+        "summary": summarize(samples) if len(samples) else pd.DataFrame(),
+        "memory": pd.DataFrame([
+            {"session": run.index, "state_bytes": _state_bytes(run.at) if run.at is not None else 0} for run in runs
+        ], columns=["session", "state_bytes"]),
+        "errors": [f"session {run.index}: {e}" for run in runs for e in run.errors],
+    })
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.loadtest", description="Load-test main.py with concurrent AppTest sessions.")
+    parser.add_argument("-n", "--sessions", type=int, default=4)
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="sessions running at once (default: all)")
+    parser.add_argument("--bays", type=int, default=100, help="bay IDs pasted per session")
+    parser.add_argument("--bins", type=int, default=200, help="bin IDs pasted per session")
+    parser.add_argument("--aisles", type=int, default=10, help="aisles in each session's EOA module")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun and per job")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report traced Python allocations (slows reruns)")
+    parser.add_argument("--csv", default=None, help="write every timed rerun to this CSV")
+    parser.add_argument("--max-p90", type=float, default=None, help="exit non-zero if the p90 over all reruns exceeds this many seconds")
+    args = parser.parse_args(argv)
+
+    result = run_load_test(args.sessions, args.bays, args.bins, args.aisles, args.concurrency, args.timeout, args.tracemalloc)
+    if args.csv:
+        result["samples"].to_csv(args.csv, index=False)
+    print(result["summary"].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\n{args.sessions} sessions in {result['seconds']:.1f}s; "
+          f"session state {result['memory']['state_bytes'].mean() / 1e3:.1f} kB/session (mean), "
+          f"RSS growth {result['rss_bytes_per_session'] / 1e6:.2f} MB/session")
+    if args.tracemalloc:
+        print(f"traced growth {result['traced_bytes_per_session'] / 1e6:.2f} MB/session, peak {result['peak_traced_bytes'] / 1e6:.1f} MB")
+    for error in result["errors"]:
+        print(f"ERROR {error}", file=sys.stderr)
+    status = 1 if result["errors"] else 0
+    if args.max_p90 is not None and len(result["summary"]):
+        p90 = float(result["summary"].set_index("step").loc["all reruns", "p90"])
+        if p90 > args.max_p90:
+            print(f"p90 rerun latency {p90:.3f}s exceeds --max-p90 {args.max_p90}s", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,76 +1,121 @@
 # app/logic.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Union
+import re
 import pandas as pd
-from app.utils import parse_bay_id, normalize_bay_id
+from app.utils import normalize_bay_id
+from app.labeltable import LabelTable
+from app.ranges import IdRange, find_duplicate_ids, id_segments
+from app.metrics import CACHE_MISSES, CACHE_REQUESTS
 from functools import lru_cache
 import streamlit as st
 import plotly.graph_objs as go
 import plotly.express as px
 
+def _normalized_ids(group: Sequence[str]) -> List[Union[str, IdRange]]:
+    """normalize_bay_id applied to the plain IDs and to the ends of the ranges of a group, without expanding it."""
+    items = []
+    for item in id_segments(group):
+        if isinstance(item, IdRange):
+            # padded with a digit so that a separator next to the number is replaced, not stripped
+            item = IdRange(normalize_bay_id(item.prefix + "0")[:-1], item.start, item.stop, item.step, item.width,
+                           normalize_bay_id("0" + item.suffix)[1:])
+        elif item.strip():
+            item = normalize_bay_id(item)
+        items.append(item)
+    return items
+
+
 def check_duplicate_bay_ids(groups: List[List[str]]) -> Dict[str, Any]:
     """
     Returns dict with 'duplicates' key listing normalized duplicates across groups.
+    Groups may be IdLists; their ranges are compared without expanding them (see find_duplicate_ids).
     """
-    seen = {}
-    duplicates = set()
-    for gi, group in enumerate(groups):
-        for bay in group:
-            nb = normalize_bay_id(bay)
-            if nb in seen:
-                duplicates.add(nb)
-            else:
-                seen[nb] = (gi, bay)
-    return {"duplicates": sorted(list(duplicates)), "count": len(duplicates)}
+    duplicates = [ids for ids, _, _, _ in find_duplicate_ids([_normalized_ids(group) for group in groups])]
+    return {"duplicates": sorted(duplicates), "count": len(duplicates)}
+
+
+def generate_wide_labels_table(
+    group_name: str,
+    bay_ids: List[str],
+    shelves: List[str],
+    bins_per_shelf: Dict[str, int],
+    errors: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Wide label layout used by the exported workbooks: one row per bin position of a bay,
+    one column per shelf. Bays that cannot be processed are skipped and reported in `errors`.
+    """
+    return LabelTable.from_bays(group_name, bay_ids, shelves, bins_per_shelf, errors=errors).to_wide()
+
+
+def parse_bay_definition(bay_definition: str) -> Dict[str, str]:
+    if not bay_definition:
+        return {"error": "Bay Definition cannot be empty."}
+    return {"bay_definition": bay_definition}
+
+
+def build_bin_mapping_rows(group: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Bin Bay Mapping rows for one bay definition group. Shelves listed in
+    group["outlier_dimensions"] (matched by the capital letter before the trailing digits) override the defaults.
+    """
+    rows = []
+    bay_def = group["bay_definition"]
+    for bin_id in group["bin_ids"]:
+        current_h = group["height_cm"]
+        current_w = group["width_cm"]
+        current_d = group["depth_cm"]
 
+        match = re.search(r'([A-Z])\d+$', bin_id)
+        if match:
+            found_shelf = match.group(1)
+            if found_shelf in group["outlier_dimensions"]:
+                outlier_dims = group["outlier_dimensions"][found_shelf]
+                current_h = outlier_dims["height_cm"]
+                current_w = outlier_dims["width_cm"]
+                current_d = outlier_dims["depth_cm"]
 
+        rows.append({
+            "ScannableId": bin_id,
+            "Distance Index": None,
+            "Depth": round(current_d, 2) if current_d else None,
+            "Width": round(current_w, 2) if current_w else None,
+            "Height": round(current_h, 2) if current_h else None,
+            "Zone": group["zone"],
+            "Bay Definition": bay_def,
+            "bin_size": f"{int(current_d)}Deep" if current_d else "",
+            "Bay Type": group["bay_type"],
+            "Bay Usage": group["bay_usage"]
+        })
+    return rows
+
+
+# the cached bodies only run on a cache miss; the public wrappers count every call, so the
+# difference is the hit count (see app.metrics.cache_hit_rate)
 @st.cache_data(ttl=600)
-def generate_bin_labels_table_cached(groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> pd.DataFrame:
+def _bin_labels_table_cached(groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> pd.DataFrame:
+    CACHE_MISSES.inc(cache="bin_labels_table")
     return generate_bin_labels_table(groups, shelves, bins_per_shelf)
 
 
+def generate_bin_labels_table_cached(groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> pd.DataFrame:
+    CACHE_REQUESTS.inc(cache="bin_labels_table")
+    return _bin_labels_table_cached(groups, shelves, bins_per_shelf)
+
+
+@st.cache_data(ttl=600)
+def _label_table_cached(groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> LabelTable:
+    CACHE_MISSES.inc(cache="label_table")
+    return LabelTable.from_groups(groups, shelves, bins_per_shelf)
+
+
+def generate_label_table_cached(groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> LabelTable:
+    CACHE_REQUESTS.inc(cache="label_table")
+    return _label_table_cached(groups, shelves, bins_per_shelf)
+
+
 def generate_bin_labels_table(groups: List[List[str]], shelves: List[str], bins_per_shelf: int) -> pd.DataFrame:
-    rows = []
-    for gi, group in enumerate(groups, start=1):
-        group_name = f"Group {gi}"
-        for bay in group:
-            parsed = parse_bay_id(bay)
-            if parsed is None:
-                # keep original raw but mark invalid
-                base_number = None
-                base_prefix = normalize_bay_id(bay)
-            else:
-                base_number = parsed.get("number") or ""
-                # use a prefix composed of Bay normalized without trailing number
-                raw = normalize_bay_id(parsed["raw"])
-                # strip trailing number if present
-                if base_number and raw.endswith(base_number):
-                    base_prefix = raw[: -len(base_number)]
-                else:
-                    base_prefix = raw + "-" if not raw.endswith("-") else raw
-
-            for shelf in shelves:
-                for i in range(bins_per_shelf):
-                    if base_number and base_number.isdigit():
-                        # increment numeric suffix safely
-                        try:
-                            num = int(base_number) + i
-                            label = f"{base_prefix}{shelf}{num:03d}"
-                        except Exception:
-                            label = f"{base_prefix}{shelf}{i+1}"
-                    else:
-                        # fallback if we couldn't parse base number
-                        label = f"{base_prefix}{shelf}{i+1}"
-                    rows.append(
-                        {
-                            "group": group_name,
-                            "bay_input": bay,
-                            "normalized_bay": normalize_bay_id(bay),
-                            "shelf": shelf,
-                            "bin_label": label,
-                        }
-                    )
-    df = pd.DataFrame(rows)
-    return df
+    return LabelTable.from_groups(groups, shelves, bins_per_shelf).to_long()
 
 
 def plot_bin_diagram(group_bays: List[str], shelves: List[str], bins_per_shelf: int):
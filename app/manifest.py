@@ -0,0 +1,203 @@
+# app/manifest.py
+"""Per-group content manifest of a bin label export, and the diff used for incremental regeneration.
+
+A manifest lists every bay group with its shelves, bins per shelf, barcode flag and bay IDs
+(ID ranges stay compact, e.g. "BAY-001-001..BAY-001-400"), plus a content hash of those inputs. Exports embed it (a hidden sheet in the workbook, a
+manifest.json entry in the ZIP) so a later run can tell which groups need regenerating.
+"""
+import hashlib
+import io
+import json
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.ranges import IdRange, id_segments
+
+MANIFEST_VERSION = 1
+MANIFEST_SHEET = "_manifest"
+MANIFEST_FILE = "manifest.json"
+
+# Excel caps a cell at 32767 characters, so the JSON is spread over column A
+_SHEET_CHUNK = 32000
+
+REPORT_COLUMNS = ["group", "bay", "change", "detail"]
+
+WORKBOOK = "workbook"
+ZIP = "zip"
+MANIFEST = "manifest"
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def manifest_bays(entry: Dict[str, Any]) -> Iterator[str]:
+    """Every bay ID of a manifest entry, with its ranges expanded."""
+    for item in entry["bays"]:
+        if ".." in item:
+            yield from IdRange.parse(item)
+        else:
+            yield item
+
+
+def _bays_digest(config: str, bays: Iterator[str]) -> str:
+    """_digest([config, bays]) computed without building the bay list or its JSON in memory."""
+    h = hashlib.sha256(f"[{json.dumps(config)}, [".encode("utf-8"))
+    for i, bay in enumerate(bays):
+        h.update(((", " if i else "") + json.dumps(bay)).encode("utf-8"))
+    h.update(b"]]")
+    return h.hexdigest()[:16]
+
+
+def group_entry(group: Dict[str, Any], barcodes: bool = False, file: Optional[str] = None) -> Dict[str, Any]:
+    """Manifest entry for one bay group; `config` hashes everything but the bay list."""
+    config = {
+        "shelves": list(group["shelves"]),
+        "bins_per_shelf": {shelf: int(group["bins_per_shelf"].get(shelf, 0)) for shelf in group["shelves"]},
+        "barcodes": bool(barcodes),
+    }
+    bays = [item.strip() if isinstance(item, str) else str(item) for item in id_segments(group["bays"])]
+    entry = {"name": group["name"], **config, "bays": bays, "config": _digest(config)}
+    # the hash covers the expanded IDs, so a range and the same IDs listed one by one match
+    entry["hash"] = _bays_digest(entry["config"], manifest_bays(entry))
+    if file is not None:
+        entry["file"] = file
+    return entry
+
+
+def build_manifest(bay_groups: List[Dict[str, Any]], barcodes: bool = False,
+                   files: Optional[List[str]] = None) -> Dict[str, Any]:
+    groups = [group_entry(g, barcodes, files[i] if files else None) for i, g in enumerate(bay_groups)]
+    return {"version": MANIFEST_VERSION, "groups": groups}
+
+
+def manifest_subset(manifest: Dict[str, Any], names: List[str]) -> Dict[str, Any]:
+    """The manifest of an output holding only the named groups (a partial, manifest-only update)."""
+    keep = set(names)
+    return {**manifest, "groups": [g for g in manifest["groups"] if g["name"] in keep]}
+
+
+def manifest_json(manifest: Dict[str, Any]) -> bytes:
+    return json.dumps(manifest, indent=1).encode("utf-8")
+
+
+def reserved_group_names(bay_groups: List[Dict[str, Any]]) -> List[str]:
+    """Group names that would replace the manifest sheet (Excel compares sheet names case-insensitively)."""
+    return [g["name"] for g in bay_groups if str(g["name"]).strip().lower() == MANIFEST_SHEET.lower()]
+
+
+def write_manifest_sheet(book, manifest: Dict[str, Any]) -> None:
+    """(Re)write the hidden manifest sheet of an openpyxl workbook."""
+    if MANIFEST_SHEET in book.sheetnames:
+        del book[MANIFEST_SHEET]
+    ws = book.create_sheet(MANIFEST_SHEET)
+    text = json.dumps(manifest, separators=(",", ":"))
+    for row, start in enumerate(range(0, len(text), _SHEET_CHUNK), start=1):
+        ws.cell(row=row, column=1, value=text[start:start + _SHEET_CHUNK])
+    ws.sheet_state = "veryHidden"
+
+
+def _manifest_from_sheets(data: bytes) -> Dict[str, Any]:
+    """Rebuild a manifest from the label sheets of a workbook exported without one."""
+    groups = []
+    for name, df in pd.read_excel(io.BytesIO(data), sheet_name=None, header=1).items():
+        if name == MANIFEST_SHEET or "BAY ID" not in df.columns:
+            continue
+        columns = list(df.columns)
+        shelves = [c for c in columns[columns.index("BAY ID") + 1:] if not str(c).endswith(" BARCODE")]
+        bays = list(dict.fromkeys(df["BAY ID"].dropna().astype(str)))
+        first_bay = df["BAY ID"] == bays[0] if bays else df["BAY ID"].isna()
+        group = {
+            "name": name,
+            "shelves": [str(s) for s in shelves],
+            "bins_per_shelf": {str(s): int(df.loc[first_bay, s].notna().sum()) for s in shelves},
+            "bays": bays,
+        }
+        groups.append(group_entry(group, barcodes=len(shelves) < len(columns) - columns.index("BAY ID") - 1))
+    return {"version": MANIFEST_VERSION, "groups": groups}
+
+
+def export_kind(source: Union[bytes, str, Dict[str, Any]]) -> str:
+    """Which kind of previous export was uploaded: WORKBOOK, ZIP (per-group workbooks) or MANIFEST (JSON)."""
+    if isinstance(source, (bytes, bytearray)) and source[:2] == b"PK":
+        with zipfile.ZipFile(io.BytesIO(source)) as archive:
+            return WORKBOOK if "[Content_Types].xml" in archive.namelist() else ZIP
+    return MANIFEST
+
+
+def read_manifest(source: Union[bytes, str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Manifest of a previous export: a manifest JSON, a label workbook (hidden manifest sheet, or
+    rebuilt from its sheets for older exports) or a per-group ZIP (its manifest.json entry).
+    """
+    if isinstance(source, dict):
+        return source
+    data = source.encode("utf-8") if isinstance(source, str) else source
+    if data[:2] == b"PK":
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            names = archive.namelist()
+            if MANIFEST_FILE in names:
+                return json.loads(archive.read(MANIFEST_FILE))
+            if "[Content_Types].xml" not in names:
+                raise ValueError("ZIP export has no manifest.json; regenerate it once with a full export.")
+        book = load_workbook(io.BytesIO(data), read_only=True)
+        try:
+            if MANIFEST_SHEET in book.sheetnames:
+                text = "".join(str(row[0]) for row in book[MANIFEST_SHEET].iter_rows(values_only=True) if row and row[0])
+                return json.loads(text)
+        finally:
+            book.close()
+        return _manifest_from_sheets(data)
+    try:
+        manifest = json.loads(data)
+    except ValueError:
+        raise ValueError("Previous export must be a label workbook, a per-group ZIP or a manifest JSON file.")
+    if not isinstance(manifest, dict) or "groups" not in manifest:
+        raise ValueError("Manifest JSON has no 'groups'.")
+    return manifest
+
+
+def _config_detail(old: Dict[str, Any], new: Dict[str, Any]) -> str:
+    parts = []
+    for key, label in (("shelves", "shelves"), ("bins_per_shelf", "bins per shelf"), ("barcodes", "barcodes")):
+        if old.get(key) != new.get(key):
+            parts.append(f"{label} {old.get(key)} -> {new.get(key)}")
+    return "; ".join(parts)
+
+
+def diff_manifests(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[Dict[str, List[str]], pd.DataFrame]:
+    """
+    Compare two manifests. Returns ({'added', 'removed', 'changed', 'unchanged'} -> group names,
+    change report). The report has one row per added/removed group, one row per group whose
+    shelf/bin/barcode settings changed, and one row per added or removed bay otherwise.
+    """
+    old_groups = {g["name"]: g for g in old.get("groups", [])}
+    new_groups = {g["name"]: g for g in new.get("groups", [])}
+    changes = {"added": [], "removed": [], "changed": [], "unchanged": []}
+    rows = []
+    for name, entry in new_groups.items():
+        before = old_groups.get(name)
+        if before is None:
+            changes["added"].append(name)
+            rows.append({"group": name, "bay": "", "change": "group added", "detail": f"{sum(1 for _ in manifest_bays(entry))} bays"})
+            continue
+        if before.get("hash") == entry["hash"]:
+            changes["unchanged"].append(name)
+            continue
+        changes["changed"].append(name)
+        if before.get("config") != entry["config"]:
+            rows.append({"group": name, "bay": "", "change": "settings changed", "detail": _config_detail(before, entry)})
+            continue
+        old_bays, new_bays = set(manifest_bays(before)), set(manifest_bays(entry))
+        rows.extend({"group": name, "bay": bay, "change": "bay added", "detail": ""} for bay in manifest_bays(entry) if bay not in old_bays)
+        rows.extend({"group": name, "bay": bay, "change": "bay removed", "detail": ""} for bay in manifest_bays(before) if bay not in new_bays)
+        if old_bays == new_bays:
+            rows.append({"group": name, "bay": "", "change": "bays reordered", "detail": ""})
+    for name, before in old_groups.items():
+        if name not in new_groups:
+            changes["removed"].append(name)
+            rows.append({"group": name, "bay": "", "change": "group removed", "detail": f"{sum(1 for _ in manifest_bays(before))} bays"})
+    return changes, pd.DataFrame(rows, columns=REPORT_COLUMNS)
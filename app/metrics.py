@@ -0,0 +1,278 @@
+# app/metrics.py
+"""Process-wide operational metrics: counters and histograms shared by every session on a host.
+
+Metrics live in one MetricsRegistry per process (REGISTRY). Updating one takes a single lock
+around a dict update, so they are called once per export, job or check, never per label.
+`REGISTRY.render()` is a snapshot in the Prometheus text exposition format (version 0.0.4);
+`start_file_dump()` rewrites it to a local file every DUMP_INTERVAL seconds (atomically, so
+a node exporter textfile collector or a tail never sees half a file) and once more at exit.
+
+    EXPORTS.inc(tool="labels", format="xlsx")
+    with EXPORT_SECONDS.time(tool="labels", format="xlsx"):
+        ...
+"""
+import atexit
+import bisect
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DUMP_INTERVAL = 60
+METRICS_FILE_ENV = "BIN_LABEL_METRICS_FILE"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+# 1 KiB to 256 MiB in powers of four
+BYTES_BUCKETS = tuple(1024 * 4 ** i for i in range(10))
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError:
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+
+    def _labels(self, key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def rows(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A total that only goes up, one per combination of label values."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("counters can only be increased")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def _items(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_number(value)}" for key, value in self._items()]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [{"metric": self.name, "labels": self._labels(key), "value": value} for key, value in self._items()]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative `le` buckets, with their count and sum."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = SECONDS_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label key: [observations per bucket (the last one is +Inf), sum]
+        self._values: Dict[LabelKey, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of the `with` block in seconds, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        key = self._key(labels)
+        with self._lock:
+            return sum(self._values[key][0]) if key in self._values else 0
+
+    def sum(self, **labels: Any) -> float:
+        key = self._key(labels)
+        with self._lock:
+            return self._values[key][1] if key in self._values else 0.0
+
+    def _items(self) -> List[Tuple[LabelKey, List[int], float]]:
+        with self._lock:
+            return [(key, list(counts), total) for key, (counts, total) in sorted(self._values.items())]
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, counts, total in self._items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._labels(key, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+    def rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for key, counts, total in self._items():
+            count = sum(counts)
+            rows.append({"metric": self.name, "labels": self._labels(key), "value": count, "sum": total,
+                         "mean": total / count if count else None})
+        return rows
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"metric {metric.name} is already registered as a different {existing.kind}")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """The counter called `name`, created on first use."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = SECONDS_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One row per metric and label combination (histograms: count, sum and mean), for tables."""
+        return [row for metric in self.metrics() for row in metric.rows()]
+
+    def write(self, path: str) -> None:
+        """Write render() to `path` through a temporary file and a rename."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".metrics-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+REGISTRY = MetricsRegistry()
+
+EXPORTS = REGISTRY.counter("binlabel_exports_total", "Exports generated, by tool and format.", ("tool", "format"))
+EXPORT_SECONDS = REGISTRY.histogram("binlabel_export_seconds", "Wall time of one export.", ("tool", "format"))
+EXPORT_BYTES = REGISTRY.histogram("binlabel_export_bytes", "Size of the generated export files.", ("tool", "format"),
+                                  BYTES_BUCKETS)
+ITEMS_GENERATED = REGISTRY.counter("binlabel_items_generated_total", "Labels, mapping rows and EOA signs generated.", ("kind",))
+GENERATION_ERRORS = REGISTRY.counter("binlabel_generation_errors_total", "Bays and layout entries skipped with an error.", ("tool",))
+CACHE_REQUESTS = REGISTRY.counter("binlabel_cache_requests_total", "Calls of a cached table builder.", ("cache",))
+CACHE_MISSES = REGISTRY.counter("binlabel_cache_misses_total", "Cached table builder calls that had to build the table.", ("cache",))
+DUPLICATE_CHECK_SECONDS = REGISTRY.histogram("binlabel_duplicate_check_seconds", "Wall time of one duplicate check.", ("kind",))
+JOBS = REGISTRY.counter("binlabel_jobs_total", "Background export jobs finished, by final status.", ("tool", "status"))
+JOB_SECONDS = REGISTRY.histogram("binlabel_job_seconds", "Wall time of background export jobs, queueing excluded.", ("tool",))
+
+
+def cache_hit_rate(cache: str) -> Optional[float]:
+    """Share of calls of `cache` answered from the cache, or None before the first call."""
+    requests = CACHE_REQUESTS.value(cache=cache)
+    return (requests - CACHE_MISSES.value(cache=cache)) / requests if requests else None
+
+
+def metrics_file() -> str:
+    return os.environ.get(METRICS_FILE_ENV) or os.path.join(tempfile.gettempdir(), "bin-label-metrics.prom")
+
+
+def _dump(path: str) -> None:
+    try:
+        REGISTRY.write(path)
+    except OSError:
+        # a full or read-only disk must not take the app down; the next dump tries again
+        pass
+
+
+_dump_thread: Optional[threading.Thread] = None
+_dump_lock = threading.Lock()
+
+
+def start_file_dump(path: Optional[str] = None, interval: float = DUMP_INTERVAL) -> threading.Thread:
+    """Write REGISTRY to `path` (default metrics_file()) every `interval` seconds; started once per process."""
+    global _dump_thread
+    path = path or metrics_file()
+    with _dump_lock:
+        if _dump_thread is None:
+            def run():
+                while True:
+                    time.sleep(interval)
+                    _dump(path)
+
+            _dump_thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+            _dump_thread.start()
+            atexit.register(_dump, path)
+        return _dump_thread
@@ -0,0 +1,210 @@
+# app/overview.py
+"""Whole-site overview diagram: every bay x shelf x bin of one group or the whole site in one figure.
+
+Bays run along x and bin slots (shelf by shelf, top down) along y. A window of up to
+MAX_POINTS bins is drawn at full resolution as WebGL markers (Scattergl) with one hover per
+bin. Wider windows are downsampled to a heatmap of at most MAX_COLUMNS columns, each
+aggregating a run of neighbouring bays of one group, with the bay range and bin count in the
+hover. The figure is built from LabelTables, so labels are only formatted for a detailed window.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from app.labeltable import LabelTable
+
+MAX_POINTS = 50_000
+MAX_COLUMNS = 1_500
+
+_PALETTE = px.colors.qualitative.Plotly
+
+
+class SiteOverview:
+    """Bin grid of one or more LabelTables laid side by side; `figure(start, stop)` draws a bay window."""
+
+    def __init__(self, tables: Sequence[LabelTable]):
+        self.tables = [t for t in tables if t.bay_count]
+        self.bay_offsets = np.cumsum([0] + [t.bay_count for t in self.tables])
+        # shelf rows line up by position, each as tall as its largest group, with a gap row between shelves
+        depth = max((len(t.counts) for t in self.tables), default=0)
+        self.heights = [max([t.counts[s] for t in self.tables if s < len(t.counts)] + [0]) for s in range(depth)]
+        self.shelf_offsets = np.cumsum([0] + [h + 1 for h in self.heights])[:-1].astype(np.int64)
+        self.n_rows = int(sum(self.heights) + max(depth - 1, 0))
+        self.shelf_names = list(dict.fromkeys(s for t in self.tables for s in t.shelves))
+        self.spans = self._group_spans()
+
+    @classmethod
+    def from_groups(cls, bay_groups: List[Dict[str, Any]]) -> "SiteOverview":
+        """From the Streamlit bay groups (name, bays, shelves, bins_per_shelf); unparseable bays are skipped."""
+        return cls([LabelTable.from_bays(g["name"], g["bays"], g["shelves"], g["bins_per_shelf"]) for g in bay_groups])
+
+    @property
+    def n_bays(self) -> int:
+        return int(self.bay_offsets[-1])
+
+    @property
+    def n_bins(self) -> int:
+        return sum(len(t) for t in self.tables)
+
+    @property
+    def groups(self) -> List[str]:
+        return list(dict.fromkeys(name for _, _, _, name in self.spans))
+
+    def group_window(self, name: str) -> Tuple[int, int]:
+        """Bay window (start, stop) covering every bay of the named group."""
+        spans = [(start, stop) for start, stop, _, group in self.spans if group == name]
+        return (min(s for s, _ in spans), max(e for _, e in spans)) if spans else (0, 0)
+
+    def _group_spans(self) -> List[Tuple[int, int, int, str]]:
+        """(first bay, end bay, table index, group) runs of consecutive bays of one group."""
+        spans = []
+        for ti, table in enumerate(self.tables):
+            groups = table.bays["group"].astype(str).to_numpy()
+            starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+            for start, stop in zip(starts, np.r_[starts[1:], len(groups)]):
+                offset = int(self.bay_offsets[ti])
+                spans.append((offset + int(start), offset + int(stop), ti, groups[start]))
+        return spans
+
+    def _rows(self, table: LabelTable, first: int, last: int) -> np.ndarray:
+        """Bin rows of a table's bays first..last-1 (bay_index is sorted, so two binary searches)."""
+        lo, hi = np.searchsorted(table.bay_index, [first, last], side="left")
+        return np.arange(lo, hi)
+
+    def _slots(self, table: LabelTable, rows: np.ndarray) -> np.ndarray:
+        return self.shelf_offsets[table.shelf_index[rows]] + table.position[rows]
+
+    def bins_in(self, start: int, stop: int) -> int:
+        total = 0
+        for ti, table in enumerate(self.tables):
+            first, last = max(start - self.bay_offsets[ti], 0), min(stop - self.bay_offsets[ti], table.bay_count)
+            if first < last:
+                total += len(self._rows(table, first, last))
+        return total
+
+    def figure(self, start: int = 0, stop: Optional[int] = None, max_points: int = MAX_POINTS,
+               max_columns: int = MAX_COLUMNS) -> go.Figure:
+        """Bays start..stop-1 at full resolution if they hold at most `max_points` bins, else downsampled."""
+        stop = self.n_bays if stop is None else min(stop, self.n_bays)
+        start = max(0, min(start, stop))
+        if start == stop:
+            fig = go.Figure()
+            fig.update_layout(title="No bays to plot")
+            return fig
+        if self.bins_in(start, stop) <= max_points:
+            fig = self._scatter(start, stop)
+            title = f"{stop - start:,} bays, one marker per bin"
+        else:
+            fig, bucket = self._heatmap(start, stop, max_columns)
+            title = f"{stop - start:,} bays, up to {bucket:,} bays per column (narrow the window for single bins)"
+        fig.update_layout(
+            title=title,
+            xaxis=dict(title="Bay", range=[start - 0.5, stop - 0.5], showgrid=False, zeroline=False),
+            yaxis=dict(title="Shelf", tickvals=[-int(o) for o in self.shelf_offsets],
+                       ticktext=self._shelf_ticks(), range=[-self.n_rows + 0.5, 0.5], showgrid=False, zeroline=False),
+            legend_title="Shelf",
+            margin=dict(l=40, r=20, t=50, b=40),
+            height=min(900, 240 + 12 * self.n_rows),
+        )
+        return fig
+
+    def _shelf_ticks(self) -> List[str]:
+        ticks = []
+        for s in range(len(self.shelf_offsets)):
+            ticks.append("/".join(dict.fromkeys(t.shelves[s] for t in self.tables if s < len(t.shelves))))
+        return ticks
+
+    def _scatter(self, start: int, stop: int) -> go.Figure:
+        parts: Dict[str, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+        for ti, table in enumerate(self.tables):
+            offset = int(self.bay_offsets[ti])
+            first, last = max(start - offset, 0), min(stop - offset, table.bay_count)
+            if first >= last:
+                continue
+            rows = self._rows(table, first, last)
+            bay_idx = table.bay_index[rows]
+            hover = (table.bays["group"].astype(str).to_numpy(dtype=object)[bay_idx] + " · "
+                     + table.bays["bay_input"].astype(str).to_numpy(dtype=object)[bay_idx] + "<br>"
+                     + table.bin_labels(rows).to_numpy(dtype=object))
+            x, y = bay_idx + offset, -self._slots(table, rows)
+            for si, shelf in enumerate(table.shelves):
+                mask = table.shelf_index[rows] == si
+                if mask.any():
+                    parts.setdefault(shelf, []).append((x[mask], y[mask], hover[mask]))
+        size = max(2, min(12, int(600 / max(stop - start, 1))))
+        fig = go.Figure()
+        for shelf, chunks in parts.items():
+            fig.add_trace(go.Scattergl(
+                x=np.concatenate([c[0] for c in chunks]),
+                y=np.concatenate([c[1] for c in chunks]),
+                hovertext=np.concatenate([c[2] for c in chunks]),
+                hoverinfo="text",
+                mode="markers",
+                name=shelf,
+                marker=dict(symbol="square", size=size, color=self._color(shelf)),
+            ))
+        return fig
+
+    def _heatmap(self, start: int, stop: int, max_columns: int) -> Tuple[go.Figure, int]:
+        bucket = max(1, -(-(stop - start) // max_columns))
+        # buckets restart at every group boundary so a column never mixes two groups' layouts
+        columns = []
+        for span_start, span_stop, ti, group in self.spans:
+            first, last = max(start, span_start), min(stop, span_stop)
+            columns.extend((b, min(b + bucket, last), ti, group) for b in range(first, last, bucket))
+        n_cols = len(columns)
+        z = np.full((self.n_rows, n_cols), np.nan)
+        x = np.empty(n_cols)
+        column_text = np.empty(n_cols, dtype=object)
+        for ci, (first, last, ti, group) in enumerate(columns):
+            table, offset = self.tables[ti], int(self.bay_offsets[ti])
+            # every bay of a table has the same shelf/bin block, so the first bay's block stands for the column
+            rows = self._rows(table, first - offset, first - offset + 1)
+            z[self._slots(table, rows), ci] = [self.shelf_names.index(table.shelves[s]) for s in table.shelf_index[rows]]
+            x[ci] = (first + last - 1) / 2
+            bays = table.bays["bay_input"]
+            column_text[ci] = (f"{group} · {bays.iat[first - offset]}" if last - first == 1 else
+                               f"{group} · {bays.iat[first - offset]} – {bays.iat[last - offset - 1]} ({last - first:,} bays)")
+        row_text = np.full(self.n_rows, "", dtype=object)
+        for ticks, offset, height in zip(self._shelf_ticks(), self.shelf_offsets, self.heights):
+            row_text[offset:offset + height] = [f"<br>shelf {ticks}, bin {p + 1}" for p in range(height)]
+        sizes = np.array([f"<br>{last - first:,} bins" for first, last, _, _ in columns], dtype=object)
+        text = np.add.outer(column_text, row_text).T + sizes
+        n = len(self.shelf_names)
+        scale = []
+        for i, shelf in enumerate(self.shelf_names):
+            scale += [(i / n, self._color(shelf)), ((i + 1) / n, self._color(shelf))]
+        fig = go.Figure(go.Heatmap(
+            x=x, y=-np.arange(self.n_rows), z=z, text=text, hoverinfo="text",
+            colorscale=scale, zmin=-0.5, zmax=n - 0.5, xgap=0, ygap=1,
+            colorbar=dict(title="Shelf", tickvals=list(range(n)), ticktext=self.shelf_names),
+        ))
+        return fig, bucket
+
+    def _color(self, shelf: str) -> str:
+        return _PALETTE[self.shelf_names.index(shelf) % len(_PALETTE)]
+
+
+def render_site_overview(overview: SiteOverview, key: str) -> None:
+    """Group picker, bay window and the overview figure; reruns only this fragment while exploring."""
+
+    @st.fragment
+    def panel():
+        if not overview.n_bays:
+            st.info("No bays to plot.")
+            return
+        scope = st.selectbox("Show", ["Whole site"] + overview.groups, key=f"{key}_scope")
+        first, last = (0, overview.n_bays) if scope == "Whole site" else overview.group_window(scope)
+        if last - first > 1:
+            window = st.slider("Bays", min_value=first, max_value=last, value=(first, last), key=f"{key}_window_{scope}",
+                               help="Narrow the window to see single bins; wide windows are aggregated.")
+        else:
+            window = (first, last)
+        st.plotly_chart(overview.figure(*window), use_container_width=True, config={"scrollZoom": True}, key=f"{key}_chart")
+        st.caption(f"{overview.bins_in(*window):,} bins in {window[1] - window[0]:,} bays "
+                   f"({overview.n_bins:,} bins in {overview.n_bays:,} bays overall).")
+
+    panel()
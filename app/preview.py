@@ -0,0 +1,214 @@
+# app/preview.py
+"""Server-side paginated previews of result tables.
+
+The full table stays in the Python process; the browser only receives the current page.
+ID columns get a sorted index so a prefix search is two binary searches, and categorical
+columns (group, shelf, module) are kept as integer codes so filters are vectorised lookups.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from app.labeltable import LabelTable
+
+DEFAULT_PAGE_SIZE = 50
+LONG_COLUMNS = ["group", "bay_input", "normalized_bay", "shelf", "bin_label"]
+_MATCH_CACHE_SIZE = 8
+
+
+class PrefixIndex:
+    """Sorted, upper-cased copy of an ID column; `lookup(prefix)` returns the positions starting with it."""
+
+    def __init__(self, keys: Sequence[str]):
+        # an object array of the strings themselves: a fixed-width unicode array would reserve
+        # the longest key's width (4 bytes per character) for every entry
+        values = pd.Series(keys, dtype=object).fillna("").astype(str).str.strip().str.upper().to_numpy(dtype=object)
+        self.order = np.argsort(values, kind="stable")
+        self.sorted = values[self.order]
+
+    def lookup(self, prefix: str) -> np.ndarray:
+        prefix = prefix.strip().upper()
+        if not prefix:
+            return self.order
+        # every key starting with `prefix` sorts between it and the prefix with its last character bumped
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        lo, hi = np.searchsorted(self.sorted, [prefix, upper], side="left")
+        return self.order[lo:hi]
+
+
+class PreviewTable:
+    """
+    A result table kept on the server, queried one page at a time.
+
+    `frame(rows)` materialises the given row positions. `search` maps a name to a PrefixIndex
+    and, when the index is over a per-entity column (e.g. one key per bay), the row -> key
+    position array. `filters` maps a name to the per-row code arrays (several columns may
+    share one filter, e.g. left and right module) and their category labels.
+    """
+
+    def __init__(
+        self,
+        n_rows: int,
+        frame: Callable[[np.ndarray], pd.DataFrame],
+        search: Dict[str, Tuple[PrefixIndex, Optional[np.ndarray]]],
+        filters: Optional[Dict[str, Tuple[List[np.ndarray], List[str]]]] = None,
+    ):
+        self.n_rows = n_rows
+        self._frame = frame
+        self.search = search
+        self.filters = filters or {}
+        self._matches: "OrderedDict[Any, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, search_columns: List[str],
+                   filter_columns: Optional[Dict[str, List[str]]] = None) -> "PreviewTable":
+        df = df.reset_index(drop=True)
+        search = {col: (PrefixIndex(df[col].tolist()), None) for col in search_columns if col in df.columns}
+        filters = {}
+        for name, columns in (filter_columns or {}).items():
+            columns = [col for col in columns if col in df.columns]
+            values = pd.concat([df[col].astype(str) for col in columns], ignore_index=True) if columns else pd.Series(dtype=str)
+            categories = sorted(v for v in values.unique() if v not in ("", "nan", "None"))
+            codes = [pd.Index(categories).get_indexer(df[col].astype(str)) for col in columns]
+            filters[name] = (codes, categories)
+        return cls(len(df), lambda rows: df.iloc[rows].reset_index(drop=True), search, filters)
+
+    @classmethod
+    def from_label_table(cls, table: LabelTable) -> "PreviewTable":
+        return cls.from_label_tables([table])
+
+    @classmethod
+    def from_label_tables(cls, tables: Sequence[LabelTable]) -> "PreviewTable":
+        """
+        Labels of one or more LabelTables (e.g. one per bay group, each with its own shelves) as one
+        table. Bin labels are indexed per bin, bay IDs per bay, groups and shelves as codes; pages
+        are formatted with to_long() of the tables they fall in, so no long frame is built.
+        """
+        tables = [t for t in tables if len(t)]
+        row_offsets = np.cumsum([0] + [len(t) for t in tables])
+        bay_offsets = np.cumsum([0] + [t.bay_count for t in tables])
+        bay_index = np.concatenate([t.bay_index + offset for t, offset in zip(tables, bay_offsets)]) if tables else np.empty(0, dtype=np.int64)
+        group_codes, groups = pd.factorize(pd.concat([t.bays["group"].astype(str) for t in tables], ignore_index=True)
+                                           if tables else pd.Series(dtype=object))
+        shelves = list(dict.fromkeys(s for t in tables for s in t.shelves))
+        shelf_codes = (np.concatenate([np.asarray([shelves.index(s) for s in t.shelves])[t.shelf_index] for t in tables])
+                       if tables else np.empty(0, dtype=np.int64))
+        search = {
+            "bin_label": (PrefixIndex(np.concatenate([t.bin_labels().to_numpy(dtype=object) for t in tables])
+                                      if tables else []), None),
+            "bay": (PrefixIndex(np.concatenate([t.bays["bay_input"].to_numpy(dtype=object) for t in tables])
+                                if tables else []), bay_index),
+        }
+        filters = {
+            "group": ([group_codes[bay_index]], [str(g) for g in groups]),
+            "shelf": ([shelf_codes], shelves),
+        }
+
+        def frame(rows: np.ndarray) -> pd.DataFrame:
+            rows = np.asarray(rows, dtype=np.int64)
+            if not len(rows):
+                return pd.DataFrame(columns=LONG_COLUMNS)
+            owner = np.searchsorted(row_offsets, rows, side="right") - 1
+            # consecutive rows of one table are formatted together
+            starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+            parts = [tables[owner[a]].to_long(rows[a:b] - row_offsets[owner[a]]) for a, b in zip(starts, np.r_[starts[1:], len(rows)])]
+            return pd.concat(parts, ignore_index=True)
+
+        return cls(int(row_offsets[-1]), frame, search, filters)
+
+    def options(self, name: str) -> List[str]:
+        return self.filters[name][1] if name in self.filters else []
+
+    def match(self, prefix: str = "", selected: Optional[Dict[str, List[str]]] = None) -> np.ndarray:
+        """Row positions (ascending) whose search keys start with `prefix` and that pass every filter."""
+        prefix = prefix.strip().upper()
+        selected = {name: values for name, values in (selected or {}).items() if values and name in self.filters}
+        key = (prefix, tuple(sorted((name, tuple(values)) for name, values in selected.items())))
+        if key in self._matches:
+            self._matches.move_to_end(key)
+            return self._matches[key]
+
+        if prefix:
+            row_level = [idx.lookup(prefix) for idx, row_key in self.search.values() if row_key is None]
+            if not selected and all(row_key is None for _, row_key in self.search.values()):
+                # search only: no per-row pass at all, the cost is the size of the match
+                rows = np.unique(np.concatenate(row_level)) if row_level else np.empty(0, dtype=np.int64)
+                return self._remember(key, rows)
+            mask = np.zeros(self.n_rows, dtype=bool)
+            for positions in row_level:
+                mask[positions] = True
+            for idx, row_key in self.search.values():
+                if row_key is not None:
+                    mask |= np.isin(row_key, idx.lookup(prefix))
+        else:
+            mask = np.ones(self.n_rows, dtype=bool)
+        for name, values in selected.items():
+            code_arrays, categories = self.filters[name]
+            wanted = [categories.index(v) for v in values if v in categories]
+            passed = np.zeros(self.n_rows, dtype=bool)
+            for codes in code_arrays:
+                passed |= np.isin(codes, wanted)
+            mask &= passed
+        return self._remember(key, np.flatnonzero(mask))
+
+    def _remember(self, key: Any, rows: np.ndarray) -> np.ndarray:
+        self._matches[key] = rows
+        while len(self._matches) > _MATCH_CACHE_SIZE:
+            self._matches.popitem(last=False)
+        return rows
+
+    def page(self, rows: np.ndarray, page: int, page_size: int = DEFAULT_PAGE_SIZE) -> pd.DataFrame:
+        start = max(page, 0) * page_size
+        return self._frame(rows[start:start + page_size])
+
+
+def label_preview(bay_groups: List[Dict[str, Any]]) -> PreviewTable:
+    """Labels of the workbook bay groups (each group has its own shelves and bin counts), one LabelTable per group."""
+    return PreviewTable.from_label_tables(
+        [LabelTable.from_bays(g["name"], g["bays"], g["shelves"], g["bins_per_shelf"]) for g in bay_groups])
+
+
+def mapping_preview(df: pd.DataFrame) -> PreviewTable:
+    df = df.reset_index(drop=True).copy()
+    # the same shelf rule as the outlier dimensions: the capital letter before the trailing digits
+    df["Shelf"] = df["ScannableId"].astype(str).str.extract(r"([A-Z])\d+$", expand=False).fillna("") if len(df) else ""
+    return PreviewTable.from_frame(df, ["ScannableId"], {"group": ["Bay Definition"], "shelf": ["Shelf"]})
+
+
+def eoa_preview(signage_data: List[Dict[str, Any]]) -> PreviewTable:
+    df = pd.DataFrame(signage_data)
+    for side in ("Left", "Right"):
+        if f"{side}.Aisle" in df.columns:
+            df[f"{side}.Aisle"] = df[f"{side}.Aisle"].astype(str)
+    return PreviewTable.from_frame(df, ["Left.Aisle", "Right.Aisle", "Deployment Location"], {"module": ["Left.Mod", "Right.Mod"]})
+
+
+def render_preview(preview: PreviewTable, key: str, page_size: int = DEFAULT_PAGE_SIZE) -> None:
+    """Search box, filters and one page of `preview`; reruns only this fragment while browsing."""
+
+    @st.fragment
+    def panel():
+        columns = st.columns([2] + [1] * len(preview.filters))
+        with columns[0]:
+            prefix = st.text_input("Search (ID prefix)", key=f"{key}_search", placeholder=", ".join(preview.search))
+        selected = {}
+        for column, name in zip(columns[1:], preview.filters):
+            with column:
+                selected[name] = st.multiselect(name.capitalize(), options=preview.options(name), key=f"{key}_{name}")
+        rows = preview.match(prefix, selected)
+        pages = max((len(rows) + page_size - 1) // page_size, 1)
+        if st.session_state.get(f"{key}_page", 1) > pages:
+            # a narrower search leaves fewer pages than the one being shown
+            st.session_state[f"{key}_page"] = pages
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page") - 1
+        st.dataframe(preview.page(rows, page, page_size), use_container_width=True, hide_index=True)
+        first = page * page_size + 1 if len(rows) else 0
+        st.caption(f"Showing {first}–{min((page + 1) * page_size, len(rows))} of {len(rows):,} matching rows ({len(preview):,} total).")
+
+    panel()
@@ -0,0 +1,290 @@
+# app/ranges.py
+"""Compact ID range notation for pasted bay and bin IDs.
+
+`BAY-001-001..BAY-001-400` stands for the 400 IDs in between, `BAY-001-001..BAY-001-399:2`
+for every second one. Both ends must be the same apart from their last run of digits,
+which is zero padded to the width of the first end. A pasted list is kept as an IdList of
+plain IDs and IdRange objects and only expanded when the generators iterate it.
+"""
+import bisect
+import re
+from collections import Counter
+from math import gcd
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+_RANGE_RE = re.compile(r"^(?P<first>.+?)\.\.(?P<last>.+?)(?::(?P<step>\d+))?$")
+_NUMBERED_RE = re.compile(r"^(?P<prefix>.*?)(?P<digits>\d+)(?P<suffix>\D*)$")
+# spaces around ".." would otherwise split a range into three tokens
+_RANGE_SPACING_RE = re.compile(r"\s*\.\.\s*")
+
+BAY_SEPARATORS = re.compile(r"[\t,; \u00A0]+")
+BIN_SEPARATORS = re.compile(r"[\t\s]+")
+
+
+class IdRange(Sequence):
+    """The IDs prefix + number (zero padded to `width`) + suffix for number in start..stop by step."""
+
+    __slots__ = ("prefix", "suffix", "width", "start", "stop", "step")
+
+    def __init__(self, prefix: str, start: int, stop: int, step: int = 1, width: int = 1, suffix: str = ""):
+        if step < 1:
+            raise ValueError("Range step must be at least 1.")
+        if stop < start:
+            raise ValueError("Range end is before its start.")
+        self.prefix, self.suffix, self.width = prefix, suffix, width
+        self.start, self.step = start, step
+        # normalise so that `stop` is the last ID actually in the range
+        self.stop = start + (stop - start) // step * step
+
+    @classmethod
+    def parse(cls, text: str) -> "IdRange":
+        """Parse `FIRST..LAST` or `FIRST..LAST:STEP`. Raises ValueError when the ends do not form a range."""
+        match = _RANGE_RE.match(text.strip())
+        if not match:
+            raise ValueError(f"'{text}' is not a range (FIRST..LAST or FIRST..LAST:STEP).")
+        first, last = _NUMBERED_RE.match(match.group("first")), _NUMBERED_RE.match(match.group("last"))
+        if not first or not last:
+            raise ValueError(f"Range '{text}' must end both IDs with a number.")
+        if (first.group("prefix").upper(), first.group("suffix").upper()) != (last.group("prefix").upper(), last.group("suffix").upper()):
+            raise ValueError(f"Range '{text}' ends differ in more than their last number.")
+        step = int(match.group("step") or 1)
+        return cls(first.group("prefix"), int(first.group("digits")), int(last.group("digits")), step,
+                   len(first.group("digits")), first.group("suffix"))
+
+    def format(self, number: int) -> str:
+        return f"{self.prefix}{str(number).zfill(self.width)}{self.suffix}"
+
+    def __len__(self) -> int:
+        return (self.stop - self.start) // self.step + 1
+
+    def __getitem__(self, index: int) -> str:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("IdRange index out of range")
+        return self.format(self.start + index * self.step)
+
+    def __iter__(self) -> Iterator[str]:
+        for number in range(self.start, self.stop + 1, self.step):
+            yield self.format(number)
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        match = _NUMBERED_RE.match(item)
+        if not match or (match.group("prefix"), match.group("suffix")) != (self.prefix, self.suffix):
+            return False
+        number = int(match.group("digits"))
+        return (self.start <= number <= self.stop and (number - self.start) % self.step == 0
+                and self.format(number) == item)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IdRange) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> Tuple:
+        return (self.prefix, self.suffix, self.width, self.start, self.stop, self.step)
+
+    def __reduce__(self):
+        return (IdRange, (self.prefix, self.start, self.stop, self.step, self.width, self.suffix))
+
+    def __str__(self) -> str:
+        text = f"{self[0]}..{self[-1]}"
+        return f"{text}:{self.step}" if self.step > 1 else text
+
+    def __repr__(self) -> str:
+        return f"IdRange('{self}')"
+
+
+class IdList(Sequence):
+    """A pasted ID list: plain IDs and IdRanges, expanded one ID at a time when iterated."""
+
+    def __init__(self, items: Sequence[Union[str, IdRange]] = ()):
+        self.items = list(items)
+        self._offsets = []
+        total = 0
+        for item in self.items:
+            self._offsets.append(total)
+            total += len(item) if isinstance(item, IdRange) else 1
+        self._len = total
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: int) -> str:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("IdList index out of range")
+        pos = bisect.bisect_right(self._offsets, index) - 1
+        item = self.items[pos]
+        return item[index - self._offsets[pos]] if isinstance(item, IdRange) else item
+
+    def __iter__(self) -> Iterator[str]:
+        for item in self.items:
+            if isinstance(item, IdRange):
+                yield from item
+            else:
+                yield item
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IdList):
+            return self.items == other.items or list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __reduce__(self):
+        return (IdList, (self.items,))
+
+    def __str__(self) -> str:
+        return "\n".join(str(item) for item in self.items)
+
+    def __repr__(self) -> str:
+        return f"IdList({self.items!r})"
+
+
+def parse_id_list(text: str, separators: "re.Pattern" = BAY_SEPARATORS, errors: Optional[List[str]] = None) -> IdList:
+    """
+    Split pasted text into IDs and ranges. A token containing '..' is a range; invalid ranges
+    are reported in `errors` (when given) and skipped.
+    """
+    items: List[Union[str, IdRange]] = []
+    for line in text.splitlines():
+        line = _RANGE_SPACING_RE.sub("..", line.strip())
+        for part in separators.split(line):
+            part = part.strip()
+            if not part:
+                continue
+            if ".." in part:
+                try:
+                    items.append(IdRange.parse(part))
+                except ValueError as e:
+                    if errors is not None:
+                        errors.append(f"⚠️ {e}")
+                continue
+            items.append(part)
+    return IdList(items)
+
+
+def id_segments(ids: Sequence[str]) -> Iterator[Union[str, IdRange]]:
+    """The plain IDs and ranges of an IdList without expanding them (any other sequence: its IDs)."""
+    return iter(ids.items) if isinstance(ids, IdList) else iter(ids)
+
+
+# --- duplicate detection on ranges ---
+
+def _progressions(item: Union[str, IdRange]) -> Iterator[Tuple[Tuple[str, str, int], int, int, int]]:
+    """
+    (key, first, last, step) arithmetic progressions covering an ID or range, compared as stripped
+    upper-case strings. Numbers that outgrow the padding width get their own progression, so an
+    equal key and number always mean an equal ID.
+    """
+    if isinstance(item, IdRange):
+        prefix, suffix = item.prefix.strip().upper(), item.suffix.strip().upper()
+        lo = item.start
+        while lo <= item.stop:
+            digits = max(item.width, len(str(lo)))
+            hi = min(item.stop, 10 ** digits - 1)
+            hi = lo + (hi - lo) // item.step * item.step
+            # a single number has step 1 whatever the range's, so it meets the equal plain ID
+            yield (prefix, suffix, digits), lo, hi, item.step if hi > lo else 1
+            lo = hi + item.step
+        return
+    text = item.strip().upper()
+    match = _NUMBERED_RE.match(text)
+    if match:
+        number = int(match.group("digits"))
+        yield (match.group("prefix"), match.group("suffix"), len(match.group("digits"))), number, number, 1
+    else:
+        yield (text, "", -1), 0, 0, 1
+
+
+def _intersect(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> Optional[Tuple[int, int, int]]:
+    """Numbers common to two progressions (first, last, step), as a progression, or None."""
+    (a_lo, a_hi, a_step), (b_lo, b_hi, b_step) = a, b
+    lo, hi = max(a_lo, b_lo), min(a_hi, b_hi)
+    g = gcd(a_step, b_step)
+    if lo > hi or (b_lo - a_lo) % g:
+        return None
+    # smallest n >= a_lo with n = a_lo (mod a_step) and n = b_lo (mod b_step)
+    m = b_step // g
+    n = a_lo + a_step * ((b_lo - a_lo) // g * pow(a_step // g, -1, m) % m if m > 1 else 0)
+    step = a_step * m
+    if n < lo:
+        n += (lo - n + step - 1) // step * step
+    return (n, n + (hi - n) // step * step, step) if n <= hi else None
+
+
+def find_duplicate_ids(groups: List[Sequence[str]]) -> List[Tuple[str, int, List[int], List[int]]]:
+    """
+    Duplicated IDs within and across ID lists, found on the ranges without expanding them.
+
+    Returns (ids, count, groups, repeated_in) in the order the duplicates appear: `ids` is one ID
+    or a compact range, `count` the number of IDs it covers, `groups` the indexes of the lists
+    holding them (first-seen order) and `repeated_in` the lists holding them more than once.
+    Equal IDs and equal ranges are merged in a dict first; the distinct entries are then sorted
+    per ID family and swept, with only ranges kept open, so only an ID or range overlapping an
+    open range is intersected with it.
+    """
+    # (key, first, last, step) -> [(order, group index), ...] in the order they were pasted
+    occurrences: Dict[Tuple[Tuple[str, str, int], int, int, int], List[Tuple[int, int]]] = {}
+    order = 0
+    for group_index, ids in enumerate(groups):
+        for item in id_segments(ids):
+            if isinstance(item, str) and not item.strip():
+                continue
+            for progression in _progressions(item):
+                occurrences.setdefault(progression, []).append((order, group_index))
+                order += 1
+
+    found: Dict[Tuple, List] = {}
+
+    def record(common: Tuple, first_seen: int, seen: List[Tuple[int, int]], repeated: Iterator[int]) -> None:
+        entry = found.setdefault(common, [first_seen, {}, set()])
+        entry[0] = min(entry[0], first_seen)
+        for o, g in seen:
+            entry[1].setdefault(o, g)
+        entry[2].update(repeated)
+
+    families: Dict[Tuple[str, str, int], List[Tuple[int, int, int, List[Tuple[int, int]]]]] = {}
+    for (key, lo, hi, step), seen in occurrences.items():
+        if len(seen) > 1:
+            counts = Counter(g for _, g in seen)
+            record((key, lo, hi, step), seen[1][0], seen, (g for g, n in counts.items() if n > 1))
+        families.setdefault(key, []).append((lo, hi, step, seen))
+
+    for key, items in families.items():
+        if len(items) < 2:
+            continue
+        # ranges before single IDs with the same first number, so an open range meets them all
+        items.sort(key=lambda e: (e[0], e[0] == e[1]))
+        active: List[Tuple[int, int, int, List[Tuple[int, int]]]] = []
+        for entry in items:
+            active = [other for other in active if other[1] >= entry[0]]
+            for other in active:
+                common = _intersect(other[:3], entry[:3])
+                if common is None:
+                    continue
+                in_other, in_entry = {g for _, g in other[3]}, {g for _, g in entry[3]}
+                record((key,) + common, max(other[3][0][0], entry[3][0][0]), other[3] + entry[3], in_other & in_entry)
+            if entry[0] < entry[1]:
+                active.append(entry)
+
+    duplicates = []
+    for (key, lo, hi, step), (_, seen, repeated) in sorted(found.items(), key=lambda kv: kv[1][0]):
+        prefix, suffix, width = key
+        if width < 0:
+            ids, count = prefix, 1
+        else:
+            span = IdRange(prefix, lo, hi, step, width, suffix)
+            ids, count = (str(span) if len(span) > 1 else span[0]), len(span)
+        group_indexes = list(dict.fromkeys(seen[o] for o in sorted(seen)))
+        duplicates.append((ids, count, group_indexes, [g for g in group_indexes if g in repeated]))
+    return duplicates
@@ -0,0 +1,178 @@
+# app/spool.py
+"""Export storage: finished files are spooled to a temporary directory instead of held in memory.
+
+A SpooledFile is a handle to one file on disk. Calling it reads the file, so it can be given to
+st.download_button as deferred data: Streamlit only reads it when the user clicks, rather than
+keeping a copy per session in its media file manager. Files older than the TTL are deleted the
+next time the store is used; the directory is removed at interpreter exit. On Streamlit
+versions without deferred downloads the file is read when the button is drawn instead.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
+
+DEFAULT_TTL = 3600
+
+
+def _deferred_downloads() -> bool:
+    """Whether this Streamlit's download_button accepts a callable (read on click) as data."""
+    try:
+        from streamlit.elements.widgets import button
+    except ImportError:
+        return False
+    return "Callable" in str(getattr(button, "DownloadButtonDataType", ""))
+
+
+DEFERRED_DOWNLOADS = _deferred_downloads()
+
+
+class SpoolExpired(FileNotFoundError):
+    """The spooled file was cleaned up; the export has to be generated again."""
+
+
+class SpooledFile:
+    def __init__(self, file_id: str, path: str, file_name: str, mime: str, size: int):
+        self.id = file_id
+        self.path = path
+        self.file_name = file_name
+        self.mime = mime
+        self.size = size
+        self.created = time.time()
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def open(self) -> BinaryIO:
+        try:
+            return open(self.path, "rb")
+        except FileNotFoundError:
+            raise SpoolExpired(f"'{self.file_name}' has expired; generate it again.")
+
+    def read(self) -> bytes:
+        with self.open() as f:
+            return f.read()
+
+    def __call__(self) -> bytes:
+        return self.read()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"SpooledFile({self.file_name!r}, {self.size:,} bytes)"
+
+
+class SpoolStore:
+    """Temporary files named by id under one directory, deleted `ttl` seconds after they were written."""
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.directory = directory or tempfile.mkdtemp(prefix="bin-label-spool-")
+        os.makedirs(self.directory, exist_ok=True)
+        self.ttl = ttl
+        self._files: Dict[str, SpooledFile] = {}
+        self._lock = threading.Lock()
+
+    def _new(self, file_name: str, mime: str) -> SpooledFile:
+        file_id = uuid.uuid4().hex
+        path = os.path.join(self.directory, file_id + os.path.splitext(file_name)[1])
+        return SpooledFile(file_id, path, file_name, mime, 0)
+
+    def _register(self, spooled: SpooledFile) -> SpooledFile:
+        spooled.size = os.path.getsize(spooled.path)
+        with self._lock:
+            self._files[spooled.id] = spooled
+        return spooled
+
+    def put(self, data: bytes, file_name: str, mime: str) -> SpooledFile:
+        """Write `data` to a new spool file; the caller can drop its copy afterwards."""
+        self.prune()
+        spooled = self._new(file_name, mime)
+        with open(spooled.path, "wb") as f:
+            f.write(data)
+        return self._register(spooled)
+
+    def write(self, writer: Callable[[BinaryIO], None], file_name: str, mime: str) -> SpooledFile:
+        """Let `writer` stream straight into a new spool file (e.g. a ZIP sink), without a bytes copy."""
+        self.prune()
+        spooled = self._new(file_name, mime)
+        try:
+            with open(spooled.path, "w+b") as f:
+                writer(f)
+        except BaseException:
+            if os.path.exists(spooled.path):
+                os.remove(spooled.path)
+            raise
+        return self._register(spooled)
+
+    def get(self, file_id: str) -> Optional[SpooledFile]:
+        with self._lock:
+            return self._files.get(file_id)
+
+    def files(self) -> List[SpooledFile]:
+        with self._lock:
+            return list(self._files.values())
+
+    def disk_usage(self) -> int:
+        return sum(f.size for f in self.files() if f.exists)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete spool files older than the TTL, including strays no handle refers to; returns how many."""
+        cutoff = (now or time.time()) - self.ttl
+        with self._lock:
+            for spooled in [f for f in self._files.values() if f.created < cutoff]:
+                del self._files[spooled.id]
+            live = {f.path for f in self._files.values()}
+        removed = 0
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.path not in live and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def start_janitor(self, interval: Optional[float] = None) -> threading.Thread:
+        """Prune every `interval` seconds (default a quarter of the TTL) on a daemon thread."""
+        interval = interval or max(self.ttl / 4, 1.0)
+
+        def run():
+            while os.path.isdir(self.directory):
+                time.sleep(interval)
+                self.prune()
+
+        thread = threading.Thread(target=run, name="spool-janitor", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        with self._lock:
+            self._files.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def spool_data(store: Optional[SpoolStore], data: Optional[bytes], file_name: str, mime: str) -> Union[bytes, SpooledFile, None]:
+    """`data` moved to the store when one is given (and there is data), else unchanged."""
+    if store is None or data is None:
+        return data
+    return store.put(data, file_name, mime)
+
+
+_store: Optional[SpoolStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SpoolStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SpoolStore()
+            _store.start_janitor()
+            atexit.register(_store.close)
+        return _store
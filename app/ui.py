@@ -1,14 +1,19 @@
 # app/ui.py
+import re
 from typing import List, Dict
 import streamlit as st
 import pandas as pd
 
 from app.logic import (
-    generate_bin_labels_table_cached,
+    generate_label_table_cached,
     check_duplicate_bay_ids,
-    plot_bin_diagram,
 )
 from app.excel import build_excel_bytes
+from app.overview import SiteOverview, render_site_overview
+from app.preview import PreviewTable, render_preview
+from app.ranges import parse_id_list
+
+_COMMA = re.compile(r",")
 
 def run_app():
     st.title("Bin Label Generator — Refactored")
@@ -41,18 +46,21 @@ def run_app():
             )
 
     # parse groups
+    range_errors = []
+
     def parse_groups_text(raw: str):
         groups = []
         for block in raw.split("\n\n"):
             block = block.strip()
             if not block:
                 continue
-            # allow commas or newlines inside block
-            items = [x.strip() for part in block.splitlines() for x in part.split(",") if x.strip()]
-            groups.append(items)
+            # allow commas or newlines inside block, and ranges such as BAY-001-001..BAY-001-040
+            groups.append(parse_id_list(block, _COMMA, range_errors))
         return groups
 
     groups = parse_groups_text(raw_groups)
+    for error in range_errors:
+        st.warning(error)
     shelves = [s.strip() for s in shelves_input.split(",") if s.strip()]
 
     # Show parsed preview
@@ -71,18 +79,16 @@ def run_app():
     if submitted:
         try:
             # heavy computation (cached)
-            df = generate_bin_labels_table_cached(groups=groups, shelves=shelves, bins_per_shelf=int(bins_per_shelf))
-            st.success(f"Generated {len(df)} label rows.")
+            table = generate_label_table_cached(groups=groups, shelves=shelves, bins_per_shelf=int(bins_per_shelf))
+            st.success(f"Generated {len(table)} label rows.")
 
-            st.dataframe(df.head(200), use_container_width=True)
+            render_preview(PreviewTable.from_label_table(table), key="labels_preview")
 
-            # Plot diagram for first group as example
-            if len(groups) >= 1 and groups[0]:
-                fig = plot_bin_diagram(groups[0], shelves=shelves, bins_per_shelf=int(bins_per_shelf))
-                st.plotly_chart(fig, use_container_width=True)
+            # every group in one diagram, aggregated when the site is too large to draw bin by bin
+            render_site_overview(SiteOverview([table]), key="labels_overview")
 
             # Excel download
-            excel_bytes = build_excel_bytes(df)
+            excel_bytes = build_excel_bytes(table.to_long())
             st.download_button("Download Excel", data=excel_bytes, file_name="bin_labels.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
         except Exception as e:
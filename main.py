@@ -1,798 +1,655 @@
-import streamlit as st
-import pandas as pd
-import io
-import plotly.graph_objects as go
-import seaborn as sns
-import string
-import re
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Alignment, Font, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.utils import get_column_letter
-
-# Add "Created By Alimomet" in top left
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@700&display=swap');
-    .created-by {
-        position: absolute;
-        top: 10px;
-        left: 20px;
-        font-family: 'Roboto', Arial, Helvetica, sans-serif;
-        font-size: 14px;
-        font-weight: bold;
-        color: #333333;
-        z-index: 1000;
-    }
-    </style>
-    <div class="created-by">Created By Alimomet</div>
-""", unsafe_allow_html=True)
-
-def generate_bin_labels_table(group_name, bay_ids, shelves, bins_per_shelf):
-    data = []
-    for bay in bay_ids:
-        try:
-            bay = bay.strip()  # remove accidental whitespace
-            base_label = bay.replace("BAY-", "")
-            base_number = int(base_label[-3:])
-            aisle_match = re.search(r'\d{3}', base_label)
-            aisle = aisle_match.group(0) if aisle_match else ""
-
-            max_bins = max(bins_per_shelf.get(shelf, 0) for shelf in shelves) if shelves else 1
-
-            for i in range(max_bins):
-                row = {
-                    'BAY TYPE': group_name,
-                    'AISLE': aisle,
-                    'BAY ID': bay
-                }
-                for shelf in shelves:
-                    shelf_bin_count = bins_per_shelf.get(shelf, 0)
-                    if i < shelf_bin_count:
-                        bin_label = base_label[:-4] + shelf + f"{base_number + i:03d}"
-                        row[shelf] = bin_label
-                    else:
-                        row[shelf] = None
-                data.append(row)
-        except Exception as e:
-            st.error(f"Error processing bay ID '{bay}': {str(e)}")
-    return pd.DataFrame(data)
-
-def plot_bin_diagram(bay_id, shelves, bins_per_shelf, base_number):
-    try:
-        fig = go.Figure()
-        colors = sns.color_palette("colorblind", len(shelves) if shelves else 1).as_hex()
-        shelf_colors = {shelf: colors[i % len(colors)] for i, shelf in enumerate(shelves)} if shelves else {}
-
-        for col_idx, shelf in enumerate(shelves):
-            shelf_bins = bins_per_shelf.get(shelf, 0)
-            for i in range(shelf_bins):
-                bin_label = bay_id.replace("BAY-", "")[:-4] + shelf + f"{base_number + i:03d}"
-                x0, x1 = col_idx - 0.4, col_idx + 0.4
-                y0, y1 = -i - 0.4, -i + 0.4
-                fig.add_shape(
-                    type="rect",
-                    x0=x0,
-                    x1=x1,
-                    y0=y0,
-                    y1=y1,
-                    fillcolor=shelf_colors.get(shelf, "lightblue"),
-                    line=dict(color="black"),
-                    # note: Plotly rect shapes don't support a `label` param in older versions,
-                    # we keep the text as a separate trace below.
-                )
-                fig.add_trace(
-                    go.Scatter(
-                        x=[(x0 + x1) / 2],
-                        y=[(y0 + y1) / 2],
-                        text=[bin_label],
-                        mode="text",
-                        hoverinfo="text",
-                        showlegend=False,
-                    )
-                )
-
-        fig.update_layout(
-            title=f"Bin Layout for {bay_id}",
-            xaxis=dict(
-                tickmode="array",
-                tickvals=list(range(len(shelves))) if shelves else [0],
-                ticktext=shelves if shelves else ["No Shelves"],
-                showgrid=False,
-                zeroline=False,
-            ),
-            yaxis=dict(
-                showgrid=False,
-                zeroline=False,
-                autorange="reversed",
-            ),
-            showlegend=bool(shelves),
-            legend_title_text="Shelves",
-            width=200 * (len(shelves) if shelves else 1),
-            height=100 * (max(bins_per_shelf.values(), default=1) if bins_per_shelf else 1),
-            margin=dict(l=20, r=20, t=50, b=20),
-        )
-
-        for shelf in shelves:
-            fig.add_trace(
-                go.Scatter(
-                    x=[None],
-                    y=[None],
-                    mode="markers",
-                    name=shelf,
-                    marker=dict(size=10, color=shelf_colors.get(shelf, "lightblue")),
-                )
-            )
-
-        return fig
-    except Exception as e:
-        st.error(f"Error generating diagram for '{bay_id}': {str(e)}")
-        return None
-
-def style_excel(writer, sheet_name, df, shelves):
-    try:
-        ws = writer.sheets[sheet_name]
-        yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin'))
-        bold_font = Font(bold=True)
-        center_align = Alignment(horizontal="center", vertical="center")
-
-        hex_colors = [
-            "339900", "9B30FF", "FFFF00", "00FFFF", "CC0000", "F88017",
-            "FF00FF", "996600", "00FF00", "FF6565", "9999FE"
-        ]
-        
-        styling_colors = ["FFFFFF"] + hex_colors
-
-        if shelves:
-            ws.merge_cells('A1:C1')
-            ws['A1'] = "HEX COLOR CODES ->"
-            ws['A1'].fill = yellow_fill
-            ws['A1'].font = bold_font
-            ws['A1'].alignment = center_align
-            ws['A1'].border = border
-            
-            for i, hex_color in enumerate(styling_colors[:len(shelves)]):
-                col_letter = get_column_letter(4 + i)
-                ws[f"{col_letter}1"] = hex_color
-                ws[f"{col_letter}1"].fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-                ws[f"{col_letter}1"].font = bold_font
-                ws[f"{col_letter}1"].alignment = center_align
-                ws[f"{col_letter}1"].border = border
-
-                ws[f"{col_letter}2"] = shelves[i]
-                ws[f"{col_letter}2"].fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-                ws[f"{col_letter}2"].font = bold_font
-                ws[f"{col_letter}2"].alignment = center_align
-                ws[f"{col_letter}2"].border = border
-
-        header_row = 2 if shelves else 1
-        for col in range(1, df.shape[1] + 1):
-            cell = ws.cell(row=header_row, column=col)
-            cell.font = bold_font
-            cell.alignment = center_align
-            cell.border = border
-
-        for row in ws.iter_rows(min_row=header_row + 1, max_row=ws.max_row, max_col=ws.max_column):
-            for cell in row:
-                if cell.value is not None:
-                    cell.font = bold_font
-                    cell.alignment = center_align
-                    cell.border = border
-    except Exception as e:
-        st.error(f"Error styling Excel sheet '{sheet_name}': {str(e)}")
-
-def check_duplicate_bay_ids(bay_groups):
-    errors = []
-    all_bay_ids = {}
-
-    for group_idx, group in enumerate(bay_groups):
-        group_name = group["name"]
-        bay_ids = [bay_id.strip().upper() for bay_id in group["bays"] if bay_id.strip()]
-
-        seen_in_group = set()
-        for bay_id in bay_ids:
-            if bay_id in seen_in_group:
-                errors.append(f"⚠️ Duplicate bay ID '{bay_id}' found in {group_name}.")
-            seen_in_group.add(bay_id)
-
-            if bay_id not in all_bay_ids:
-                all_bay_ids[bay_id] = [group_name]
-            elif group_name not in all_bay_ids[bay_id]:
-                all_bay_ids[bay_id].append(group_name)
-
-    for bay_id, groups in all_bay_ids.items():
-        if len(groups) > 1:
-            errors.append(f"⚠️ Bay ID '{bay_id}' is duplicated across groups: {', '.join(groups)}.")
-
-    return errors
-
-def check_duplicate_bin_ids(bay_groups):
-    errors = []
-    all_bin_ids = {}
-
-    for group_idx, group in enumerate(bay_groups):
-        group_name = group["name"]
-        bin_ids = [bin_id.strip().upper() for bin_id in group["bin_ids"] if bin_id.strip()]
-
-        seen_in_group = set()
-        for bin_id in bin_ids:
-            if bin_id in seen_in_group:
-                errors.append(f"⚠️ Duplicate bin ID '{bin_id}' found in {group_name}.")
-            seen_in_group.add(bin_id)
-
-            if bin_id not in all_bin_ids:
-                all_bin_ids[bin_id] = [group_name]
-            elif group_name not in all_bin_ids[bin_id]:
-                all_bin_ids[bin_id].append(group_name)
-
-    for bin_id, groups in all_bin_ids.items():
-        if len(groups) > 1:
-            errors.append(f"⚠️ Bin ID '{bin_id}' is duplicated across groups: {', '.join(groups)}.")
-
-    return errors
-
-def parse_bay_definition(bay_definition):
-    try:
-        if not bay_definition:
-            raise ValueError("Bay Definition cannot be empty.")
-        return {"bay_definition": bay_definition}
-    except Exception as e:
-        return {"error": str(e)}
-
-def check_duplicate_aisles(mod_groups):
-    errors = []
-    all_aisles = {}
-    for group_idx, group in enumerate(mod_groups):
-        mod = group["mod"]
-        aisles = list(range(group["aisle_start"], group["aisle_end"] + 1))
-        for aisle in aisles:
-            aisle_key = f"{mod}-{aisle}"
-            if aisle_key in all_aisles:
-                errors.append(f"⚠️ Aisle {aisle} in module {mod} is duplicated in module {all_aisles[aisle_key]}.")
-            else:
-                all_aisles[aisle_key] = mod
-    return errors
-
-# --- Streamlit App ---
-st.title("Space Launch Quick Tools")
-st.markdown("A collection of tools for space launch operations.")
-
-# Create tabs
-tab1, tab2, tab3 = st.tabs(["Bin Label Generator", "Bin Bay Mapping", "EOA Generator"])
-
-with tab1:
-    st.header("Bin Label Generator 🏷️", divider='rainbow')
-    st.markdown("Define bay groups, shelves, and bins per shelf to generate structured bin labels. Bay IDs must be unique (e.g., BAY-001-001-001).")
-
-    bay_groups = []
-    duplicate_errors = []
-    num_groups = st.number_input("How many bay groups do you want to define?", min_value=1, max_value=50, value=1, key="num_groups_bin_label")
-
-    for group_idx in range(num_groups):
-        if f"group_name_{group_idx}" not in st.session_state:
-            st.session_state[f"group_name_{group_idx}"] = f"Bay Group {group_idx + 1}"
-
-        def update_group_name(group_idx=group_idx):
-            st.session_state[f"group_name_{group_idx}"] = st.session_state[f"group_name_input_{group_idx}"]
-
-        header = st.session_state[f"group_name_{group_idx}"].strip() or f"Bay Group {group_idx + 1}"
-
-        with st.expander(header, expanded=True):
-            st.text_input(
-                "Group Name",
-                value=st.session_state[f"group_name_{group_idx}"],
-                key=f"group_name_input_{group_idx}",
-                on_change=update_group_name
-            )
-
-            bays_input = st.text_area(
-                f"Enter bay IDs (you can paste from Excel — multiple columns/rows are accepted)",
-                key=f"bays_{group_idx}",
-                help="You can paste multiple columns/rows copied from Excel. Separators recognized: tabs, spaces, commas, semicolons, or newlines."
-            )
-            shelf_count = st.number_input("How many shelves?", min_value=1, max_value=26, value=3, key=f"shelf_count_{group_idx}")
-            shelves = list(string.ascii_uppercase[:shelf_count])
-            
-            st.divider()
-
-            bins_per_shelf = {}
-            st.markdown("**Bins per Shelf**")
-            for shelf in shelves:
-                count = st.number_input(f"Number of bins in shelf {shelf}", min_value=1, max_value=100, value=5, key=f"bins_{group_idx}_{shelf}")
-                bins_per_shelf[shelf] = count
-
-            # --- UPDATED parsing: accept multi-column Excel paste (tabs/spaces/comma/semicolon)
-            if bays_input:
-                bay_list = []
-                lines = [ln for ln in bays_input.splitlines() if ln.strip()]
-                for line in lines:
-                    # split on tabs, commas, semicolons, or whitespace sequences
-                    parts = re.split(r'[\t,; \u00A0]+', line.strip())
-                    for part in parts:
-                        if part:
-                            bay_list.append(part.strip())
-                if bay_list:
-                    bay_groups.append({
-                        "name": st.session_state[f"group_name_{group_idx}"].strip() or f"Bay Group {group_idx + 1}",
-                        "bays": bay_list,
-                        "shelves": shelves,
-                        "bins_per_shelf": bins_per_shelf
-                    })
-                    temp_errors = check_duplicate_bay_ids(bay_groups)
-                    if temp_errors:
-                        with st.container():
-                            st.markdown("**Errors in this group:**")
-                            for error in temp_errors:
-                                st.warning(error)
-
-    if bay_groups:
-        duplicate_errors = check_duplicate_bay_ids(bay_groups)
-        with st.expander("⚠️ Duplicate Errors", expanded=bool(duplicate_errors)):
-            if duplicate_errors:
-                for error in duplicate_errors:
-                    st.warning(error)
-            else:
-                st.info("No duplicate bay IDs detected.")
-    else:
-        st.warning("⚠️ Please define at least one bay group with valid bay IDs.")
-
-    if st.button("Generate Bin Labels", disabled=bool(duplicate_errors or not bay_groups), key="generate_bin_labels"):
-        with st.spinner("Generating bin labels and diagrams..."):
-            total_labels_generated = 0
-            total_bays_processed = 0
-            output = io.BytesIO()
-            try:
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    for group in bay_groups:
-                        df = generate_bin_labels_table(group["name"], group["bays"], group["shelves"], group["bins_per_shelf"])
-                        if not df.empty:
-                            shelf_cols = [col for col in df.columns if col not in ['BAY TYPE', 'AISLE', 'BAY ID']]
-                            total_labels_generated += df[shelf_cols].count().sum()
-                            total_bays_processed += df['BAY ID'].nunique()
-                            df.to_excel(writer, index=False, startrow=1, sheet_name=group["name"])
-                            style_excel(writer, group["name"], df, group["shelves"])
-                output.seek(0)
-                
-                st.success(f"✅ Success! Generated {total_labels_generated} labels for {total_bays_processed} bays across {len(bay_groups)} groups.")
-                st.download_button(
-                    label="📥 Download Excel File",
-                    data=output,
-                    file_name="bin_labels.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key="download_excel"
-                )
-
-                st.subheader("🖼️ Interactive Bin Layout Diagrams")
-                st.caption("Click on a bay to expand its visual layout.")
-                for group in bay_groups:
-                    for bay_id in group['bays']:
-                        shelves = group['shelves']
-                        bins_per_shelf = group['bins_per_shelf']
-                        try:
-                            with st.expander(f"View Diagram for **{bay_id}**"):
-                                base_label = bay_id.replace("BAY-", "")
-                                base_number = int(base_label[-3:])
-                                fig = plot_bin_diagram(bay_id, shelves, bins_per_shelf, base_number)
-                                if fig:
-                                    st.plotly_chart(fig, use_container_width=True)
-                        except Exception as e:
-                            st.error(f"Error processing diagram for bay ID '{bay_id}': {str(e)}")
-            except Exception as e:
-                st.error(f"Error generating output: {str(e)}")
-
-with tab2:
-    st.header("Bin Bay Mapping ↔️", divider='rainbow')
-    st.markdown("Define bay definition groups and map bin IDs to bay types.")
-
-    bay_types = [
-        "Bulk Stock", "Case Flow", "Drawer", "Flat Apparel", "Hanger Rod", "Hangers",
-        "Jewelry", "Library", "Library Deep", "Pallet", "Shoes", "Random Other Bin",
-        "PassThrough"
-    ]
-
-    bay_usage_options = [
-        "*", "45F Produce", "Aerosol", "Ambient", "Apparel", "BATTERIES", "BWS",
-        "BWS_HIGH_FLAMMABLE", "BWS_LOW_FLAMMABLE", "BWS_MEDIUM_FLAMMABLE", "Book",
-        "Chilled", "Chilled-FMP", "Corrosive", "Damage", "Damage Human Food",
-        "Damage Pet Food", "Damage_HRV", "Damaged Aerosol", "Damaged Corrosive",
-        "Damaged Flammable", "Damaged Flammable Aerosols", "Damaged Misc Health Hazard",
-        "Damaged Non Flammable Aerosols", "Damaged Oxidizer", "Damaged Restricted Hazmat",
-        "Damaged Toxic", "Dry Produce", "FMP", "Flammable", "Flammable Aerosols",
-        "Flammables_HRV", "Frozen", "HRV", "Hazmat", "Hazmat_HRV", "Meat-Beef",
-        "Meat-Deli", "Meat-Pork", "Meat-Poultry", "Meat-Seafood", "Misc Health Hazard",
-        "Non Flammable Aerosols", "Non Inventory Storage-Facilities",
-        "Non Inventory Storage-Other", "Non Inventory Storage-Stores",
-        "Non Inventory-Black Totes", "Non Sort-Team Lift", "Non-Storage",
-        "Non-TC Food", "Oxidizer", "Pet Food", "Produce", "Produce Backstock",
-        "Produce Wetracks", "Reserve-Ambient", "Restricted Hazmat", "Semi-Chilled",
-        "Shoes", "TC-Food", "Toxic", "Tropical"
-    ]
-
-    num_groups = st.number_input("How many bay definition groups do you want to define?", min_value=1, max_value=50, value=1, key="num_groups_bin_mapping")
-
-    bay_groups = []
-    for group_idx in range(num_groups):
-        if f"bin_group_name_{group_idx}" not in st.session_state:
-            st.session_state[f"bin_group_name_{group_idx}"] = f"Bay Definition Group {group_idx + 1}"
-
-        def update_bin_group_name(group_idx=group_idx):
-            st.session_state[f"bin_group_name_{group_idx}"] = st.session_state[f"bin_group_name_input_{group_idx}"]
-
-        header = st.session_state[f"bin_group_name_{group_idx}"].strip() or f"Bay Definition Group {group_idx + 1}"
-
-        with st.expander(header, expanded=True):
-            st.text_input(
-                "Group Name",
-                value=st.session_state[f"bin_group_name_{group_idx}"],
-                key=f"bin_group_name_input_{group_idx}",
-                on_change=update_bin_group_name
-            )
-
-            bin_ids_input = st.text_area(
-                f"Enter bin IDs (e.g., P-1-B217A262)",
-                key=f"bin_ids_{group_idx}",
-                help="Paste Bin IDs from Excel (tab-separated, space-separated, or one per line)."
-            )
-
-            bay_definition = st.text_input(
-                "Enter Bay Definition",
-                max_chars=48,
-                key=f"bay_definition_{group_idx}"
-            )
-            
-            st.divider()
-            st.markdown("**Default Dimensions for the Group**")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                height_cm = st.number_input("Height (CM)", min_value=0.0, value=0.0, key=f"height_cm_{group_idx}")
-            with col2:
-                width_cm = st.number_input("Width (CM)", min_value=0.0, value=0.0, key=f"width_cm_{group_idx}")
-            with col3:
-                depth_cm = st.number_input("Depth (CM)", min_value=0.0, value=0.0, key=f"depth_cm_{group_idx}")
-            
-            st.divider()
-            outlier_shelves_input = st.text_input(
-                "Outlier Shelves (optional, comma-separated, e.g., C,D)",
-                key=f"outlier_shelves_{group_idx}",
-                help="Define shelves with different dimensions from the default."
-            )
-            st.caption("The app identifies a shelf by finding a capital letter followed by numbers at the end of the Bin ID (e.g., the 'C' in '...A208C120').")
-            
-            outlier_shelves = [s.strip().upper() for s in outlier_shelves_input.split(',') if s.strip()]
-
-            outlier_dimensions = {}
-            if outlier_shelves:
-                for shelf in outlier_shelves:
-                    st.markdown(f"**Dimensions for Outlier Shelf: {shelf}**")
-                    o_col1, o_col2, o_col3 = st.columns(3)
-                    with o_col1:
-                        o_height = st.number_input(f"Height (CM) for Shelf {shelf}", min_value=0.0, value=0.0, key=f"height_cm_{group_idx}_{shelf}")
-                    with o_col2:
-                        o_width = st.number_input(f"Width (CM) for Shelf {shelf}", min_value=0.0, value=0.0, key=f"width_cm_{group_idx}_{shelf}")
-                    with o_col3:
-                        o_depth = st.number_input(f"Depth (CM) for Shelf {shelf}", min_value=0.0, value=0.0, key=f"depth_cm_{group_idx}_{shelf}")
-                    outlier_dimensions[shelf] = {
-                        "height_cm": o_height,
-                        "width_cm": o_width,
-                        "depth_cm": o_depth,
-                    }
-                st.divider()
-
-            bay_usage = st.selectbox("Select Bay Usage", options=bay_usage_options, index=0, key=f"bay_usage_{group_idx}")
-            bay_type = st.selectbox("Select Bay Type", options=bay_types, index=0, key=f"bay_type_{group_idx}")
-
-            st.markdown("Enter Zone bins are inside followed by depth of bays. ex: Library (30D)")
-            zone = st.text_input("Zone", max_chars=25, key=f"zone_{group_idx}")
-
-            if bin_ids_input:
-                bin_list = [b.strip() for line in bin_ids_input.splitlines() for b in re.split(r'[\t\s]+', line) if b.strip()]
-                if bin_list:
-                    bay_groups.append({
-                        "name": st.session_state[f"bin_group_name_{group_idx}"].strip() or f"Bay Definition Group {group_idx + 1}",
-                        "bin_ids": bin_list,
-                        "bay_definition": bay_definition,
-                        "height_cm": height_cm,
-                        "width_cm": width_cm,
-                        "depth_cm": depth_cm,
-                        "bay_usage": bay_usage,
-                        "bay_type": bay_type,
-                        "zone": zone,
-                        "outlier_dimensions": outlier_dimensions,
-                    })
-                    temp_errors = check_duplicate_bin_ids(bay_groups)
-                    if temp_errors:
-                        with st.container():
-                            st.markdown("**Errors in this group:**")
-                            for error in temp_errors:
-                                st.warning(error)
-
-    if bay_groups:
-        duplicate_errors = check_duplicate_bin_ids(bay_groups)
-        with st.expander("⚠️ Duplicate Errors", expanded=bool(duplicate_errors)):
-            if duplicate_errors:
-                for error in duplicate_errors:
-                    st.warning(error)
-            else:
-                st.info("No duplicate bin IDs detected.")
-    else:
-        st.warning("⚠️ Please define at least one bay definition group with valid bin IDs.")
-
-    if st.button("Generate Excel", disabled=bool(duplicate_errors or not bay_groups), key="generate_bin_mapping_excel"):
-        with st.spinner("Generating Excel file..."):
-            output = io.BytesIO()
-            try:
-                data = []
-                for group in bay_groups:
-                    bay_def = group["bay_definition"]
-                    parsed = parse_bay_definition(bay_def)
-                    if "error" in parsed:
-                        st.error(f"Invalid bay definition in {group['name']}: {parsed['error']}")
-                        break
-
-                    for bin_id in group["bin_ids"]:
-                        current_h = group["height_cm"]
-                        current_w = group["width_cm"]
-                        current_d = group["depth_cm"]
-
-                        match = re.search(r'([A-Z])\d+$', bin_id)
-                        if match:
-                            found_shelf = match.group(1)
-                            if found_shelf in group["outlier_dimensions"]:
-                                outlier_dims = group["outlier_dimensions"][found_shelf]
-                                current_h = outlier_dims["height_cm"]
-                                current_w = outlier_dims["width_cm"]
-                                current_d = outlier_dims["depth_cm"]
-                        
-                        data.append({
-                            "ScannableId": bin_id,
-                            "Distance Index": None,
-                            "Depth": round(current_d , 2) if current_d else None,
-                            "Width": round(current_w , 2) if current_w else None,
-                            "Height": round(current_h , 2) if current_h else None,
-                            "Zone": group["zone"],
-                            "Bay Definition": bay_def,
-                            "bin_size": f"{int(current_d)}Deep" if current_d else "",
-                            "Bay Type": group["bay_type"],
-                            "Bay Usage": group["bay_usage"]
-                        })
-                else:
-                    df = pd.DataFrame(data)
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        df.to_excel(writer, index=False, sheet_name="Bin Bay Mapping")
-                    output.seek(0)
-
-                    st.success(f"✅ Success! Mapped {len(df)} bin IDs across {len(bay_groups)} groups.")
-                    st.download_button(
-                        label="📥 Download Excel File",
-                        data=output,
-                        file_name="bin_bay_mapping.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_bin_mapping_excel"
-                    )
-            except Exception as e:
-                st.error(f"Error generating Excel: {str(e)}")
-
-with tab3:
-    st.header("EOA Generator 🪧", divider='rainbow')
-    
-    st.markdown("**Step 1: Define All Aisles and Their Slot Ranges**")
-    st.caption("Define all modules. For each, set a default slot range and specify any aisles with different slots.")
-    
-    num_mod_defs = st.number_input("How many modules do you want to define?", min_value=1, max_value=20, value=1, key="num_mod_defs")
-    
-    aisle_details = {} 
-    
-    for mod_idx in range(num_mod_defs):
-        if f"eoa_mod_name_{mod_idx}" not in st.session_state:
-            st.session_state[f"eoa_mod_name_{mod_idx}"] = ""
-
-        def update_eoa_mod_name(idx=mod_idx):
-            current_val = st.session_state[f"eoa_mod_name_input_{idx}"]
-            st.session_state[f"eoa_mod_name_{idx}"] = current_val or f"Module Definition {idx + 1}"
-
-        header = st.session_state[f"eoa_mod_name_{mod_idx}"] or f"Module Definition {mod_idx + 1}"
-
-        with st.expander(header, expanded=True):
-            mod_name = st.text_input(
-                "Module Name (e.g., P-1-A)",
-                key=f"eoa_mod_name_input_{mod_idx}",
-                on_change=update_eoa_mod_name,
-            ).strip()
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                aisle_start = st.number_input(f"Start Aisle", min_value=1, value=200, step=1, key=f"aisle_start_{mod_idx}")
-            with col2:
-                aisle_end = st.number_input(f"End Aisle", min_value=aisle_start, value=aisle_start, step=1, key=f"aisle_end_{mod_idx}")
-            
-            st.divider()
-            
-            st.markdown("**Default Slot Range for this Module**")
-            d_col1, d_col2 = st.columns(2)
-            with d_col1:
-                default_start_slot = st.number_input("Default Start Slot", value=1, step=1, key=f"d_slot_start_{mod_idx}")
-            with d_col2:
-                default_end_slot = st.number_input("Default End Slot", value=199, step=1, key=f"d_slot_end_{mod_idx}")
-
-            outlier_aisles_input = st.text_area("Outlier Aisles for Slots (optional, comma-separated)", key=f"outlier_aisles_{mod_idx}")
-            outlier_aisles = {int(a.strip()) for a in outlier_aisles_input.split(',') if a.strip()}
-
-            outlier_slots = {}
-            if outlier_aisles:
-                st.markdown("**Outlier Slot Definitions**")
-                for outlier in sorted(list(outlier_aisles)):
-                    o_col1, o_col2 = st.columns(2)
-                    with o_col1:
-                        outlier_start = st.number_input(f"Start Slot for Aisle {outlier}", value=1, step=1, key=f"o_start_{mod_idx}_{outlier}")
-                    with o_col2:
-                        outlier_end = st.number_input(f"End Slot for Aisle {outlier}", value=199, step=1, key=f"o_end_{mod_idx}_{outlier}")
-                    outlier_slots[outlier] = (outlier_start, outlier_end)
-
-            if mod_name:
-                aisle_details[mod_name] = {}
-                aisles_in_range = list(range(aisle_start, aisle_end + 1))
-                for aisle in aisles_in_range:
-                    if aisle in outlier_slots:
-                        aisle_details[mod_name][aisle] = {"slots": outlier_slots[aisle]}
-                    else:
-                        aisle_details[mod_name][aisle] = {"slots": (default_start_slot, default_end_slot)}
-
-    st.divider()
-    st.markdown("**Step 2: Define Physical Aisle Layouts**")
-    
-    st.markdown("**2a. Standard (Single-Module) Layouts**")
-    st.caption("Describe how aisles within the same module are arranged.")
-    standard_layout_input = st.text_area(
-        "Standard Layouts (one module per line)",
-        height=150,
-        key="eoa_standard_layout_input",
-        placeholder="Example:\nP-1-A: 200, 201/202, 207"
-    )
-
-    st.markdown("**2b. Cross-Module Pairs (Optional)**")
-    st.caption("Define aisle pairs that touch across different modules.")
-    cross_module_layout_input = st.text_area(
-        "Cross-Module Pairs (one pair per line)",
-        height=100,
-        key="eoa_cross_module_layout_input",
-        placeholder="Example:\nP-1-A-201/P-1-B-200"
-    )
-
-    st.divider()
-    st.markdown("**Step 3: Confirm Placement Rule**")
-    if 'eoa_placement_rule' not in st.session_state:
-        st.session_state.eoa_placement_rule = "Odd on Left / Even on Right"
-    
-    st.radio(
-        "Low End Placement Rule (for single-sided signs)",
-        ["Odd on Left / Even on Right", "Even on Left / Odd on Right"],
-        key="eoa_placement_rule",
-        horizontal=True,
-    )
-
-    if st.button("Generate EOA Signage", key="generate_eoa_signage"):
-        signage_data = []
-        errors = []
-        processed_aisles = set()
-
-        with st.spinner("Generating EOA Signage..."):
-            # --- 1. Process Cross-Module Pairs ---
-            cross_module_pairs = [p.strip() for p in cross_module_layout_input.splitlines() if p.strip()]
-            for pair_str in cross_module_pairs:
-                try:
-                    left_full, right_full = pair_str.split('/')
-                    left_mod, left_aisle_str = left_full.rsplit('-', 1)
-                    right_mod, right_aisle_str = right_full.rsplit('-', 1)
-                    left_aisle, right_aisle = int(left_aisle_str), int(right_aisle_str)
-
-                    left_details = aisle_details.get(left_mod, {}).get(left_aisle)
-                    right_details = aisle_details.get(right_mod, {}).get(right_aisle)
-
-                    if not left_details or not right_details:
-                        errors.append(f"Details not found for cross-module pair: {pair_str}")
-                        continue
-                    
-                    signage_data.append({"Left.Mod": left_mod, "Left.Aisle": left_aisle, "Left.Slots": f"{left_details['slots'][0]}-{left_details['slots'][1]}", "Right.Mod": right_mod, "Right.Aisle": right_aisle, "Right.Slots": f"{right_details['slots'][0]}-{right_details['slots'][1]}", "Deployment Location": f"Low End of Aisle {left_aisle}/{right_aisle}"})
-                    signage_data.append({"Left.Mod": right_mod, "Left.Aisle": right_aisle, "Left.Slots": f"{right_details['slots'][1]}-{right_details['slots'][0]}", "Right.Mod": left_mod, "Right.Aisle": left_aisle, "Right.Slots": f"{left_details['slots'][1]}-{left_details['slots'][0]}", "Deployment Location": f"High End of Aisle {left_aisle}/{right_aisle}"})
-                    processed_aisles.add(f"{left_mod}-{left_aisle}")
-                    processed_aisles.add(f"{right_mod}-{right_aisle}")
-                except Exception as e:
-                    errors.append(f"Could not parse cross-module pair '{pair_str}'. Error: {e}")
-
-            # --- 2. Process Standard Layouts ---
-            standard_layout_lines = [line.strip() for line in standard_layout_input.splitlines() if line.strip()]
-            for line in standard_layout_lines:
-                try:
-                    mod_part, aisles_part = line.split(":", 1)
-                    mod_name = mod_part.strip()
-                    aisle_groups = [ag.strip() for ag in aisles_part.split(',') if ag.strip()]
-
-                    for group in aisle_groups:
-                        if "/" in group:
-                            left_aisle_str, right_aisle_str = group.split('/')
-                            left_aisle, right_aisle = int(left_aisle_str), int(right_aisle_str)
-                            if f"{mod_name}-{left_aisle}" in processed_aisles or f"{mod_name}-{right_aisle}" in processed_aisles: continue
-                            left_details = aisle_details.get(mod_name, {}).get(left_aisle)
-                            right_details = aisle_details.get(mod_name, {}).get(right_aisle)
-                            if not left_details or not right_details:
-                                errors.append(f"Details not found for pair {group} in module {mod_name}")
-                                continue
-                            signage_data.append({"Left.Mod": mod_name, "Left.Aisle": left_aisle, "Left.Slots": f"{left_details['slots'][0]}-{left_details['slots'][1]}", "Right.Mod": mod_name, "Right.Aisle": right_aisle, "Right.Slots": f"{right_details['slots'][0]}-{right_details['slots'][1]}", "Deployment Location": f"Low End of Aisle {left_aisle}/{right_aisle}"})
-                            signage_data.append({"Left.Mod": mod_name, "Left.Aisle": right_aisle, "Left.Slots": f"{right_details['slots'][1]}-{right_details['slots'][0]}", "Right.Mod": mod_name, "Right.Aisle": left_aisle, "Right.Slots": f"{left_details['slots'][1]}-{left_details['slots'][0]}", "Deployment Location": f"High End of Aisle {left_aisle}/{right_aisle}"})
-                            processed_aisles.add(f"{mod_name}-{left_aisle}")
-                            processed_aisles.add(f"{mod_name}-{right_aisle}")
-                        else:
-                            aisle = int(group)
-                            if f"{mod_name}-{aisle}" in processed_aisles: continue
-                            details = aisle_details.get(mod_name, {}).get(aisle)
-                            if not details:
-                                errors.append(f"Details not found for single aisle {aisle} in module {mod_name}")
-                                continue
-                            is_even = aisle % 2 == 0
-                            low_end_side = "Right" if (st.session_state.eoa_placement_rule == "Odd on Left / Even on Right" and is_even) or (st.session_state.eoa_placement_rule == "Even on Left / Odd on Right" and not is_even) else "Left"
-                            high_end_side = "Left" if low_end_side == "Right" else "Right"
-                            sign_low = {"Deployment Location": f"Low End of Aisle {aisle}"}
-                            if low_end_side == "Left": sign_low.update({"Left.Mod": mod_name, "Left.Aisle": aisle, "Left.Slots": f"{details['slots'][0]}-{details['slots'][1]}", "Right.Mod": "", "Right.Aisle": "", "Right.Slots": ""})
-                            else: sign_low.update({"Right.Mod": mod_name, "Right.Aisle": aisle, "Right.Slots": f"{details['slots'][0]}-{details['slots'][1]}", "Left.Mod": "", "Left.Aisle": "", "Left.Slots": ""})
-                            signage_data.append(sign_low)
-                            sign_high = {"Deployment Location": f"High End of Aisle {aisle}"}
-                            if high_end_side == "Left": sign_high.update({"Left.Mod": mod_name, "Left.Aisle": aisle, "Left.Slots": f"{details['slots'][1]}-{details['slots'][0]}", "Right.Mod": "", "Right.Aisle": "", "Right.Slots": ""})
-                            else: sign_high.update({"Right.Mod": mod_name, "Right.Aisle": aisle, "Right.Slots": f"{details['slots'][1]}-{details['slots'][0]}", "Left.Mod": "", "Left.Aisle": "", "Left.Slots": ""})
-                            signage_data.append(sign_high)
-                            processed_aisles.add(f"{mod_name}-{aisle}")
-                except Exception as e:
-                    errors.append(f"Could not process layout line: '{line}'. Error: {e}")
-
-        if errors:
-            for error in errors:
-                st.error(error)
-        
-        if signage_data:
-            st.success(f"✅ Success! Generated {len(signage_data)} sign definitions.")
-            st.subheader("Preview Signage Data")
-            df_preview = pd.DataFrame(signage_data)
-            st.dataframe(df_preview, use_container_width=True)
-            
-            output = io.BytesIO()
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "EOA Signage"
-            ws.merge_cells("A1:C1"); ws["A1"] = "Left Side of Sign"
-            ws.merge_cells("E1:G1"); ws["E1"] = "Right Side of Sign"
-            ws["A2"] = "Mod"; ws["B2"] = "Aisle"; ws["C2"] = "Slots"
-            ws["E2"] = "Mod"; ws["F2"] = "Aisle"; ws["G2"] = "Slots"
-            ws["H2"] = "Deployment Location"
-            black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-            white_font = Font(color="FFFFFF", bold=True)
-            center_align = Alignment(horizontal="center", vertical="center")
-            thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-            for row in ws["A1:H2"]:
-                for cell in row:
-                    cell.fill = black_fill
-                    cell.border = thin_border
-                    if cell.value:
-                        cell.font = white_font
-                        cell.alignment = center_align
-            for row_idx, row_data in enumerate(signage_data, start=3):
-                ws[f"A{row_idx}"] = row_data.get("Left.Mod", "")
-                ws[f"B{row_idx}"] = row_data.get("Left.Aisle", "")
-                ws[f"C{row_idx}"] = row_data.get("Left.Slots", "")
-                ws[f"E{row_idx}"] = row_data.get("Right.Mod", "")
-                ws[f"F{row_idx}"] = row_data.get("Right.Aisle", "")
-                ws[f"G{row_idx}"] = row_data.get("Right.Slots", "")
-                ws[f"H{row_idx}"] = row_data.get("Deployment Location", "")
-                for col in "ABCEFGH":
-                    ws[f"{col}{row_idx}"].alignment = center_align
-                    ws[f"{col}{row_idx}"].border = thin_border
-            wb.save(output)
-            output.seek(0)
-            
-            st.download_button(
-                label="📥 Download EOA Signage Excel",
-                data=output,
-                file_name="eoa_signage.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key="download_eoa_excel_new"
-            )
+import streamlit as st
+import plotly.graph_objects as go
+import seaborn as sns
+import string
+
+from app.admin import admin_enabled, render_admin_page
+from app.checks import check_duplicate_bay_ids, check_duplicate_bin_ids, check_duplicate_aisles, check_reserved_group_names
+from app.columnar import read_table, validate_eoa, validate_labels, validate_mapping
+from app.errors import ErrorRecord, render_errors
+from app.eoa import validate_eoa_layout
+from app.exports import EXPORT_FORMATS, LABEL_EXPORT_FORMATS, export_bin_labels, export_bin_mapping, export_eoa_signage
+from app.excel import build_bin_mapping_table
+from app.jobs import CANCELLED, FAILED, get_runner
+from app.labeltable import LabelPlan
+from app.metrics import start_file_dump
+from app.overview import SiteOverview, render_site_overview
+from app.preview import eoa_preview, label_preview, mapping_preview, render_preview
+from app.ranges import BAY_SEPARATORS, BIN_SEPARATORS, parse_id_list
+from app.spool import DEFERRED_DOWNLOADS, SpooledFile, get_store
+
+# Add "Created By Alimomet" in top left
+st.markdown("""
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@700&display=swap');
+    .created-by {
+        position: absolute;
+        top: 10px;
+        left: 20px;
+        font-family: 'Roboto', Arial, Helvetica, sans-serif;
+        font-size: 14px;
+        font-weight: bold;
+        color: #333333;
+        z-index: 1000;
+    }
+    </style>
+    <div class="created-by">Created By Alimomet</div>
+""", unsafe_allow_html=True)
+
+def plot_bin_diagram(bay_id, shelves, bins_per_shelf, base_number):
+    """Per-bay diagram; raises on a bay it cannot draw, the caller reports the error."""
+    fig = go.Figure()
+    colors = sns.color_palette("colorblind", len(shelves) if shelves else 1).as_hex()
+    shelf_colors = {shelf: colors[i % len(colors)] for i, shelf in enumerate(shelves)} if shelves else {}
+
+    for col_idx, shelf in enumerate(shelves):
+        shelf_bins = bins_per_shelf.get(shelf, 0)
+        for i in range(shelf_bins):
+            bin_label = bay_id.replace("BAY-", "")[:-4] + shelf + f"{base_number + i:03d}"
+            x0, x1 = col_idx - 0.4, col_idx + 0.4
+            y0, y1 = -i - 0.4, -i + 0.4
+            fig.add_shape(
+                type="rect",
+                x0=x0,
+                x1=x1,
+                y0=y0,
+                y1=y1,
+                fillcolor=shelf_colors.get(shelf, "lightblue"),
+                line=dict(color="black"),
+                # note: Plotly rect shapes don't support a `label` param in older versions,
+                # we keep the text as a separate trace below.
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=[(x0 + x1) / 2],
+                    y=[(y0 + y1) / 2],
+                    text=[bin_label],
+                    mode="text",
+                    hoverinfo="text",
+                    showlegend=False,
+                )
+            )
+
+    fig.update_layout(
+        title=f"Bin Layout for {bay_id}",
+        xaxis=dict(
+            tickmode="array",
+            tickvals=list(range(len(shelves))) if shelves else [0],
+            ticktext=shelves if shelves else ["No Shelves"],
+            showgrid=False,
+            zeroline=False,
+        ),
+        yaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            autorange="reversed",
+        ),
+        showlegend=bool(shelves),
+        legend_title_text="Shelves",
+        width=200 * (len(shelves) if shelves else 1),
+        height=100 * (max(bins_per_shelf.values(), default=1) if bins_per_shelf else 1),
+        margin=dict(l=20, r=20, t=50, b=20),
+    )
+
+    for shelf in shelves:
+        fig.add_trace(
+            go.Scatter(
+                x=[None],
+                y=[None],
+                mode="markers",
+                name=shelf,
+                marker=dict(size=10, color=shelf_colors.get(shelf, "lightblue")),
+            )
+        )
+
+    return fig
+
+# --- Background export jobs ---
+def start_job(tool, fn, *args):
+    # finished exports go to the spool directory, not into the job result or the session
+    job = get_runner().submit(tool, fn, *args, store=get_store())
+    # the query param lets a reconnecting browser re-attach to the job
+    st.session_state[f"job_{tool}"] = job.id
+    st.query_params[f"job_{tool}"] = job.id
+    return job
+
+def current_job(tool):
+    job_id = st.session_state.get(f"job_{tool}") or st.query_params.get(f"job_{tool}")
+    job = get_runner().get(job_id)
+    if job:
+        st.session_state[f"job_{tool}"] = job.id
+    return job
+
+def job_running(tool):
+    job = current_job(tool)
+    return bool(job and not job.is_finished)
+
+def show_job(tool, label, render_result):
+    job = current_job(tool)
+    if job is None:
+        return
+    if not job.is_finished:
+        st.session_state[f"job_{tool}_polling"] = True
+
+    @st.fragment(run_every=None if job.is_finished else 1.0)
+    def job_panel():
+        if not job.is_finished:
+            st.progress(job.fraction, text=f"{label} ({job.done}/{job.total}) {job.message}")
+            if st.button("✖️ Cancel", key=f"cancel_{tool}"):
+                job.cancel()
+            return
+        if st.session_state.pop(f"job_{tool}_polling", False):
+            # stop the periodic fragment reruns and redraw the whole page with the result
+            st.rerun()
+        if job.status == CANCELLED:
+            st.info(f"{label} was cancelled.")
+        elif job.status == FAILED:
+            st.error(f"Error generating output: {job.error}")
+        else:
+            render_result(job.result)
+
+    job_panel()
+
+def download_result(label, result, key):
+    """Download button for a job result; spooled files are only read when the button is clicked."""
+    data = result["data"]
+    if isinstance(data, SpooledFile):
+        if not data.exists:
+            st.warning("⚠️ This export has expired from temporary storage. Please generate it again.")
+            return
+        if not DEFERRED_DOWNLOADS:
+            data = data.read()
+    st.download_button(label=label, data=data, file_name=result["file_name"], mime=result["mime"], key=key)
+
+def show_preview(result, key, build):
+    """Browse a finished result; the preview index is built once, on first use, and kept with the job result."""
+    if st.toggle("🔎 Browse results", key=f"{key}_toggle"):
+        if "preview" not in result:
+            with st.spinner("Indexing results..."):
+                result["preview"] = build()
+        render_preview(result["preview"], key=key)
+
+def render_bin_labels_result(result):
+    render_errors(result["errors"], "bin_labels_errors", "bay IDs could not be processed")
+    stats = result["stats"]
+    report = result.get("report")
+    if report is not None:
+        st.success(f"✅ Success! Regenerated {stats['regenerated']} groups ({stats['labels']} labels for {stats['bays']} bays), "
+                   f"kept {stats['reused']} unchanged groups.")
+        if report.empty:
+            st.info("No changes since the previous export.")
+        else:
+            st.dataframe(report, use_container_width=True)
+            st.download_button("📥 Download Change Report", data=report.to_csv(index=False).encode("utf-8"),
+                               file_name="bin_labels_changes.csv", mime="text/csv", key="download_change_report")
+    else:
+        st.success(f"✅ Success! Generated {stats['labels']} labels for {stats['bays']} bays across {len(result['groups'])} groups.")
+    if "labels_per_second" in stats:
+        st.caption(f"Rendered {stats['pages']} label pages in {stats['seconds']:.1f}s ({stats['labels_per_second']:,.0f} labels/s).")
+    download_result("📥 Download Bin Labels", result, "download_excel")
+    if result.get("manifest"):
+        st.download_button("📥 Download Manifest", data=result["manifest"], file_name="bin_labels_manifest.json",
+                           mime="application/json", key="download_manifest",
+                           help="Keep this (or the export itself) to regenerate only what changed next time.")
+    show_preview(result, "labels_preview", lambda: label_preview(result["groups"]))
+
+    st.subheader("🗺️ Site Overview")
+    if st.toggle("Show every bay of the site in one diagram", key="labels_overview_toggle"):
+        if "overview" not in result:
+            result["overview"] = SiteOverview.from_groups(result["groups"])
+        render_site_overview(result["overview"], key="labels_overview")
+
+    st.subheader("🖼️ Interactive Bin Layout Diagrams")
+    if st.toggle("Show the layout diagram of a bay", key="labels_diagram_toggle"):
+        render_bay_diagram(result)
+
+def render_bay_diagram(result, picker_limit=1000):
+    """One bay's diagram at a time, so a rerun costs one figure however many bays the export has."""
+    groups = [g for g in result["groups"] if len(g["bays"])]
+    if not groups:
+        return
+    group_index = st.selectbox("Bay group", range(len(groups)), format_func=lambda i: groups[i]["name"], key="labels_diagram_group")
+    group = groups[group_index]
+    bays = group["bays"]
+    if len(bays) <= picker_limit:
+        bay_id = st.selectbox("Bay", bays, key=f"labels_diagram_bay_{group_index}")
+    else:
+        # a picker would send every bay ID of a large group to the browser on each rerun
+        bay_id = st.text_input(f"Bay ID ({len(bays):,} bays in this group)", value=bays[0], key=f"labels_diagram_bay_{group_index}").strip()
+        known = result.setdefault("diagram_bays", {})
+        if group_index not in known:
+            known[group_index] = frozenset(bays)
+        if bay_id not in known[group_index]:
+            st.info(f"Bay '{bay_id}' is not in {group['name']}.")
+            return
+    # figures are kept with the job result, so switching back to a bay does not rebuild it
+    diagrams = result.setdefault("diagrams", {})
+    key = (group_index, bay_id)
+    if key not in diagrams:
+        try:
+            base_label = bay_id.replace("BAY-", "")
+            base_number = int(base_label[-3:])
+            diagrams[key] = plot_bin_diagram(bay_id, group["shelves"], group["bins_per_shelf"], base_number)
+        except Exception as e:
+            # kept like a figure, so a bay that cannot be drawn is not retried on every rerun
+            diagrams[key] = ErrorRecord(group["name"], bay_id, "diagram", str(e))
+    if isinstance(diagrams[key], ErrorRecord):
+        st.warning(f"⚠️ {diagrams[key]}")
+    else:
+        st.plotly_chart(diagrams[key], use_container_width=True)
+
+def render_revalidation(what, key, validate, ok):
+    """Upload a Parquet or Arrow IPC export of one of the tables and check it again."""
+    with st.expander(f"🔁 Re-validate an exported {what} file"):
+        uploaded = st.file_uploader(f"Parquet or Arrow IPC {what} export", type=["parquet", "arrow"], key=f"revalidate_{key}_file")
+        if uploaded is not None:
+            try:
+                imported = read_table(uploaded.getvalue())
+                import_errors = validate(imported)
+                for error in import_errors:
+                    st.warning(error)
+                if not import_errors:
+                    st.success(f"✅ {len(imported)} {ok}.")
+            except Exception as e:
+                st.error(f"Could not read '{uploaded.name}': {str(e)}")
+
+def render_bin_mapping_result(result):
+    st.success(f"✅ Success! Mapped {result['rows']} bin IDs across {result['groups']} groups.")
+    download_result("📥 Download Bin Bay Mapping", result, "download_bin_mapping_excel")
+    show_preview(result, "mapping_preview", lambda: mapping_preview(build_bin_mapping_table(result["bay_groups"])))
+
+def render_eoa_result(result):
+    render_errors(result["errors"], "eoa_errors", "layout entries could not be processed")
+
+    signage_data = result["signage"]
+    if signage_data:
+        st.success(f"✅ Success! Generated {len(signage_data)} sign definitions.")
+        st.subheader("Preview Signage Data")
+        if "preview" not in result:
+            result["preview"] = eoa_preview(signage_data)
+        render_preview(result["preview"], key="eoa_preview")
+
+        download_result("📥 Download EOA Signage", result, "download_eoa_excel_new")
+
+# --- Streamlit App ---
+st.title("Space Launch Quick Tools")
+st.markdown("A collection of tools for space launch operations.")
+
+# the metrics file is rewritten by one background thread per server process
+start_file_dump()
+
+# Create tabs; the admin tab with the server metrics is only shown with ?admin=<admin token>
+tab_names = ["Bin Label Generator", "Bin Bay Mapping", "EOA Generator"]
+if admin_enabled(st.query_params):
+    tab_names.append("Admin")
+tabs = st.tabs(tab_names)
+tab1, tab2, tab3 = tabs[:3]
+
+with tab1:
+    st.header("Bin Label Generator 🏷️", divider='rainbow')
+    st.markdown("Define bay groups, shelves, and bins per shelf to generate structured bin labels. Bay IDs must be unique (e.g., BAY-001-001-001).")
+
+    bay_groups = []
+    duplicate_errors = []
+    num_groups = st.number_input("How many bay groups do you want to define?", min_value=1, max_value=50, value=1, key="num_groups_bin_label")
+
+    for group_idx in range(num_groups):
+        if f"group_name_{group_idx}" not in st.session_state:
+            st.session_state[f"group_name_{group_idx}"] = f"Bay Group {group_idx + 1}"
+
+        def update_group_name(group_idx=group_idx):
+            st.session_state[f"group_name_{group_idx}"] = st.session_state[f"group_name_input_{group_idx}"]
+
+        header = st.session_state[f"group_name_{group_idx}"].strip() or f"Bay Group {group_idx + 1}"
+
+        with st.expander(header, expanded=True):
+            st.text_input(
+                "Group Name",
+                value=st.session_state[f"group_name_{group_idx}"],
+                key=f"group_name_input_{group_idx}",
+                on_change=update_group_name
+            )
+
+            bays_input = st.text_area(
+                f"Enter bay IDs (you can paste from Excel — multiple columns/rows are accepted)",
+                key=f"bays_{group_idx}",
+                help="You can paste multiple columns/rows copied from Excel. Separators recognized: tabs, spaces, commas, semicolons, or newlines. "
+                     "Ranges: BAY-001-001..BAY-001-400, or BAY-001-001..BAY-001-399:2 for every second bay."
+            )
+            shelf_count = st.number_input("How many shelves?", min_value=1, max_value=26, value=3, key=f"shelf_count_{group_idx}")
+            shelves = list(string.ascii_uppercase[:shelf_count])
+            
+            st.divider()
+
+            bins_per_shelf = {}
+            st.markdown("**Bins per Shelf**")
+            for shelf in shelves:
+                count = st.number_input(f"Number of bins in shelf {shelf}", min_value=1, max_value=100, value=5, key=f"bins_{group_idx}_{shelf}")
+                bins_per_shelf[shelf] = count
+
+            # --- UPDATED parsing: accept multi-column Excel paste (tabs/spaces/comma/semicolon) and ID ranges
+            if bays_input:
+                range_errors = []
+                bay_list = parse_id_list(bays_input, BAY_SEPARATORS, range_errors)
+                for error in range_errors:
+                    st.warning(error)
+                if bay_list:
+                    bay_groups.append({
+                        "name": st.session_state[f"group_name_{group_idx}"].strip() or f"Bay Group {group_idx + 1}",
+                        "bays": bay_list,
+                        "shelves": shelves,
+                        "bins_per_shelf": bins_per_shelf
+                    })
+                    temp_errors = check_duplicate_bay_ids(bay_groups)
+                    if temp_errors:
+                        with st.container():
+                            st.markdown("**Errors in this group:**")
+                            for error in temp_errors:
+                                st.warning(error)
+
+    if bay_groups:
+        duplicate_errors = check_duplicate_bay_ids(bay_groups)
+        with st.expander("⚠️ Duplicate Errors", expanded=bool(duplicate_errors)):
+            if duplicate_errors:
+                for error in duplicate_errors:
+                    st.warning(error)
+            else:
+                st.info("No duplicate bay IDs detected.")
+        name_errors = check_reserved_group_names(bay_groups)
+        for error in name_errors:
+            st.error(error)
+        duplicate_errors += name_errors
+        # compiled plans know their size without generating a label, even for huge ranges
+        plans = [LabelPlan.from_bays(g["name"], g["bays"], g["shelves"], g["bins_per_shelf"]) for g in bay_groups]
+        st.caption(f"{sum(len(p) for p in plans):,} labels for {sum(p.bay_count for p in plans):,} bays will be generated.")
+    else:
+        st.warning("⚠️ Please define at least one bay group with valid bay IDs.")
+
+    export_format = st.selectbox("Export format", options=list(LABEL_EXPORT_FORMATS), key="bin_labels_format",
+                                 help="Parquet / Arrow IPC write one row per bin and have no sheet row limit. The ZIP holds one workbook per bay group.")
+    label_template = None
+    if LABEL_EXPORT_FORMATS[export_format] == "pptx":
+        template_file = st.file_uploader("Label template (optional .pptx)", type=["pptx"], key="label_template_file",
+                                         help="The first slide is used as the page template. Each shape containing {label} is one label cell; {bay}, {shelf} and {group} are also filled in.")
+        label_template = template_file.getvalue() if template_file is not None else None
+    include_barcodes = False
+    if LABEL_EXPORT_FORMATS[export_format] in ("xlsx", "zip", "pptx"):
+        include_barcodes = st.checkbox("Include Code 128 barcodes", key="bin_labels_barcodes",
+                                       help="Excel: a barcode column per shelf, shown with the 'Libre Barcode 128' font (install it to print). Label sheets: vector barcodes under each label, or in the template's {barcode} shapes.")
+    previous_export = None
+    if LABEL_EXPORT_FORMATS[export_format] in ("xlsx", "zip"):
+        previous_file = st.file_uploader("Previous export or manifest (optional, for an incremental update)", type=["xlsx", "zip", "json"],
+                                         key="previous_labels_file",
+                                         help="Only groups that were added or changed since this export are regenerated; a change report lists the added, removed and changed groups and bays. "
+                                              "A single workbook is still read and written in full; for large sites the ZIP format copies unchanged groups as they are.")
+        previous_export = previous_file.getvalue() if previous_file is not None else None
+    if st.button("Generate Bin Labels", disabled=bool(duplicate_errors or not bay_groups or job_running("bin_labels")), key="generate_bin_labels"):
+        start_job("bin_labels", export_bin_labels, bay_groups, LABEL_EXPORT_FORMATS[export_format], label_template, include_barcodes, previous_export)
+    show_job("bin_labels", "Generating bin labels", render_bin_labels_result)
+
+    render_revalidation("label", "labels", validate_labels, "labels loaded, no duplicate bin labels found")
+
+with tab2:
+    st.header("Bin Bay Mapping ↔️", divider='rainbow')
+    st.markdown("Define bay definition groups and map bin IDs to bay types.")
+
+    bay_types = [
+        "Bulk Stock", "Case Flow", "Drawer", "Flat Apparel", "Hanger Rod", "Hangers",
+        "Jewelry", "Library", "Library Deep", "Pallet", "Shoes", "Random Other Bin",
+        "PassThrough"
+    ]
+
+    bay_usage_options = [
+        "*", "45F Produce", "Aerosol", "Ambient", "Apparel", "BATTERIES", "BWS",
+        "BWS_HIGH_FLAMMABLE", "BWS_LOW_FLAMMABLE", "BWS_MEDIUM_FLAMMABLE", "Book",
+        "Chilled", "Chilled-FMP", "Corrosive", "Damage", "Damage Human Food",
+        "Damage Pet Food", "Damage_HRV", "Damaged Aerosol", "Damaged Corrosive",
+        "Damaged Flammable", "Damaged Flammable Aerosols", "Damaged Misc Health Hazard",
+        "Damaged Non Flammable Aerosols", "Damaged Oxidizer", "Damaged Restricted Hazmat",
+        "Damaged Toxic", "Dry Produce", "FMP", "Flammable", "Flammable Aerosols",
+        "Flammables_HRV", "Frozen", "HRV", "Hazmat", "Hazmat_HRV", "Meat-Beef",
+        "Meat-Deli", "Meat-Pork", "Meat-Poultry", "Meat-Seafood", "Misc Health Hazard",
+        "Non Flammable Aerosols", "Non Inventory Storage-Facilities",
+        "Non Inventory Storage-Other", "Non Inventory Storage-Stores",
+        "Non Inventory-Black Totes", "Non Sort-Team Lift", "Non-Storage",
+        "Non-TC Food", "Oxidizer", "Pet Food", "Produce", "Produce Backstock",
+        "Produce Wetracks", "Reserve-Ambient", "Restricted Hazmat", "Semi-Chilled",
+        "Shoes", "TC-Food", "Toxic", "Tropical"
+    ]
+
+    num_groups = st.number_input("How many bay definition groups do you want to define?", min_value=1, max_value=50, value=1, key="num_groups_bin_mapping")
+
+    bay_groups = []
+    for group_idx in range(num_groups):
+        if f"bin_group_name_{group_idx}" not in st.session_state:
+            st.session_state[f"bin_group_name_{group_idx}"] = f"Bay Definition Group {group_idx + 1}"
+
+        def update_bin_group_name(group_idx=group_idx):
+            st.session_state[f"bin_group_name_{group_idx}"] = st.session_state[f"bin_group_name_input_{group_idx}"]
+
+        header = st.session_state[f"bin_group_name_{group_idx}"].strip() or f"Bay Definition Group {group_idx + 1}"
+
+        with st.expander(header, expanded=True):
+            st.text_input(
+                "Group Name",
+                value=st.session_state[f"bin_group_name_{group_idx}"],
+                key=f"bin_group_name_input_{group_idx}",
+                on_change=update_bin_group_name
+            )
+
+            bin_ids_input = st.text_area(
+                f"Enter bin IDs (e.g., P-1-B217A262)",
+                key=f"bin_ids_{group_idx}",
+                help="Paste Bin IDs from Excel (tab-separated, space-separated, or one per line). "
+                     "Ranges: P-1-B217A100..P-1-B217A199, with an optional step (..P-1-B217A199:2)."
+            )
+
+            bay_definition = st.text_input(
+                "Enter Bay Definition",
+                max_chars=48,
+                key=f"bay_definition_{group_idx}"
+            )
+            
+            st.divider()
+            st.markdown("**Default Dimensions for the Group**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                height_cm = st.number_input("Height (CM)", min_value=0.0, value=0.0, key=f"height_cm_{group_idx}")
+            with col2:
+                width_cm = st.number_input("Width (CM)", min_value=0.0, value=0.0, key=f"width_cm_{group_idx}")
+            with col3:
+                depth_cm = st.number_input("Depth (CM)", min_value=0.0, value=0.0, key=f"depth_cm_{group_idx}")
+            
+            st.divider()
+            outlier_shelves_input = st.text_input(
+                "Outlier Shelves (optional, comma-separated, e.g., C,D)",
+                key=f"outlier_shelves_{group_idx}",
+                help="Define shelves with different dimensions from the default."
+            )
+            st.caption("The app identifies a shelf by finding a capital letter followed by numbers at the end of the Bin ID (e.g., the 'C' in '...A208C120').")
+            
+            outlier_shelves = [s.strip().upper() for s in outlier_shelves_input.split(',') if s.strip()]
+
+            outlier_dimensions = {}
+            if outlier_shelves:
+                for shelf in outlier_shelves:
+                    st.markdown(f"**Dimensions for Outlier Shelf: {shelf}**")
+                    o_col1, o_col2, o_col3 = st.columns(3)
+                    with o_col1:
+                        o_height = st.number_input(f"Height (CM) for Shelf {shelf}", min_value=0.0, value=0.0, key=f"height_cm_{group_idx}_{shelf}")
+                    with o_col2:
+                        o_width = st.number_input(f"Width (CM) for Shelf {shelf}", min_value=0.0, value=0.0, key=f"width_cm_{group_idx}_{shelf}")
+                    with o_col3:
+                        o_depth = st.number_input(f"Depth (CM) for Shelf {shelf}", min_value=0.0, value=0.0, key=f"depth_cm_{group_idx}_{shelf}")
+                    outlier_dimensions[shelf] = {
+                        "height_cm": o_height,
+                        "width_cm": o_width,
+                        "depth_cm": o_depth,
+                    }
+                st.divider()
+
+            bay_usage = st.selectbox("Select Bay Usage", options=bay_usage_options, index=0, key=f"bay_usage_{group_idx}")
+            bay_type = st.selectbox("Select Bay Type", options=bay_types, index=0, key=f"bay_type_{group_idx}")
+
+            st.markdown("Enter Zone bins are inside followed by depth of bays. ex: Library (30D)")
+            zone = st.text_input("Zone", max_chars=25, key=f"zone_{group_idx}")
+
+            if bin_ids_input:
+                range_errors = []
+                bin_list = parse_id_list(bin_ids_input, BIN_SEPARATORS, range_errors)
+                for error in range_errors:
+                    st.warning(error)
+                if bin_list:
+                    bay_groups.append({
+                        "name": st.session_state[f"bin_group_name_{group_idx}"].strip() or f"Bay Definition Group {group_idx + 1}",
+                        "bin_ids": bin_list,
+                        "bay_definition": bay_definition,
+                        "height_cm": height_cm,
+                        "width_cm": width_cm,
+                        "depth_cm": depth_cm,
+                        "bay_usage": bay_usage,
+                        "bay_type": bay_type,
+                        "zone": zone,
+                        "outlier_dimensions": outlier_dimensions,
+                    })
+                    temp_errors = check_duplicate_bin_ids(bay_groups)
+                    if temp_errors:
+                        with st.container():
+                            st.markdown("**Errors in this group:**")
+                            for error in temp_errors:
+                                st.warning(error)
+
+    if bay_groups:
+        duplicate_errors = check_duplicate_bin_ids(bay_groups)
+        with st.expander("⚠️ Duplicate Errors", expanded=bool(duplicate_errors)):
+            if duplicate_errors:
+                for error in duplicate_errors:
+                    st.warning(error)
+            else:
+                st.info("No duplicate bin IDs detected.")
+    else:
+        st.warning("⚠️ Please define at least one bay definition group with valid bin IDs.")
+
+    export_format = st.selectbox("Export format", options=list(EXPORT_FORMATS), key="bin_mapping_format")
+    if st.button("Generate Excel", disabled=bool(duplicate_errors or not bay_groups or job_running("bin_mapping")), key="generate_bin_mapping_excel"):
+        start_job("bin_mapping", export_bin_mapping, bay_groups, EXPORT_FORMATS[export_format])
+    show_job("bin_mapping", "Generating Excel file", render_bin_mapping_result)
+
+    render_revalidation("bin bay mapping", "mapping", validate_mapping, "mapping rows loaded, every bin is mapped once")
+
+with tab3:
+    st.header("EOA Generator 🪧", divider='rainbow')
+    
+    st.markdown("**Step 1: Define All Aisles and Their Slot Ranges**")
+    st.caption("Define all modules. For each, set a default slot range and specify any aisles with different slots.")
+    
+    num_mod_defs = st.number_input("How many modules do you want to define?", min_value=1, max_value=20, value=1, key="num_mod_defs")
+    
+    aisle_details = {} 
+    
+    for mod_idx in range(num_mod_defs):
+        if f"eoa_mod_name_{mod_idx}" not in st.session_state:
+            st.session_state[f"eoa_mod_name_{mod_idx}"] = ""
+
+        def update_eoa_mod_name(idx=mod_idx):
+            current_val = st.session_state[f"eoa_mod_name_input_{idx}"]
+            st.session_state[f"eoa_mod_name_{idx}"] = current_val or f"Module Definition {idx + 1}"
+
+        header = st.session_state[f"eoa_mod_name_{mod_idx}"] or f"Module Definition {mod_idx + 1}"
+
+        with st.expander(header, expanded=True):
+            mod_name = st.text_input(
+                "Module Name (e.g., P-1-A)",
+                key=f"eoa_mod_name_input_{mod_idx}",
+                on_change=update_eoa_mod_name,
+            ).strip()
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                aisle_start = st.number_input(f"Start Aisle", min_value=1, value=200, step=1, key=f"aisle_start_{mod_idx}")
+            with col2:
+                aisle_end = st.number_input(f"End Aisle", min_value=aisle_start, value=aisle_start, step=1, key=f"aisle_end_{mod_idx}")
+            
+            st.divider()
+            
+            st.markdown("**Default Slot Range for this Module**")
+            d_col1, d_col2 = st.columns(2)
+            with d_col1:
+                default_start_slot = st.number_input("Default Start Slot", value=1, step=1, key=f"d_slot_start_{mod_idx}")
+            with d_col2:
+                default_end_slot = st.number_input("Default End Slot", value=199, step=1, key=f"d_slot_end_{mod_idx}")
+
+            outlier_aisles_input = st.text_area("Outlier Aisles for Slots (optional, comma-separated)", key=f"outlier_aisles_{mod_idx}")
+            outlier_aisles = {int(a.strip()) for a in outlier_aisles_input.split(',') if a.strip()}
+
+            outlier_slots = {}
+            if outlier_aisles:
+                st.markdown("**Outlier Slot Definitions**")
+                for outlier in sorted(list(outlier_aisles)):
+                    o_col1, o_col2 = st.columns(2)
+                    with o_col1:
+                        outlier_start = st.number_input(f"Start Slot for Aisle {outlier}", value=1, step=1, key=f"o_start_{mod_idx}_{outlier}")
+                    with o_col2:
+                        outlier_end = st.number_input(f"End Slot for Aisle {outlier}", value=199, step=1, key=f"o_end_{mod_idx}_{outlier}")
+                    outlier_slots[outlier] = (outlier_start, outlier_end)
+
+            if mod_name:
+                aisle_details[mod_name] = {}
+                aisles_in_range = list(range(aisle_start, aisle_end + 1))
+                for aisle in aisles_in_range:
+                    if aisle in outlier_slots:
+                        aisle_details[mod_name][aisle] = {"slots": outlier_slots[aisle]}
+                    else:
+                        aisle_details[mod_name][aisle] = {"slots": (default_start_slot, default_end_slot)}
+
+    st.divider()
+    st.markdown("**Step 2: Define Physical Aisle Layouts**")
+    
+    st.markdown("**2a. Standard (Single-Module) Layouts**")
+    st.caption("Describe how aisles within the same module are arranged.")
+    standard_layout_input = st.text_area(
+        "Standard Layouts (one module per line)",
+        height=150,
+        key="eoa_standard_layout_input",
+        placeholder="Example:\nP-1-A: 200, 201/202, 207"
+    )
+
+    st.markdown("**2b. Cross-Module Pairs (Optional)**")
+    st.caption("Define aisle pairs that touch across different modules.")
+    cross_module_layout_input = st.text_area(
+        "Cross-Module Pairs (one pair per line)",
+        height=100,
+        key="eoa_cross_module_layout_input",
+        placeholder="Example:\nP-1-A-201/P-1-B-200"
+    )
+
+    if standard_layout_input.strip() or cross_module_layout_input.strip():
+        layout_problems = validate_eoa_layout(aisle_details, standard_layout_input, cross_module_layout_input)
+        if layout_problems:
+            render_errors(layout_problems, "eoa_layout_problems", "layout problems found",
+                          "fix them before generating, or the affected aisles get no or duplicate signs")
+        else:
+            st.caption(f"✅ Layout checked: each of the {sum(len(a) for a in aisle_details.values()):,} aisles has exactly one sign.")
+
+    st.divider()
+    st.markdown("**Step 3: Confirm Placement Rule**")
+    if 'eoa_placement_rule' not in st.session_state:
+        st.session_state.eoa_placement_rule = "Odd on Left / Even on Right"
+    
+    st.radio(
+        "Low End Placement Rule (for single-sided signs)",
+        ["Odd on Left / Even on Right", "Even on Left / Odd on Right"],
+        key="eoa_placement_rule",
+        horizontal=True,
+    )
+
+    export_format = st.selectbox("Export format", options=list(EXPORT_FORMATS), key="eoa_format")
+    if st.button("Generate EOA Signage", disabled=job_running("eoa"), key="generate_eoa_signage"):
+        start_job("eoa", export_eoa_signage, aisle_details, standard_layout_input, cross_module_layout_input, st.session_state.eoa_placement_rule, EXPORT_FORMATS[export_format])
+    show_job("eoa", "Generating EOA Signage", render_eoa_result)
+
+    render_revalidation("EOA signage", "eoa", validate_eoa, "signs loaded, every aisle end has one sign")
+
+if len(tabs) > 3:
+    with tabs[3]:
+        render_admin_page()
@@ -0,0 +1,48 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from app.admin import ADMIN_TOKEN_ENV, admin_enabled
+from app.metrics import METRICS_FILE_ENV
+
+TABS = ["Bin Label Generator", "Bin Bay Mapping", "EOA Generator"]
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.delenv(ADMIN_TOKEN_ENV, raising=False)
+    monkeypatch.setenv(METRICS_FILE_ENV, str(tmp_path / "metrics.prom"))
+
+    def run(admin=None, secret=None):
+        at = AppTest.from_file("../main.py", default_timeout=60)
+        if admin is not None:
+            at.query_params["admin"] = admin
+        if secret is not None:
+            at.secrets["admin_token"] = secret
+        at.run()
+        assert not at.exception
+        return [tab.label for tab in at.tabs]
+
+    return run
+
+
+def test_admin_tab_is_hidden_without_a_token(app):
+    assert app() == TABS
+    assert app(admin="1") == TABS
+    assert app(admin="true", secret="") == TABS
+
+
+def test_admin_tab_needs_the_configured_token(app, monkeypatch):
+    assert app(admin="1", secret="s3cret") == TABS
+    assert app(admin="s3cret", secret="s3cret") == TABS + ["Admin"]
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "from-env")
+    assert app(admin="1") == TABS
+    assert app(admin="from-env") == TABS + ["Admin"]
+
+
+def test_admin_enabled(monkeypatch):
+    monkeypatch.delenv(ADMIN_TOKEN_ENV, raising=False)
+    assert not admin_enabled({"admin": "1"})
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "s3cret")
+    assert not admin_enabled({})
+    assert not admin_enabled({"admin": "s3cre"})
+    assert admin_enabled({"admin": "s3cret"})
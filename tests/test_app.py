@@ -0,0 +1,54 @@
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from app.exports import export_bin_labels
+from app.jobs import get_runner
+
+GROUPS = [
+    {"name": "G1", "bays": [f"BAY-001-{i:03d}" for i in range(1, 151)], "shelves": ["A", "B"], "bins_per_shelf": {"A": 2, "B": 3}},
+    {"name": "G2", "bays": ["BAY-002-001", "BAY-X"], "shelves": ["A"], "bins_per_shelf": {"A": 1}},
+]
+
+
+def _finished_job():
+    job = get_runner().submit("bin_labels", export_bin_labels, GROUPS)
+    deadline = time.time() + 30
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.05)
+    assert job.result is not None
+    return job
+
+
+def test_finished_labels_job_draws_one_diagram_at_a_time():
+    job = _finished_job()
+    at = AppTest.from_file("../main.py", default_timeout=60)
+    at.query_params["job_bin_labels"] = job.id
+    at.run()
+    assert not at.exception
+    # no figure (or an expander per bay) until a diagram is asked for
+    assert len(at.get("plotly_chart")) == 0 and len(at.expander) < 10
+
+    at.toggle(key="labels_diagram_toggle").set_value(True).run()
+    assert len(at.get("plotly_chart")) == 1
+    at.selectbox(key="labels_diagram_bay_0").set_value("BAY-001-150").run()
+    assert len(at.get("plotly_chart")) == 1
+    assert set(job.result["diagrams"]) == {(0, "BAY-001-001"), (0, "BAY-001-150")}
+
+    # an unrelated widget rerun reuses the cached figures
+    at.number_input(key="num_groups_bin_label").set_value(2).run()
+    assert len(job.result["diagrams"]) == 2 and len(at.get("plotly_chart")) == 1
+
+
+def test_a_bay_that_cannot_be_drawn_is_reported():
+    job = _finished_job()
+    at = AppTest.from_file("../main.py", default_timeout=60)
+    at.query_params["job_bin_labels"] = job.id
+    at.run()
+    at.toggle(key="labels_diagram_toggle").set_value(True).run()
+    at.selectbox(key="labels_diagram_group").set_value(1).run()
+    at.selectbox(key="labels_diagram_bay_1").set_value("BAY-X").run()
+    assert not at.exception
+    assert len(at.get("plotly_chart")) == 0
+    assert "Error generating diagram for 'BAY-X'" in [w.value.split(":")[0] for w in at.warning]
+    assert job.result["diagrams"][(1, "BAY-X")].stage == "diagram"
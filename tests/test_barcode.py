@@ -0,0 +1,44 @@
+import pandas as pd
+
+from app.barcode import SYMBOLS, START_B, STOP, encode, encode_series, font_text, to_png
+
+
+def test_check_symbol_and_framing():
+    modules = encode("PJJ123C")
+    # start + 7 data symbols + check symbol (11 modules each) + 13-module stop
+    assert len(modules) == 11 * 9 + 13
+    assert modules.startswith(SYMBOLS[START_B])
+    assert modules.endswith(SYMBOLS[STOP])
+    assert modules[-24:-13] == SYMBOLS[55]
+    assert font_text("PJJ123C") == "ÌPJJ123CWÎ"
+
+
+def test_memoised_tail_matches_direct_encoding():
+    # the same numeric tail after prefixes of different length shifts the checksum weights
+    for label in ["A001", "BAY-001-A001", "BAY-001-A", "123", "001-001B010"]:
+        direct = "".join(SYMBOLS[v] for v in [START_B] + [ord(c) - 32 for c in label])
+        values = [ord(c) - 32 for c in label]
+        check = (START_B + sum(i * v for i, v in enumerate(values, start=1))) % 103
+        assert encode(label) == direct + SYMBOLS[check] + SYMBOLS[STOP]
+
+
+def test_encode_series_and_png():
+    encoded = encode_series(pd.Series(["A1", "A2", "A1", None], index=[5, 6, 7, 8]))
+    assert list(encoded.index) == [5, 6, 7, 8]
+    assert encoded[5] == encoded[7] == encode("A1")
+    assert encoded[8] is None
+    png = to_png(encode("A1"), module_width=1, height=4)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert int.from_bytes(png[16:20], "big") == len(encode("A1")) + 20
+
+
+def test_barcode_columns_encode_each_label_once(monkeypatch):
+    from app import excel
+
+    calls = []
+    monkeypatch.setattr(excel, "font_text", lambda label: calls.append(label) or font_text(label))
+    df = pd.DataFrame({"A": ["BAY-001-A001"] * 1000, "B": ["BAY-001-B001"] * 999 + [None]})
+    result = excel.add_barcode_columns(df, ["A", "B"])
+    assert sorted(calls) == ["BAY-001-A001", "BAY-001-B001"]
+    assert result["A BARCODE"].eq(font_text("BAY-001-A001")).all()
+    assert pd.isna(result["B BARCODE"].iloc[-1])
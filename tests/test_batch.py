@@ -0,0 +1,61 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from app.batch import load_batch_manifest, main, run_batch
+
+SITE = {
+    "name": "SITE 1",
+    "labels": {"groups": [{"name": "Aisle 1", "bays": "BAY-001-001-001\tBAY-001-002-001", "shelves": 2, "bins_per_shelf": 3}]},
+    "mapping": {"format": "parquet", "groups": [{"name": "G1", "bin_ids": "P-1-A200A101 P-1-A200B101", "bay_definition": "DEF",
+                                                 "depth_cm": 30, "outlier_dimensions": {"b": {"height_cm": 1, "width_cm": 2, "depth_cm": 3}}}]},
+    "eoa": {"modules": [{"name": "P-1-A", "aisle_start": 200, "aisle_end": 202}], "standard_layout": "P-1-A: 200, 201/202"},
+}
+BROKEN = {
+    "name": "SITE/2",
+    "labels": {"groups": [{"name": "A", "bays": ["BAY-001-001-001"]}, {"name": "B", "bays": ["BAY-001-001-001"]}]},
+    "mapping": {"groups": [{"name": "G1", "bin_ids": ["X1"], "bay_definition": ""}]},
+    "eoa": {"modules": [{"name": "P-1-B", "aisle_start": 1}], "standard_layout": "P-1-B: 1"},
+}
+
+
+def test_batch_continues_after_a_failed_site(tmp_path):
+    summary = run_batch([SITE, BROKEN], str(tmp_path), workers=2)
+    assert summary["site"].tolist() == ["SITE 1", "SITE/2"]
+    assert summary["status"].tolist() == ["ok", "failed"]
+    assert sorted(os.listdir(tmp_path / "SITE 1")) == ["bin_bay_mapping.parquet", "bin_labels.xlsx", "eoa_signage.xlsx"]
+    # the broken site still gets its EOA output; labels and mapping failures are reported
+    assert os.listdir(tmp_path / "SITE_2") == ["eoa_signage.xlsx"]
+    assert "duplicated across groups" in summary["error"][1] and "mapping: Invalid bay definition" in summary["error"][1]
+    assert (summary["seconds"] > 0).all()
+    assert pd.read_csv(tmp_path / "summary.csv")["status"].tolist() == ["ok", "failed"]
+    sites = json.loads((tmp_path / "summary.json").read_text())["sites"]
+    assert sites[0]["outputs"] and sites[0]["labels_seconds"] >= 0
+
+
+def test_manifest_site_files_and_cli_shard(tmp_path):
+    (tmp_path / "site1.json").write_text(json.dumps(SITE))
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({"sites": ["site1.json", BROKEN]}))
+    assert [s["name"] for s in load_batch_manifest(str(manifest))] == ["SITE 1", "SITE/2"]
+    out = tmp_path / "out"
+    assert main([str(manifest), "-o", str(out), "-w", "1", "--shard", "0/2"]) == 0
+    assert pd.read_csv(out / "summary.csv")["site"].tolist() == ["SITE 1"]
+
+
+def test_sites_never_share_a_directory(tmp_path):
+    twin = {"name": "site_2", "eoa": SITE["eoa"]}
+    summary = run_batch([BROKEN, twin], str(tmp_path), workers=1)
+    assert summary["site"].tolist() == ["SITE/2", "site_2"]
+    assert os.listdir(tmp_path / "SITE_2") == ["eoa_signage.xlsx"]
+    assert os.listdir(tmp_path / "site_2 (2)") == ["eoa_signage.xlsx"]
+
+
+@pytest.mark.parametrize("shard", ["1", "a/b", "2/2", "0/0", "-1/2"])
+def test_bad_shards_are_rejected(tmp_path, shard, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path / "batch.json"), "--shard", shard])
+    assert exit_info.value.code == 2
+    assert "--shard" in capsys.readouterr().err
@@ -0,0 +1,73 @@
+import pytest
+
+from app.columnar import (ARROW, PARQUET, build_bin_labels_columnar, build_bin_mapping_columnar, build_eoa_columnar, read_table,
+                          validate_eoa, validate_labels, validate_mapping)
+from app.eoa import build_eoa_signage
+from app.exports import export_bin_labels, export_bin_mapping, export_eoa_signage
+from app.logic import generate_wide_labels_table
+from app.spool import SpooledFile, SpoolStore
+
+GROUPS = [
+    {"name": "G1", "bays": ["BAY-001-001-001", "BAY-001-002-001"], "shelves": ["A", "B"], "bins_per_shelf": {"A": 2, "B": 3}},
+    {"name": "G2", "bays": ["BAY-002-001-001"], "shelves": ["A"], "bins_per_shelf": {"A": 1}},
+]
+
+
+def test_label_round_trip_in_row_group_chunks():
+    for fmt in (PARQUET, ARROW):
+        data, stats = build_bin_labels_columnar(GROUPS, fmt, chunk_rows=4)
+        df = read_table(data)
+        assert stats == {"labels": 11, "bays": 3}
+        assert len(df) == 11
+        wide = generate_wide_labels_table("G1", GROUPS[0]["bays"], ["A", "B"], {"A": 2, "B": 3})
+        assert sorted(df[df["group"] == "G1"]["bin_label"]) == sorted(wide[["A", "B"]].stack().dropna().tolist())
+        assert validate_labels(df) == []
+
+
+def test_validate_labels_flags_duplicates():
+    data, _ = build_bin_labels_columnar([GROUPS[1], dict(GROUPS[1], name="Copy")])
+    errors = validate_labels(read_table(data))
+    assert errors == ["⚠️ Bin label '002-001A001' appears 2 times in: G2, Copy."]
+
+
+def test_eoa_blank_side_is_null():
+    rows = [{"Deployment Location": "Low End of Aisle 200", "Left.Mod": "P-1-A", "Left.Aisle": 200, "Left.Slots": "1-199", "Right.Mod": "", "Right.Aisle": "", "Right.Slots": ""}]
+    df = read_table(build_eoa_columnar(rows))
+    assert df.loc[0, "Left.Aisle"] == 200
+    assert df["Right.Aisle"].isna().all()
+
+
+MAPPING = {"name": "M", "bin_ids": ["P-1-A201A100", "P-1-A201B100"], "bay_definition": "D", "height_cm": 1, "width_cm": 1,
+           "depth_cm": 1, "zone": "", "bay_type": "", "bay_usage": "", "outlier_dimensions": {}}
+
+
+@pytest.mark.parametrize("fmt", [PARQUET, ARROW])
+def test_exports_stream_into_the_spool_file(tmp_path, monkeypatch, fmt):
+    # nothing may build the file in memory first when a store is given
+    monkeypatch.setattr("app.columnar._to_bytes", lambda write: pytest.fail("columnar export built in memory"))
+    store = SpoolStore(str(tmp_path), ttl=60)
+    labels = export_bin_labels(GROUPS, fmt, store=store)
+    mapping = export_bin_mapping([MAPPING], fmt, store=store)
+    aisles = {"P-1-A": {200: {"slots": (1, 10)}}}
+    eoa = export_eoa_signage(aisles, "P-1-A: 200", "", "Odd on Left / Even on Right", fmt, store=store)
+    assert all(isinstance(r["data"], SpooledFile) for r in (labels, mapping, eoa))
+    assert len(read_table(labels["data"].path)) == labels["stats"]["labels"] == 11
+    assert validate_mapping(read_table(mapping["data"].path)) == []
+    assert validate_eoa(read_table(eoa["data"].path)) == []
+
+
+def test_validate_mapping_flags_bins_mapped_twice():
+    data, rows = build_bin_mapping_columnar([MAPPING, dict(MAPPING, bay_definition="E", bin_ids=["p-1-a201a100"])])
+    assert rows == 3
+    assert validate_mapping(read_table(data)) == ["⚠️ Bin ID 'P-1-A201A100' is mapped 2 times, in: D, E."]
+    assert validate_mapping(read_table(build_eoa_columnar([]))) == [
+        "⚠️ Missing column(s): ScannableId, Distance Index, Depth, Width, Height, Zone, Bay Definition, bin_size, "
+        "Bay Type, Bay Usage."]
+
+
+def test_validate_eoa_flags_aisles_signed_twice():
+    aisles = {"P-1-A": {a: {"slots": (1, 10)} for a in range(200, 203)}, "P-1-B": {200: {"slots": (1, 10)}}}
+    signs, _ = build_eoa_signage(aisles, "P-1-A: 200, 201/202\nP-1-B: 200", "")
+    assert validate_eoa(read_table(build_eoa_columnar(signs))) == []
+    assert validate_eoa(read_table(build_eoa_columnar(signs + signs[2:3]))) == [
+        "⚠️ Aisle 201 of module P-1-A has 2 Low End signs.", "⚠️ Aisle 202 of module P-1-A has 2 Low End signs."]
@@ -1,5 +1,6 @@
 # tests/test_duplicates.py
 from app.logic import check_duplicate_bay_ids
+from app.ranges import parse_id_list
 
 def test_duplicates_detection():
     groups = [
@@ -9,3 +10,10 @@ def test_duplicates_detection():
     res = check_duplicate_bay_ids(groups)
     assert "BAY-001-002" in res["duplicates"]
     assert res["count"] == len(res["duplicates"])
+
+
+def test_ranges_are_compared_like_their_ids():
+    groups = [parse_id_list("BAY_001_001..BAY_001_010"), ["bay-001-005", "BAY 002 001"], ["BAY-002-001"]]
+    res = check_duplicate_bay_ids(groups)
+    assert res == check_duplicate_bay_ids([list(g) for g in groups])
+    assert res["duplicates"] == ["BAY-001-005", "BAY-002-001"]
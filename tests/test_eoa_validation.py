@@ -0,0 +1,83 @@
+from app import eoa
+from app.eoa import build_eoa_signage, validate_eoa_layout
+
+
+def details(modules):
+    return {mod: {a: {"slots": (1, 10)} for a in range(start, end + 1)} for mod, start, end in modules}
+
+
+def test_clean_layout_has_no_problems():
+    aisles = details([("P-1-A", 200, 203), ("P-1-B", 300, 301)])
+    assert validate_eoa_layout(aisles, "P-1-A: 200, 201/202\nP-1-B: 301", "P-1-A-203/P-1-B-300") == []
+
+
+def test_every_problem_kind_is_reported():
+    aisles = details([("P-1-A", 200, 207)])
+    standard = "P-1-A: 200/201, 201/202, 203, 203, 299\nP-1-C: 5\nP-1-A: x/y\nno colon"
+    cross = "P-1-A-202/P-1-B-100\nbroken"
+    problems = validate_eoa_layout(aisles, standard, cross)
+    assert [(p.stage, p.group, p.bay) for p in problems] == [
+        ("unparseable", "", "broken"),
+        ("unparseable", "P-1-A", "x/y"),
+        ("unparseable", "", "no colon"),
+        ("undefined", "P-1-B", "100"),
+        ("undefined", "P-1-A", "299"),
+        ("undefined", "P-1-C", "5"),
+        ("double-paired", "P-1-A", "202, 201"),
+        ("double-paired", "P-1-A", "203"),
+        ("unpaired", "P-1-A", "204-207"),
+    ]
+    chain = problems[6]
+    assert str(chain) == ("Aisles P-1-A-202, P-1-A-201 are in more than one layout entry: "
+                          "P-1-A-202/P-1-B-100; P-1-A: 201/202; P-1-A: 200/201")
+    assert str(problems[-1]) == "Aisles 204-207 of module P-1-A are not in any layout, so no sign is generated"
+
+
+def test_generation_reports_skipped_aisles():
+    aisles = details([("P-1-A", 200, 201), ("P-1-B", 300, 300)])
+    signs, errors = build_eoa_signage(aisles, "P-1-A: 200/201", "P-1-A-201/P-1-B-300")
+    assert len(signs) == 2
+    assert [(e.bay, e.stage) for e in errors] == [("200/201", "layout")]
+
+
+class _CountingDict(dict):
+    reads = 0
+
+    def __getitem__(self, key):
+        _CountingDict.reads += 1
+        return super().__getitem__(key)
+
+
+def test_site_wide_layout_is_linear(monkeypatch):
+    class CountingSets(eoa._DisjointSets):
+        def __init__(self):
+            super().__init__()
+            self.parent, self.size = _CountingDict(), _CountingDict()
+
+    # union-find lookups per aisle stay constant as the site grows, where a nested scan would not
+    monkeypatch.setattr(eoa, "_DisjointSets", CountingSets)
+    _CountingDict.reads = 0
+    modules = [(f"P-{m}-A", 100, 1099) for m in range(50)]
+    aisles = details(modules)
+    standard = "\n".join(f"{mod}: " + ", ".join(f"{a}/{a + 1}" for a in range(100, 1100, 2)) for mod, _, _ in modules)
+    assert validate_eoa_layout(aisles, standard, "") == []
+    assert _CountingDict.reads <= 25 * 50 * 1000
+    # a chain of overlapping pairs is the deepest union-find: still a few lookups per aisle
+    _CountingDict.reads = 0
+    chain = "P-0-A: " + ", ".join(f"{a}/{a + 1}" for a in range(100, 1099))
+    problems = validate_eoa_layout(details([("P-0-A", 100, 1099)]), chain, "")
+    assert [p.stage for p in problems] == ["double-paired"]
+    assert _CountingDict.reads <= 25 * 1000
+
+
+def test_generation_reads_layouts_like_validation():
+    aisles = details([("P-1-A", 200, 201), ("P-1-B", 200, 200)])
+    assert validate_eoa_layout(aisles, "P-1-A: 200", "P-1-A-201 / P-1-B-200") == []
+    signs, errors = build_eoa_signage(aisles, "P-1-A: 200", "P-1-A-201 / P-1-B-200")
+    assert errors == [] and len(signs) == 4
+
+    problems = validate_eoa_layout(aisles, "P-1-A: 200/201/202", "")
+    _, errors = build_eoa_signage(aisles, "P-1-A: 200/201/202", "")
+    assert str(problems[0]) == ("Could not parse '200/201/202' in module P-1-A. Error: pair '200/201/202' names "
+                                "3 aisles (200, 201, 202); a pair is two aisles, LEFT/RIGHT")
+    assert "pair '200/201/202' names 3 aisles" in str(errors[0])
@@ -0,0 +1,29 @@
+from app.eoa import build_eoa_signage
+from app.errors import ErrorRecord, error_frame, error_summary, errors_csv
+from app.excel import build_bin_labels_workbook
+
+
+def test_generators_return_records():
+    errors = []
+    bays = ["BAY-001-001-001"] + [f"X{i}Z" for i in range(1000)] + ["BAD-ID"]
+    build_bin_labels_workbook([{"name": "G1", "bays": bays, "shelves": ["A"], "bins_per_shelf": {"A": 2}}], errors=errors)
+    assert len(errors) == 1001
+    assert errors[0] == ErrorRecord("G1", "X0Z", "parse", "invalid literal for int() with base 10: 'X0Z'")
+    assert str(errors[0]) == "Error processing bay ID 'X0Z': invalid literal for int() with base 10: 'X0Z'"
+
+    summary = error_summary(errors)
+    # the bad pastes differ only in the quoted ID, so they share one row
+    assert summary[["stage", "group", "count"]].values.tolist() == [["parse", "G1", 1001]]
+    assert summary.loc[0, "reason"] == "invalid literal for int() with base 10: …"
+    assert summary.loc[0, "examples"] == "X0Z, X1Z, X2Z"
+    assert errors_csv(errors).decode().splitlines()[:2] == [
+        "group,bay,stage,reason", "G1,X0Z,parse,invalid literal for int() with base 10: 'X0Z'"]
+
+
+def test_eoa_errors_and_plain_text():
+    details = {"P-1-A": {200: {"slots": (1, 10)}}}
+    _, errors = build_eoa_signage(details, "P-1-A: 200, 201, 202/203", "")
+    assert [(e.group, e.bay, e.stage) for e in errors] == [("P-1-A", "201", "layout"), ("P-1-A", "202/203", "layout")]
+    assert str(errors[0]) == "Details not found for single aisle 201 in module P-1-A"
+    df = error_frame(errors + ["⚠️ something else"])
+    assert df.iloc[-1].tolist() == ["", "", "general", "⚠️ something else"]
@@ -0,0 +1,42 @@
+import io
+import zipfile
+
+import pandas as pd
+
+from app.excel import build_bin_labels_workbook, write_bin_labels_zip
+
+GROUPS = [
+    {"name": "Aisle 1", "bays": ["BAY-001-001-001"], "shelves": ["A", "B"], "bins_per_shelf": {"A": 2, "B": 1}},
+    {"name": "Aisle <2>", "bays": ["BAY-002-001-001", "bad"], "shelves": ["A"], "bins_per_shelf": {"A": 3}},
+]
+
+
+def test_zip_has_one_styled_workbook_per_group():
+    output = io.BytesIO()
+    errors = []
+    stats = write_bin_labels_zip(GROUPS, output, errors=errors)
+    archive = zipfile.ZipFile(output)
+    assert archive.namelist() == ["Aisle 1.xlsx", "Aisle _2_.xlsx", "manifest.json"]
+    assert stats == {"labels": 6, "bays": 2}
+    assert len(errors) == 1
+
+    sheet = pd.read_excel(io.BytesIO(archive.read("Aisle 1.xlsx")), header=1)
+    assert sheet["A"].tolist() == ["001-001A001", "001-001A002"]
+
+
+def test_zip_matches_single_workbook_sheets():
+    data, stats = build_bin_labels_workbook(GROUPS)
+    output = io.BytesIO()
+    assert write_bin_labels_zip(GROUPS, output) == stats
+    single = pd.read_excel(io.BytesIO(data), sheet_name=["Aisle 1", "Aisle <2>"], header=1)
+    archive = zipfile.ZipFile(output)
+    for (name, sheet), entry in zip(single.items(), archive.namelist()):
+        assert sheet.equals(pd.read_excel(io.BytesIO(archive.read(entry)), header=1))
+
+
+def test_barcode_columns_use_the_barcode_font():
+    data, _ = build_bin_labels_workbook(GROUPS[:1], barcodes=True)
+    sheet = pd.read_excel(io.BytesIO(data), header=1)
+    assert list(sheet.columns[-2:]) == ["A BARCODE", "B BARCODE"]
+    assert sheet["A BARCODE"][0].startswith("Ì") and sheet["A BARCODE"][0].endswith("Î")
+    assert sheet["B BARCODE"].isna().tolist() == [False, True]
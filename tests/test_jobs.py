@@ -0,0 +1,43 @@
+import threading
+import time
+
+from app.jobs import JobRunner, DONE, CANCELLED
+
+
+def _wait(job, timeout=5):
+    deadline = time.time() + timeout
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_job_reports_progress_and_result():
+    def work(n, progress=None):
+        for i in range(1, n + 1):
+            progress(i, n, f"group {i}")
+        return "ok"
+
+    runner = JobRunner(max_workers=1)
+    job = runner.submit("test", work, 3)
+    _wait(job)
+    assert job.status == DONE
+    assert job.result == "ok"
+    assert job.fraction == 1.0
+    assert runner.get(job.id) is job
+
+
+def test_job_cancellation():
+    started = threading.Event()
+
+    def work(progress=None):
+        started.set()
+        for i in range(1000):
+            time.sleep(0.01)
+            progress(i, 1000)
+
+    runner = JobRunner(max_workers=1)
+    job = runner.submit("test", work)
+    started.wait(2)
+    job.cancel()
+    _wait(job)
+    assert job.status == CANCELLED
+    assert job.result is None
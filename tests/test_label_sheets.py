@@ -0,0 +1,122 @@
+import io
+import re
+
+import pytest
+from lxml.etree import tostring
+from pptx import Presentation
+
+from app.label_sheets import build_default_template, render_label_sheets
+from app.labeltable import LabelTable
+
+
+def test_pages_are_filled_from_the_template():
+    table = LabelTable.from_groups([["BAY-001-001", "BAY-001-002"]], ["A", "B"], 4)
+    data, stats = render_label_sheets(table, template=build_default_template(columns=2, rows=3), workers=2, pages_per_chunk=1)
+    assert stats["labels"] == 16
+    assert stats["pages"] == 3
+    prs = Presentation(io.BytesIO(data))
+    assert len(prs.slides) == 3
+    first = [shape.text_frame.text.splitlines()[0] for shape in prs.slides[0].shapes]
+    assert first == ["BAY-001-A001", "BAY-001-A002", "BAY-001-A003", "BAY-001-A004", "BAY-001-B001", "BAY-001-B002"]
+    # unused cells on the last page are removed
+    assert len(prs.slides[-1].shapes) == 4
+
+
+def test_label_text_is_escaped():
+    table = LabelTable.from_groups([["R&D<1>"]], ["A"], 1)
+    data, _ = render_label_sheets(table)
+    prs = Presentation(io.BytesIO(data))
+    assert prs.slides[0].shapes[0].text_frame.text.startswith("R&D<1>")
+
+
+def test_barcodes_are_drawn_under_each_label():
+    table = LabelTable.from_groups([["BAY-001-001"]], ["A"], 3)
+    data, stats = render_label_sheets(table, barcodes=True)
+    assert stats["labels"] == 3
+    shapes = Presentation(io.BytesIO(data)).slides[0].shapes
+    assert [shape.name for shape in shapes] == ["Label Cell 0", "Label Cell 0 Barcode", "Label Cell 1",
+                                                "Label Cell 1 Barcode", "Label Cell 2", "Label Cell 2 Barcode"]
+    assert "custGeom" in tostring(shapes[1]._element).decode()
+
+
+def _custom_template(split_label: bool = True, extra_slides: int = 1) -> bytes:
+    """Two label cells whose {label} is split over runs like PowerPoint does, a picture and extra slides."""
+    from PIL import Image
+    from pptx.util import Mm
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    for i in range(2):
+        p = slide.shapes.add_textbox(Mm(10), Mm(10 + 30 * i), Mm(60), Mm(20)).text_frame.paragraphs[0]
+        for text in (["Bin: {la", "bel", "} ({bay})"] if split_label else ["Bin: {label} ({bay})"]):
+            p.add_run().text = text
+    logo = io.BytesIO()
+    Image.new("RGB", (4, 4), "red").save(logo, format="PNG")
+    slide.shapes.add_picture(logo, Mm(100), Mm(10))
+    for _ in range(extra_slides):
+        prs.slides.add_slide(prs.slide_layouts[6]).shapes.add_textbox(Mm(10), Mm(10), Mm(60), Mm(20)).text = "Instructions"
+    output = io.BytesIO()
+    prs.save(output)
+    return output.getvalue()
+
+
+def test_custom_template_pages():
+    table = LabelTable.from_groups([["BAY-001-001", "BAY-001-002"]], ["A"], 3)
+    data, stats = render_label_sheets(table, template=_custom_template(extra_slides=2))
+    prs = Presentation(io.BytesIO(data))
+    # the template deck's extra slides are dropped, not put in front of the label pages
+    assert len(prs.slides) == stats["pages"] == 3
+    texts = [shape.text_frame.text for slide in prs.slides for shape in slide.shapes if shape.has_text_frame]
+    expected = table.to_long()
+    assert texts == [f"Bin: {label} ({bay})" for label, bay in zip(expected["bin_label"], expected["bay_input"])]
+    # the page parts are proper slides: unique ids and names, and the template's picture on every page
+    assert len({slide.slide_id for slide in prs.slides}) == 3
+    assert len({slide.part.partname for slide in prs.slides}) == 3
+    assert all(any(shape.shape_type == 13 and shape.image.blob for shape in slide.shapes) for slide in prs.slides)
+
+
+def test_template_relationships_out_of_order():
+    """rId1 = red picture, rId2 = blue picture, rId3 = layout: page rIds are renamed in one pass."""
+    import zipfile
+    from PIL import Image
+    from pptx.util import Mm
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_textbox(Mm(10), Mm(10), Mm(60), Mm(20)).text = "{label}"
+    for i, color in enumerate(["red", "blue"]):
+        image = io.BytesIO()
+        Image.new("RGB", (4, 4), color).save(image, format="PNG")
+        slide.shapes.add_picture(image, Mm(100), Mm(10 + 30 * i))
+    deck = io.BytesIO()
+    prs.save(deck)
+    # python-pptx numbers the layout rId1 and the pictures rId2, rId3: rotate them
+    rotate = {"rId1": "rId3", "rId2": "rId1", "rId3": "rId2"}
+    output = io.BytesIO()
+    with zipfile.ZipFile(deck) as src, zipfile.ZipFile(output, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename in ("ppt/slides/slide1.xml", "ppt/slides/_rels/slide1.xml.rels"):
+                data = re.sub(rb'"(rId\d)"', lambda m: b'"' + rotate[m.group(1).decode()].encode() + b'"', data)
+            dst.writestr(item, data)
+
+    def colors(slide):
+        return [Image.open(io.BytesIO(shape.image.blob)).getpixel((0, 0)) for shape in slide.shapes if shape.shape_type == 13]
+
+    template = Presentation(io.BytesIO(output.getvalue()))
+    assert colors(template.slides[0]) == [(255, 0, 0), (0, 0, 255)]
+    data, _ = render_label_sheets(LabelTable.from_groups([["BAY-001-001"]], ["A"], 1), template=output.getvalue())
+    assert colors(Presentation(io.BytesIO(data)).slides[0]) == [(255, 0, 0), (0, 0, 255)]
+
+
+def test_token_split_by_a_line_break_is_rejected():
+    prs = Presentation(io.BytesIO(_custom_template(extra_slides=0)))
+    paragraph = prs.slides[0].shapes[0].text_frame.paragraphs[0]
+    # "Bin: {la" "bel" "} ({bay})" <br/> "tail": merging the runs would move the text around the break
+    paragraph.add_line_break()
+    paragraph.add_run().text = "tail"
+    output = io.BytesIO()
+    prs.save(output)
+    table = LabelTable.from_groups([["BAY-001-001"]], ["A"], 1)
+    with pytest.raises(ValueError, match="split over several text runs"):
+        render_label_sheets(table, template=output.getvalue())
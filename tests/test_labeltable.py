@@ -0,0 +1,57 @@
+from app.labeltable import LabelPlan, LabelTable
+from app.logic import generate_bin_labels_table, generate_wide_labels_table
+from app.ranges import parse_id_list
+
+
+def test_long_layout_labels():
+    df = generate_bin_labels_table([["BAY-001-001", "XYZ"]], ["S1", "S2"], 2)
+    assert list(df.columns) == ["group", "bay_input", "normalized_bay", "shelf", "bin_label"]
+    assert df["bin_label"].tolist() == [
+        "BAY-001-S1001", "BAY-001-S1002", "BAY-001-S2001", "BAY-001-S2002",
+        "XYZS11", "XYZS12", "XYZS21", "XYZS22",
+    ]
+
+
+def test_wide_layout_fills_short_shelves_with_none():
+    errors = []
+    df = generate_wide_labels_table("G", ["BAY-001-002-005", "bad"], ["A", "B"], {"A": 1, "B": 2}, errors=errors)
+    assert df.columns.tolist() == ["BAY TYPE", "AISLE", "BAY ID", "A", "B"]
+    assert df["A"].iloc[0] == "001-002A005" and df["A"].isna().iloc[1]
+    assert df["B"].tolist() == ["001-002B005", "001-002B006"]
+    assert len(errors) == 1 and errors[0].bay == "bad" and "'bad'" in str(errors[0])
+
+
+def test_compact_frame_uses_categoricals_and_int_suffix():
+    table = LabelTable.from_groups([["BAY-001-001", "BAY-001-002"]], ["S1", "S2"], 3)
+    frame = table.frame()
+    assert len(table) == 12
+    for col in ("group", "bay_input", "normalized_bay", "shelf", "bin_prefix"):
+        assert frame[col].dtype == "category"
+    assert frame["bin_number"].dtype == "int32"
+    assert (frame["bin_prefix"].astype(str) + frame["shelf"].astype(str) + frame["bin_number"].map("{:03d}".format)).tolist() == table.bin_labels().tolist()
+
+
+def test_label_plan_matches_table_without_building_it():
+    bays = parse_id_list("BAY-001-001-001..BAY-001-001-400\nbad\nBAY-002-001-001\nBAY-003-001-001..BAY-003-001-010:3")
+    errors = []
+    plan = LabelPlan.from_bays("G", bays, ["A", "B"], {"A": 2, "B": 3}, errors=errors)
+    table = LabelTable.from_bays("G", bays, ["A", "B"], {"A": 2, "B": 3})
+    assert len(plan) == len(table) == (400 + 1 + 4) * 5 and plan.bay_count == table.bay_count
+    assert [e.bay for e in errors] == ["bad"]
+    labels = table.bin_labels().tolist()
+    for i in (0, 1, 4, 5, 1999, 2000, 2004, len(plan) - 1, -1):
+        assert plan[i] == labels[i]
+    assert plan[1995:2010] == labels[1995:2010] and plan[::997] == labels[::997]
+    assert list(plan) == labels
+    assert sum(len(chunk) for chunk in plan.chunks(bins=64)) == len(plan)
+    assert plan.wide(400, 401).equals(table.to_wide().iloc[1200:1203].reset_index(drop=True))
+    assert plan.long(7, 12).equals(table.to_long(slice(7, 12)))
+
+
+def test_label_plan_long_layout_and_huge_ranges():
+    plan = LabelPlan.from_groups([["BAY-001-001", "XYZ"]], ["S1", "S2"], 2)
+    assert list(plan) == ["BAY-001-S1001", "BAY-001-S1002", "BAY-001-S2001", "BAY-001-S2002",
+                          "XYZS11", "XYZS12", "XYZS21", "XYZS22"]
+    huge = LabelPlan.from_groups([parse_id_list("BAY-001-000001..BAY-001-999999")], ["A", "B", "C"], 40)
+    assert len(huge) == 999_999 * 120
+    assert huge[-1] == LabelTable.from_groups([["BAY-001-999999"]], ["A", "B", "C"], 40).bin_labels().iloc[-1]
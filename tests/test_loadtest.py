@@ -0,0 +1,21 @@
+import pandas as pd
+
+from app.loadtest import bay_paste, run_load_test, summarize
+
+
+def test_summary_percentiles_per_step():
+    samples = pd.DataFrame({"session": [0, 0, 1, 1], "step": ["open", "open_job", "open", "open_job"], "seconds": [1.0, 5.0, 3.0, 7.0]})
+    summary = summarize(samples).set_index("step")
+    assert summary.loc["open", "p50"] == 2.0
+    assert summary.loc["open_job", "max"] == 7.0
+    # job wall times are not reruns
+    assert summary.loc["all reruns", "count"] == 2
+
+
+def test_single_session_runs_every_tool():
+    assert len(set(bay_paste(0, 1500).split())) == 1500
+    result = run_load_test(sessions=1, bays=2, bins=2, aisles=2, timeout=60)
+    assert result["errors"] == []
+    steps = set(result["samples"]["step"])
+    assert {"open", "generate_labels_job", "generate_mapping_job", "generate_eoa_job"} <= steps
+    assert result["memory"]["state_bytes"][0] > 0
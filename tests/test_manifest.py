@@ -0,0 +1,131 @@
+import io
+import json
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from app.checks import check_reserved_group_names
+from app.excel import build_bin_labels_workbook, update_bin_labels_workbook, update_bin_labels_zip, write_bin_labels_zip
+from app.manifest import build_manifest, diff_manifests, manifest_json, read_manifest
+from app.ranges import parse_id_list
+
+GROUPS = [
+    {"name": "Aisle 1", "bays": ["BAY-001-001-001", "BAY-001-002-001"], "shelves": ["A", "B"], "bins_per_shelf": {"A": 2, "B": 2}},
+    {"name": "Aisle 2", "bays": ["BAY-002-001-001"], "shelves": ["A"], "bins_per_shelf": {"A": 3}},
+    {"name": "Aisle 3", "bays": ["BAY-003-001-001"], "shelves": ["A"], "bins_per_shelf": {"A": 1}},
+]
+EDITED = [
+    {**GROUPS[0], "bays": ["BAY-001-001-001", "BAY-001-003-001"]},
+    {**GROUPS[1], "bins_per_shelf": {"A": 4}},
+    {"name": "Aisle 4", "bays": ["BAY-004-001-001"], "shelves": ["A"], "bins_per_shelf": {"A": 1}},
+]
+
+
+def test_diff_reports_groups_and_bays():
+    changes, report = diff_manifests(build_manifest(GROUPS), build_manifest(EDITED))
+    assert changes == {"added": ["Aisle 4"], "removed": ["Aisle 3"], "changed": ["Aisle 1", "Aisle 2"], "unchanged": []}
+    assert report[["group", "bay", "change"]].values.tolist() == [
+        ["Aisle 1", "BAY-001-003-001", "bay added"],
+        ["Aisle 1", "BAY-001-002-001", "bay removed"],
+        ["Aisle 2", "", "settings changed"],
+        ["Aisle 4", "", "group added"],
+        ["Aisle 3", "", "group removed"],
+    ]
+    assert report["detail"][2] == "bins per shelf {'A': 3} -> {'A': 4}"
+
+
+def test_manifest_is_read_back_from_every_export():
+    manifest = build_manifest(GROUPS)
+    workbook, _ = build_bin_labels_workbook(GROUPS)
+    assert read_manifest(workbook) == manifest
+    assert read_manifest(manifest_json(manifest)) == manifest
+    output = io.BytesIO()
+    write_bin_labels_zip(GROUPS, output)
+    assert [g["hash"] for g in read_manifest(output.getvalue())["groups"]] == [g["hash"] for g in manifest["groups"]]
+
+
+def test_workbook_update_only_regenerates_changed_groups():
+    previous, _ = build_bin_labels_workbook(GROUPS)
+    edited = [GROUPS[0], EDITED[1], EDITED[2]]
+    data, report, stats = update_bin_labels_workbook(previous, edited)
+    assert stats == {"labels": 5, "bays": 2, "regenerated": 2, "reused": 1}
+    assert list(report["change"]) == ["settings changed", "group added", "group removed"]
+    full, _ = build_bin_labels_workbook(edited)
+    names = [g["name"] for g in edited]
+    expected = pd.read_excel(io.BytesIO(full), sheet_name=names, header=1)
+    assert load_workbook(io.BytesIO(data)).sheetnames == names + ["_manifest"]
+    updated = pd.read_excel(io.BytesIO(data), sheet_name=names, header=1)
+    for name in names:
+        assert updated[name].equals(expected[name])
+    assert read_manifest(data) == build_manifest(edited)
+    # an unchanged input regenerates nothing
+    _, report, stats = update_bin_labels_workbook(data, edited)
+    assert report.empty and stats["regenerated"] == 0
+
+
+def test_zip_update_copies_unchanged_workbooks():
+    previous = io.BytesIO()
+    write_bin_labels_zip(GROUPS, previous)
+    output = io.BytesIO()
+    report, stats = update_bin_labels_zip(previous.getvalue(), EDITED[:1] + GROUPS[1:], output)
+    assert stats["regenerated"] == 1 and stats["reused"] == 2
+    archive = zipfile.ZipFile(output)
+    assert archive.read("Aisle 2.xlsx") == zipfile.ZipFile(previous).read("Aisle 2.xlsx")
+    assert json.loads(archive.read("manifest.json"))["groups"][0]["bays"] == EDITED[0]["bays"]
+    # with only a manifest, the ZIP holds just the regenerated workbook
+    output = io.BytesIO()
+    update_bin_labels_zip(manifest_json(build_manifest(GROUPS)), EDITED[:1] + GROUPS[1:], output)
+    assert zipfile.ZipFile(output).namelist() == ["Aisle 1.xlsx", "manifest.json"]
+
+
+def test_manifest_only_update_lists_only_its_output():
+    first = io.BytesIO()
+    update_bin_labels_zip(manifest_json(build_manifest(GROUPS)), EDITED[:1] + GROUPS[1:], first)
+    assert [g["name"] for g in read_manifest(first.getvalue())["groups"]] == ["Aisle 1"]
+    data, _, _ = update_bin_labels_workbook(manifest_json(build_manifest(GROUPS)), EDITED[:1] + GROUPS[1:])
+    assert load_workbook(io.BytesIO(data)).sheetnames == ["Aisle 1", "_manifest"]
+    # the groups left out are not mistaken for reusable ones on the next run
+    data, _, stats = update_bin_labels_workbook(data, EDITED[:1] + GROUPS[1:])
+    assert stats["reused"] == 1 and stats["regenerated"] == 2
+    assert load_workbook(io.BytesIO(data)).sheetnames == ["Aisle 1", "Aisle 2", "Aisle 3", "_manifest"]
+
+
+def test_upload_type_is_detected_whatever_the_format():
+    archive = io.BytesIO()
+    write_bin_labels_zip(GROUPS, archive)
+    # a ZIP uploaded for a workbook update: nothing can be copied, so every group is generated
+    data, _, stats = update_bin_labels_workbook(archive.getvalue(), GROUPS)
+    assert stats == {"labels": 12, "bays": 4, "regenerated": 3, "reused": 0}
+    assert load_workbook(io.BytesIO(data)).sheetnames == ["Aisle 1", "Aisle 2", "Aisle 3", "_manifest"]
+    # and a workbook uploaded for a ZIP update
+    output = io.BytesIO()
+    _, stats = update_bin_labels_zip(data, GROUPS, output)
+    assert stats["regenerated"] == 3
+    assert zipfile.ZipFile(output).namelist() == ["Aisle 1.xlsx", "Aisle 2.xlsx", "Aisle 3.xlsx", "manifest.json"]
+
+
+def test_ranges_stay_compact_in_the_manifest():
+    ranged = [{**GROUPS[0], "bays": parse_id_list("BAY-001-001..BAY-001-400 BAY-002-001")}]
+    listed = [{**GROUPS[0], "bays": [f"BAY-001-{i:03d}" for i in range(1, 401)] + ["BAY-002-001"]}]
+    entry = build_manifest(ranged)["groups"][0]
+    assert entry["bays"] == ["BAY-001-001..BAY-001-400", "BAY-002-001"]
+    assert entry["hash"] == build_manifest(listed)["groups"][0]["hash"]
+    shorter = [{**GROUPS[0], "bays": parse_id_list("BAY-001-001..BAY-001-399 BAY-002-001")}]
+    _, report = diff_manifests(build_manifest(ranged), build_manifest(shorter))
+    assert report[["bay", "change"]].values.tolist() == [["BAY-001-400", "bay removed"]]
+
+
+def test_a_group_cannot_take_the_manifest_sheet_name():
+    groups = GROUPS[:1] + [{**GROUPS[1], "name": "_Manifest"}]
+    assert check_reserved_group_names(groups) == [
+        "⚠️ Bay group name '_Manifest' is reserved for the export's manifest sheet; please rename the group."]
+    previous, _ = build_bin_labels_workbook(GROUPS)
+    for build in (lambda: build_bin_labels_workbook(groups), lambda: update_bin_labels_workbook(previous, groups)):
+        with pytest.raises(ValueError, match="'_Manifest' is reserved"):
+            build()
+    # the ZIP has no manifest sheet to collide with
+    output = io.BytesIO()
+    write_bin_labels_zip(groups, output)
+    assert "_Manifest.xlsx" in zipfile.ZipFile(output).namelist()
@@ -0,0 +1,210 @@
+"""Peak traced memory of each generator and exporter on fixed synthetic inputs.
+
+Every test runs one generator under tracemalloc and fails when the peak divided by the number
+of labels, rows, signs or worksheet cells exceeds its budget in BUDGETS (bytes per unit).
+Budgets leave about 2x headroom over the measured peaks; a regression such as a dict per bin
+or an extra copy of the openpyxl tree blows well past them. The failure message (and the
+captured output) lists the lines that held the most memory at the sampled peak.
+
+    MEMORY_BUDGET_SCALE=1.5 python -m pytest tests/test_memory.py    # loosen every budget
+    MEMORY_BUDGET_LABELS_XLSX=900 python -m pytest tests/test_memory.py -s   # one budget, print breakdowns
+"""
+import gc
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+from app.eoa import build_eoa_signage, validate_eoa_layout
+from app.excel import build_bin_mapping_table
+from app.exports import export_bin_labels, export_bin_mapping, export_eoa_signage
+from app.labeltable import LabelPlan, LabelTable
+from app.logic import build_bin_mapping_rows
+
+BUDGETS = {
+    "label_plan": 60,
+    "label_table": 100,
+    "label_long": 350,
+    "labels_xlsx": 2_000,
+    "labels_zip": 2_000,
+    "labels_parquet": 200,
+    "labels_pptx": 1_600,
+    "mapping_rows": 800,
+    "mapping_table": 1_200,
+    "mapping_xlsx": 800,
+    "mapping_parquet": 1_200,
+    "eoa_validate": 800,
+    "eoa_signage": 1_200,
+    "eoa_xlsx": 1_200,
+    "eoa_parquet": 1_600,
+}
+TOP_LINES = 10
+_SAMPLE_SECONDS = 0.02
+
+SHELVES = list("ABCD")
+BINS_PER_SHELF = {"A": 5, "B": 5, "C": 6, "D": 4}
+LABEL_GROUPS = [
+    {"name": f"Aisle {g}", "bays": [f"BAY-{g:03d}-{b // 100 + 1:03d}-{b % 100 + 1:03d}" for b in range(100)],
+     "shelves": SHELVES, "bins_per_shelf": BINS_PER_SHELF}
+    for g in range(1, 3)
+]
+LABELS = 2 * 100 * 20
+MAPPING_GROUPS = [{
+    "name": "G1", "bin_ids": [f"P-1-A{200 + b // 100}{'ABCDE'[b % 5]}{100 + b % 100}" for b in range(2000)],
+    "bay_definition": "DEF", "height_cm": 10.0, "width_cm": 20.0, "depth_cm": 30.0, "bay_usage": "Pick", "bay_type": "Shelf",
+    "zone": "A", "outlier_dimensions": {"B": {"height_cm": 1.0, "width_cm": 2.0, "depth_cm": 3.0}},
+}]
+MAPPING_ROWS = 2000
+MAPPING_COLUMNS = 10
+AISLES = {f"P-{m}-A": {a: {"slots": (1, 199)} for a in range(100, 200)} for m in range(1, 6)}
+STANDARD_LAYOUT = "\n".join(f"{mod}: " + ", ".join(f"{a}/{a + 1}" for a in range(100, 200, 2)) for mod in AISLES)
+SIGNS = 5 * 50 * 2
+EOA_COLUMNS = 7
+
+
+def budget(name: str) -> float:
+    """Bytes per unit for `name`: MEMORY_BUDGET_<NAME> if set, else BUDGETS scaled by MEMORY_BUDGET_SCALE."""
+    override = os.environ.get(f"MEMORY_BUDGET_{name.upper()}")
+    if override:
+        return float(override)
+    return BUDGETS[name] * float(os.environ.get("MEMORY_BUDGET_SCALE", "1"))
+
+
+class _PeakSampler(threading.Thread):
+    """Takes a tracemalloc snapshot whenever traced memory has grown 10% past the largest seen so far."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.largest = 0
+        self.snapshot = None
+
+    def run(self):
+        while not self.stopped.wait(_SAMPLE_SECONDS):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.largest * 1.1:
+                self.largest = current
+                self.snapshot = tracemalloc.take_snapshot()
+
+
+def breakdown(snapshot, limit: int = TOP_LINES) -> str:
+    if snapshot is None:
+        return "  (the peak was too short-lived to sample)"
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)])
+    lines = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        lines.append(f"  {stat.size / 1024:10,.1f} KiB {stat.count:8,} blocks  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines)
+
+
+def measure(fn):
+    """(result, peak bytes, top-lines breakdown at the sampled peak) of calling `fn` under tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    sampler = _PeakSampler()
+    sampler.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        if sampler.snapshot is None or peak > sampler.largest * 1.1:
+            # short calls finish between samples; what the result still holds is the best view left
+            sampler.snapshot = tracemalloc.take_snapshot()
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        tracemalloc.stop()
+    return result, peak, breakdown(sampler.snapshot)
+
+
+def check_budget(name: str, fn, units: int, unit: str):
+    result, peak, top = measure(fn)
+    per_unit = peak / units
+    report = (f"{name}: peak {peak / 1024 ** 2:,.1f} MiB for {units:,} {unit} = {per_unit:,.0f} B per {unit[:-1]} "
+              f"(budget {budget(name):,.0f})\n{top}")
+    print(report)
+    assert per_unit <= budget(name), report
+    return result
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_imports():
+    """Run every exporter once on a tiny input so lazy imports and one-off caches are not measured."""
+    groups = [dict(LABEL_GROUPS[0], bays=LABEL_GROUPS[0]["bays"][:1])]
+    for fmt in ("xlsx", "zip", "parquet", "pptx"):
+        export_bin_labels(groups, fmt)
+    for fmt in ("xlsx", "parquet"):
+        export_bin_mapping([dict(MAPPING_GROUPS[0], bin_ids=MAPPING_GROUPS[0]["bin_ids"][:1])], fmt)
+        export_eoa_signage(AISLES, "P-1-A: 100", "", "Odd on Left / Even on Right", fmt)
+
+
+def test_label_plan_stays_lazy():
+    plan = check_budget("label_plan", lambda: LabelPlan.from_groups([g["bays"] for g in LABEL_GROUPS], SHELVES, 5),
+                        LABELS, "labels")
+    assert len(plan) == LABELS
+
+
+def test_label_table():
+    check_budget("label_table", lambda: LabelTable.from_groups([g["bays"] for g in LABEL_GROUPS], SHELVES, 5), LABELS, "labels")
+
+
+def test_long_label_frame():
+    df = check_budget("label_long", lambda: LabelTable.from_groups([g["bays"] for g in LABEL_GROUPS], SHELVES, 5).to_long(),
+                      LABELS, "labels")
+    assert len(df) == LABELS
+
+
+@pytest.mark.parametrize("fmt", ["xlsx", "zip", "parquet", "pptx"])
+def test_label_exports(fmt):
+    # one worksheet cell per label in the Excel formats
+    result = check_budget(f"labels_{fmt}", lambda: export_bin_labels(LABEL_GROUPS, fmt), LABELS,
+                          "cells" if fmt in ("xlsx", "zip") else "labels")
+    assert result["stats"]["labels"] == LABELS
+
+
+def test_mapping_rows():
+    rows = check_budget("mapping_rows", lambda: build_bin_mapping_rows(MAPPING_GROUPS[0]), MAPPING_ROWS, "rows")
+    assert len(rows) == MAPPING_ROWS
+
+
+def test_mapping_table():
+    check_budget("mapping_table", lambda: build_bin_mapping_table(MAPPING_GROUPS), MAPPING_ROWS, "rows")
+
+
+def test_mapping_xlsx():
+    result = check_budget("mapping_xlsx", lambda: export_bin_mapping(MAPPING_GROUPS, "xlsx"), MAPPING_ROWS * MAPPING_COLUMNS, "cells")
+    assert result["rows"] == MAPPING_ROWS
+
+
+def test_mapping_parquet():
+    check_budget("mapping_parquet", lambda: export_bin_mapping(MAPPING_GROUPS, "parquet"), MAPPING_ROWS, "rows")
+
+
+def test_eoa_validation():
+    aisles = sum(len(a) for a in AISLES.values())
+    assert check_budget("eoa_validate", lambda: validate_eoa_layout(AISLES, STANDARD_LAYOUT, ""), aisles, "aisles") == []
+
+
+def test_eoa_signage():
+    signs, _ = check_budget("eoa_signage", lambda: build_eoa_signage(AISLES, STANDARD_LAYOUT, ""), SIGNS, "signs")
+    assert len(signs) == SIGNS
+
+
+def test_eoa_xlsx():
+    check_budget("eoa_xlsx", lambda: export_eoa_signage(AISLES, STANDARD_LAYOUT, "", "Odd on Left / Even on Right", "xlsx"),
+                 SIGNS * EOA_COLUMNS, "cells")
+
+
+def test_eoa_parquet():
+    check_budget("eoa_parquet", lambda: export_eoa_signage(AISLES, STANDARD_LAYOUT, "", "Odd on Left / Even on Right", "parquet"),
+                 SIGNS, "signs")
+
+
+def test_budget_overrides(monkeypatch):
+    monkeypatch.setenv("MEMORY_BUDGET_SCALE", "2")
+    assert budget("label_table") == 2 * BUDGETS["label_table"]
+    monkeypatch.setenv("MEMORY_BUDGET_LABEL_TABLE", "5")
+    assert budget("label_table") == 5
+    with pytest.raises(AssertionError, match="B per label"):
+        check_budget("label_table", lambda: [dict(label=i) for i in range(LABELS)], LABELS, "labels")
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from app.checks import check_duplicate_bay_ids
+from app.exports import export_bin_labels
+from app.logic import generate_label_table_cached
+from app.metrics import (CACHE_REQUESTS, DUPLICATE_CHECK_SECONDS, EXPORT_BYTES, EXPORTS, ITEMS_GENERATED, REGISTRY,
+                         MetricsRegistry, cache_hit_rate)
+
+GROUPS = [{"name": "G1", "bays": ["BAY-001-001-001", "BAY-001-002-001"], "shelves": ["A"], "bins_per_shelf": {"A": 2}}]
+
+
+def test_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests.", ("path",))
+    requests.inc(path="/a")
+    requests.inc(2, path='say "hi"')
+    latency = registry.histogram("app_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+    assert registry.render().splitlines() == [
+        "# HELP app_requests_total Requests.",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{path="/a"} 1',
+        'app_requests_total{path="say \\"hi\\""} 2',
+        "# HELP app_seconds Latency.",
+        "# TYPE app_seconds histogram",
+        'app_seconds_bucket{le="0.1"} 2',
+        'app_seconds_bucket{le="1"} 3',
+        'app_seconds_bucket{le="+Inf"} 4',
+        "app_seconds_sum 3.65",
+        "app_seconds_count 4",
+    ]
+    assert registry.counter("app_requests_total", "Requests.", ("path",)) is requests
+    with pytest.raises(ValueError):
+        registry.histogram("app_requests_total", "Requests.", ("path",))
+    with pytest.raises(ValueError):
+        requests.inc(route="/a")
+
+
+def test_counters_are_thread_safe():
+    counter = MetricsRegistry().counter("hits_total", "Hits.", ("worker",))
+
+    def work():
+        for _ in range(10_000):
+            counter.inc(worker="w")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.value(worker="w") == 80_000
+
+
+def test_file_dump_is_atomic(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("x_total", "X.").inc()
+    path = tmp_path / "sub" / "metrics.prom"
+    registry.write(str(path))
+    assert path.read_text().endswith("x_total 1\n")
+    assert [p.name for p in path.parent.iterdir()] == ["metrics.prom"]
+
+
+def test_hot_paths_are_instrumented():
+    exports, labels = EXPORTS.value(tool="labels", format="parquet"), ITEMS_GENERATED.value(kind="label")
+    sized = EXPORT_BYTES.count(tool="labels", format="parquet")
+    result = export_bin_labels(GROUPS, "parquet")
+    assert EXPORTS.value(tool="labels", format="parquet") == exports + 1
+    assert ITEMS_GENERATED.value(kind="label") == labels + result["stats"]["labels"]
+    assert EXPORT_BYTES.count(tool="labels", format="parquet") == sized + 1
+
+    checks = DUPLICATE_CHECK_SECONDS.count(kind="bay")
+    check_duplicate_bay_ids(GROUPS)
+    assert DUPLICATE_CHECK_SECONDS.count(kind="bay") == checks + 1
+
+    requests = CACHE_REQUESTS.value(cache="label_table")
+    bays = [["BAY-009-001-001", "BAY-009-002-001"]]
+    generate_label_table_cached(bays, ["A"], 2)
+    generate_label_table_cached(bays, ["A"], 2)
+    assert CACHE_REQUESTS.value(cache="label_table") == requests + 2
+    assert 0 < cache_hit_rate("label_table") < 1
+    assert "binlabel_exports_total" in REGISTRY.render()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.labeltable import LabelTable
+from app.overview import SiteOverview
+from app.ranges import parse_id_list
+
+GROUPS = [
+    {"name": f"Aisle {a}", "bays": parse_id_list(f"BAY-{a:03d}-001..BAY-{a:03d}-500"),
+     "shelves": list("ABCD"), "bins_per_shelf": {"A": 5, "B": 5, "C": 6, "D": 4}}
+    for a in range(1, 11)
+]
+
+
+def test_whole_site_is_downsampled():
+    overview = SiteOverview.from_groups(GROUPS)
+    assert (overview.n_bays, overview.n_bins) == (5000, 100_000)
+    heatmap = overview.figure(max_columns=1000).data[0]
+    assert type(heatmap).__name__ == "Heatmap"
+    assert heatmap.z.shape == (5 + 5 + 6 + 4 + 3, 1000)
+    # filled cells are the bins of one bay; columns never straddle two groups
+    assert np.count_nonzero(~np.isnan(heatmap.z[:, 0])) == 20
+    assert heatmap.text[0][0] == "Aisle 1 · BAY-001-001 – BAY-001-005 (5 bays)<br>shelf A, bin 1<br>5 bins"
+    assert heatmap.text[0][100].startswith("Aisle 2 · BAY-002-001 – BAY-002-005")
+
+
+def test_narrow_window_draws_every_bin():
+    overview = SiteOverview.from_groups(GROUPS)
+    start, stop = overview.group_window("Aisle 3")
+    assert (start, stop) == (1000, 1500)
+    traces = overview.figure(start, stop).data
+    assert [t.name for t in traces] == ["A", "B", "C", "D"]
+    assert sum(len(t.x) for t in traces) == 500 * 20
+    assert traces[0].hovertext[0] == "Aisle 3 · BAY-003-001<br>003A001"
+    assert (traces[0].x.min(), traces[0].x.max()) == (1000, 1499)
+
+
+def test_groups_inside_one_table():
+    table = LabelTable.from_groups([["BAY-001-001", "BAY-001-002"], ["BAY-002-001"]], ["S1", "S2"], 3)
+    overview = SiteOverview([table])
+    assert overview.groups == ["Group 1", "Group 2"]
+    assert overview.group_window("Group 2") == (2, 3)
+    assert sum(len(t.x) for t in overview.figure().data) == 18
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from app.labeltable import LabelTable
+from app.preview import PrefixIndex, PreviewTable, eoa_preview, label_preview
+
+
+def test_prefix_index_lookup():
+    index = PrefixIndex(["bay-002", "BAY-001", "BAY-010", "AISLE", "BAY-0019"])
+    assert sorted(index.lookup("bay-01")) == [2]
+    assert sorted(index.lookup(" BAY-001")) == [1, 4]
+    assert len(index.lookup("BAZ")) == 0
+    assert len(index.lookup("")) == 5
+
+
+def test_label_table_search_filters_and_pages():
+    table = LabelTable.from_groups([["BAY-001-001", "BAY-001-002"], ["BAY-002-001"]], ["A", "B"], 3)
+    preview = PreviewTable.from_label_table(table)
+    assert preview.options("group") == ["Group 1", "Group 2"]
+
+    rows = preview.match("BAY-001-A00")
+    assert preview.page(rows, 0)["bin_label"].tolist() == ["BAY-001-A001", "BAY-001-A002", "BAY-001-A003", "BAY-001-A002", "BAY-001-A003", "BAY-001-A004"]
+    # bay prefixes match every bin of the bay
+    assert len(preview.match("bay-002")) == 6
+    assert list(preview.match("BAY-00", {"group": ["Group 2"], "shelf": ["B"]})) == [15, 16, 17]
+    all_rows = preview.match()
+    assert len(all_rows) == 18
+    assert preview.page(all_rows, 3, page_size=5)["bin_label"].tolist() == ["BAY-002-B001", "BAY-002-B002", "BAY-002-B003"]
+    assert preview.match("BAY-001-A00") is rows
+
+
+def test_eoa_module_filter_matches_either_side():
+    signs = [
+        {"Left.Mod": "P-1-A", "Left.Aisle": 200, "Left.Slots": "1-9", "Right.Mod": "P-1-B", "Right.Aisle": 300, "Right.Slots": "1-9", "Deployment Location": "x"},
+        {"Left.Mod": "", "Left.Aisle": "", "Left.Slots": "", "Right.Mod": "P-1-B", "Right.Aisle": 301, "Right.Slots": "1-9", "Deployment Location": "y"},
+    ]
+    preview = eoa_preview(signs)
+    assert preview.options("module") == ["P-1-A", "P-1-B"]
+    assert list(preview.match("", {"module": ["P-1-A"]})) == [0]
+    assert list(preview.match("", {"module": ["P-1-B"]})) == [0, 1]
+    assert list(preview.match("301")) == [1]
+    assert isinstance(preview.match("30"), np.ndarray)
+
+
+def test_label_preview_spans_groups_without_a_long_frame(monkeypatch):
+    groups = [
+        {"name": "Aisle 1", "bays": ["BAY-001-001", "BAY-001-002"], "shelves": ["A", "B"], "bins_per_shelf": {"A": 2, "B": 1}},
+        {"name": "Aisle 2", "bays": ["BAY-002-001"], "shelves": ["C"], "bins_per_shelf": {"C": 4}},
+    ]
+    calls = []
+    to_long = LabelTable.to_long
+    monkeypatch.setattr(LabelTable, "to_long", lambda self, rows=slice(None): calls.append(rows) or to_long(self, rows))
+    preview = label_preview(groups)
+    assert len(preview) == 10 and not calls
+    assert preview.options("shelf") == ["A", "B", "C"]
+    assert preview.search["bin_label"][0].sorted.dtype == object
+    rows = preview.match("", {"shelf": ["B", "C"]})
+    page = preview.page(rows, 0, page_size=4)
+    long = pd.concat([to_long(LabelTable.from_bays(g["name"], g["bays"], g["shelves"], g["bins_per_shelf"])) for g in groups],
+                     ignore_index=True)
+    expected = long[long["shelf"].isin(["B", "C"])].head(4).reset_index(drop=True)
+    pd.testing.assert_frame_equal(page.reset_index(drop=True), expected, check_dtype=False)
+    assert page["group"].tolist() == ["Aisle 1", "Aisle 1", "Aisle 2", "Aisle 2"]
+    assert list(preview.match("bay-002")) == [6, 7, 8, 9]
+    assert preview.page(preview.match("nothing"), 0).empty
@@ -0,0 +1,100 @@
+import pickle
+import random
+
+import pytest
+
+from app import ranges
+from app.checks import check_duplicate_bay_ids, check_duplicate_bin_ids
+from app.labeltable import LabelTable
+from app.ranges import BIN_SEPARATORS, IdRange, parse_id_list
+
+
+def test_parse_ranges_and_plain_ids():
+    errors = []
+    ids = parse_id_list("BAY-001-001 .. BAY-001-400\nBAY-002-001, BAY-003-001..BAY-003-009:4\nBAY-X..BAY-Y", errors=errors)
+    assert len(ids) == 400 + 1 + 3
+    assert ids[0] == "BAY-001-001" and ids[399] == "BAY-001-400" and ids[400] == "BAY-002-001"
+    assert ids[-3:] == ["BAY-003-001", "BAY-003-005", "BAY-003-009"]
+    assert list(ids)[398:401] == ["BAY-001-399", "BAY-001-400", "BAY-002-001"]
+    assert errors == ["⚠️ Range 'BAY-X..BAY-Y' must end both IDs with a number."]
+    assert pickle.loads(pickle.dumps(ids)) == ids
+
+
+def test_range_is_lazy():
+    span = IdRange.parse("P-1-B217A100..P-1-B217A199999999:3")
+    assert len(span) == (199999999 - 100) // 3 + 1
+    assert span[1] == "P-1-B217A103" and "P-1-B217A199999999" in span and "P-1-B217A101" not in span
+    assert str(span) == "P-1-B217A100..P-1-B217A199999999:3"
+    with pytest.raises(ValueError):
+        IdRange.parse("BAY-001-010..BAY-001-001")
+    with pytest.raises(ValueError):
+        IdRange.parse("BAY-001-001..BAY-002-001")
+
+
+def test_generators_expand_ranges():
+    bays = parse_id_list("BAY-001-001..BAY-001-003\nBAY-002-001")
+    table = LabelTable.from_bays("G", bays, ["A"], {"A": 2})
+    assert len(table) == 8
+    assert table.bays["bay_input"].tolist() == ["BAY-001-001", "BAY-001-002", "BAY-001-003", "BAY-002-001"]
+
+
+def test_duplicate_ranges_without_expanding():
+    groups = [
+        {"name": "G1", "bays": parse_id_list("BAY-001-001..BAY-001-400\nbay-001-900")},
+        {"name": "G2", "bays": parse_id_list("BAY-001-301..BAY-001-999999999:2\nBAY-001-900")},
+        {"name": "G3", "bays": parse_id_list("BAY-002-001..BAY-002-010\nBAY-002-005")},
+    ]
+    assert check_duplicate_bay_ids(groups) == [
+        "⚠️ Duplicate bay ID 'BAY-002-005' found in G3.",
+        "⚠️ Bay IDs 'BAY-001-301..BAY-001-399:2' (50 IDs) are duplicated across groups: G1, G2.",
+        "⚠️ Bay ID 'BAY-001-900' is duplicated across groups: G1, G2.",
+    ]
+
+
+def test_duplicate_checks_match_expanded_ids():
+    rng = random.Random(7)
+    for _ in range(200):
+        groups = []
+        for g in range(3):
+            parts = []
+            for _ in range(rng.randint(1, 3)):
+                lo = rng.randint(1, 30)
+                if rng.random() < 0.5:
+                    parts.append(f"P-1-A{lo:03d}")
+                else:
+                    parts.append(f"P-1-A{lo:03d}..P-1-A{lo + rng.randint(0, 20):03d}:{rng.randint(1, 4)}")
+            groups.append({"name": f"G{g}", "bin_ids": parse_id_list("\n".join(parts), BIN_SEPARATORS)})
+        expanded = [{"name": g["name"], "bin_ids": list(g["bin_ids"])} for g in groups]
+
+        def covered(messages, within):
+            ids = set()
+            for message in messages:
+                if ("found in" in message) != within:
+                    continue
+                text = message.split("'")[1]
+                ids.update(IdRange.parse(text) if ".." in text else [text])
+            return ids
+
+        lazy, eager = check_duplicate_bin_ids(groups), check_duplicate_bin_ids(expanded)
+        assert covered(lazy, True) == covered(eager, True)
+        assert covered(lazy, False) == covered(eager, False)
+
+
+def test_repeated_ids_are_merged_before_the_sweep(monkeypatch):
+    calls = []
+    intersect = ranges._intersect
+    monkeypatch.setattr(ranges, "_intersect", lambda a, b: calls.append((a, b)) or intersect(a, b))
+    groups = [
+        {"name": "G1", "bays": ["BAY-001-001"] * 2000 + [f"BAY-001-{i:03d}" for i in range(2, 900)]},
+        {"name": "G2", "bays": parse_id_list("BAY-001-001..BAY-001-003 BAY-001-001..BAY-001-003 BAY-001-001")},
+    ]
+    assert check_duplicate_bay_ids(groups) == [
+        "⚠️ Duplicate bay ID 'BAY-001-001' found in G1.",
+        "⚠️ Duplicate bay ID 'BAY-001-001' found in G2.",
+        "⚠️ Duplicate bay IDs 'BAY-001-001..BAY-001-003' (3 IDs) found in G2.",
+        "⚠️ Bay ID 'BAY-001-001' is duplicated across groups: G1, G2.",
+        "⚠️ Bay ID 'BAY-001-002' is duplicated across groups: G1, G2.",
+        "⚠️ Bay ID 'BAY-001-003' is duplicated across groups: G1, G2.",
+    ]
+    # the one distinct range against the single IDs it spans, not every copy against every other
+    assert len(calls) == 3
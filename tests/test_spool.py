@@ -0,0 +1,43 @@
+import io
+import os
+import time
+import zipfile
+
+import pytest
+
+from app.exports import export_bin_labels, export_bin_mapping
+from app.spool import SpooledFile, SpoolExpired, SpoolStore
+
+GROUPS = [{"name": "G1", "bays": ["BAY-001-001-001", "BAY-001-002-001"], "shelves": ["A"], "bins_per_shelf": {"A": 2}}]
+
+
+def test_exports_are_spooled_to_disk(tmp_path):
+    store = SpoolStore(str(tmp_path), ttl=60)
+    result = export_bin_labels(GROUPS, "zip", store=store)
+    data = result["data"]
+    assert isinstance(data, SpooledFile) and os.path.dirname(data.path) == str(tmp_path)
+    assert data.file_name == "bin_labels.zip" and len(data) == os.path.getsize(data.path)
+    # callable, so st.download_button reads it only on click
+    with zipfile.ZipFile(io.BytesIO(data())) as archive:
+        assert "G1.xlsx" in archive.namelist()
+    assert result["stats"]["labels"] == 4
+
+    mapping = export_bin_mapping([{"name": "M", "bin_ids": ["P-1-A201A100"], "bay_definition": "D", "height_cm": 1,
+                                   "width_cm": 1, "depth_cm": 1, "zone": "", "bay_type": "", "bay_usage": "",
+                                   "outlier_dimensions": {}}], store=store)
+    assert mapping["data"].read()[:2] == b"PK"
+    assert len(store.files()) == 2
+
+
+def test_ttl_cleanup(tmp_path):
+    store = SpoolStore(str(tmp_path), ttl=10)
+    old = store.put(b"old", "a.xlsx", "x")
+    stray = tmp_path / "left-over.zip"
+    stray.write_bytes(b"x")
+    os.utime(stray, (time.time() - 60, time.time() - 60))
+    assert store.prune() == 1 and old.exists and not stray.exists()
+
+    assert store.prune(now=time.time() + 11) == 1
+    assert not old.exists and store.files() == []
+    with pytest.raises(SpoolExpired):
+        old.read()